@@ -0,0 +1,145 @@
+# MIT License
+
+# Copyright (c) 2025 rameshsuraparaju
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Provides shared, lazily created BigQuery clients.
+
+All bq classes get their clients here instead of creating them at import
+time.  A client is created on first use (no credential discovery on
+import), shared by all threads, and its HTTP session uses a connection
+pool large enough for concurrent jobs.  Tests and dry runs can inject
+fake clients with `set_client`.
+"""
+
+import threading
+
+import google.auth
+import requests
+
+from google.auth.transport.requests import AuthorizedSession
+from google.cloud import bigquery
+from google.cloud.bigquery_storage_v1 import BigQueryReadClient, BigQueryWriteClient
+
+
+class ClientFactory:
+    """Creates and shares the BigQuery, Storage Read and Storage Write clients."""
+
+    _SCOPES = ["https://www.googleapis.com/auth/cloud-platform"]
+
+    _KINDS = ["bigquery", "read", "write"]
+
+    _lock = threading.Lock()
+    _clients = {}
+
+    project = None
+    location = None
+    pool_size = 32
+
+    @classmethod
+    def configure(
+        cls, project: str = None, location: str = None, pool_size: int = None
+    ):
+        """Sets the client options. Clients created before are dropped.
+
+        Args:
+            project (str, optional): project of the jobs. Defaults to the
+                project of the credentials.
+            location (str, optional): location of the jobs, e.g. "EU".
+                Defaults to None (BigQuery decides).
+            pool_size (int, optional): max. HTTP connections of the BigQuery
+                client. Defaults to 32.
+        """
+        with cls._lock:
+            cls.project = project
+            cls.location = location
+            if pool_size is not None:
+                cls.pool_size = pool_size
+            cls._clients = {}
+
+    @classmethod
+    def set_client(cls, client, kind: str = "bigquery"):
+        """Injects a client, e.g. a fake client in tests.
+
+        Args:
+            client: Client.
+            kind (str, optional): "bigquery", "read" or "write".
+                Defaults to "bigquery".
+
+        Raises:
+            ValueError: Invalid kind.
+        """
+        if kind not in cls._KINDS:
+            raise ValueError(f"Kind must be one of {cls._KINDS}.")
+        with cls._lock:
+            cls._clients[kind] = client
+
+    @classmethod
+    def reset(cls):
+        """Drops all clients. They are created again on next use."""
+        with cls._lock:
+            cls._clients = {}
+
+    @classmethod
+    def __create_bigquery_client(cls) -> bigquery.Client:
+        """Creates a BigQuery client with a tuned HTTP connection pool.
+
+        Returns:
+            bigquery.Client: BigQuery client.
+        """
+        credentials, project = google.auth.default(scopes=cls._SCOPES)
+        session = AuthorizedSession(credentials)
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=cls.pool_size, pool_maxsize=cls.pool_size
+        )
+        session.mount("https://", adapter)
+        return bigquery.Client(
+            project=cls.project or project,
+            credentials=credentials,
+            location=cls.location,
+            _http=session,
+        )
+
+    @classmethod
+    def __get(cls, kind: str, create):
+
+        client = cls._clients.get(kind)
+        if client is None:
+            with cls._lock:
+                client = cls._clients.get(kind)
+                if client is None:
+                    client = create()
+                    cls._clients[kind] = client
+        return client
+
+    @classmethod
+    def get(cls) -> bigquery.Client:
+        """Returns the shared BigQuery client."""
+        return cls.__get("bigquery", cls.__create_bigquery_client)
+
+    @classmethod
+    def get_read_client(cls) -> BigQueryReadClient:
+        """Returns the shared Storage Read API client."""
+        return cls.__get("read", BigQueryReadClient)
+
+    @classmethod
+    def get_write_client(cls) -> BigQueryWriteClient:
+        """Returns the shared Storage Write API client."""
+        return cls.__get("write", BigQueryWriteClient)
@@ -24,13 +24,18 @@
 
 from google.cloud import bigquery
 
+from bq.client import ClientFactory
 from bq.read import Reader
 
 
 class Create:
     """Create artefacts in BigQuery."""
 
-    client = bigquery.Client()
+
+    @property
+    def client(self) -> bigquery.Client:
+        """Shared BigQuery client (see `ClientFactory`)."""
+        return ClientFactory.get()
 
     def __init__(self, project_id: str):
         """Initialize self.
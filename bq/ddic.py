@@ -0,0 +1,251 @@
+# MIT License
+
+# Copyright (c) 2025 rameshsuraparaju
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Provides class for serving SAP DDIC metadata from a local snapshot.
+
+The DDIC tables dd03l (table fields) and dd07t (domain values) of a meta
+dataset are read with one query each and stored locally as Parquet,
+tagged with the last-modified time of the BigQuery tables.  Schema,
+domain-value and check-field lookups are then answered from in-memory
+indexes by tabname and domname.  The snapshot is rebuilt when either
+BigQuery table has been modified since.
+"""
+
+import logging
+import time
+
+from os.path import expanduser, join
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from google.cloud import bigquery
+from bq.client import ClientFactory
+from bq import query
+
+
+class DDIC:
+    """In-memory snapshot of the DDIC tables dd03l and dd07t of a meta dataset."""
+
+
+    DEFAULT_PATH = join(expanduser("~"), ".datagen", "ddic")
+
+    # Snapshots shared by all instances, by (project ID, dataset).
+    _snapshots = {}
+
+    _TABLES = ["dd03l", "dd07t"]
+
+    @property
+    def client(self) -> bigquery.Client:
+        """Shared BigQuery client (see `ClientFactory`)."""
+        return ClientFactory.get()
+
+    def __init__(
+        self,
+        project_id: str,
+        dataset: str,
+        path: str = DEFAULT_PATH,
+        check_interval: float = 300.0,
+    ):
+        """Initialize self.
+
+        Args:
+            project_id (str): Google Cloud project ID.
+            dataset (str): Meta dataset holding dd03l and dd07t.
+            path (str, optional): Directory of the Parquet snapshots.
+                Defaults to ~/.datagen/ddic.
+            check_interval (float, optional): seconds after which the
+                last-modified time of the DDIC tables is checked again.
+                Defaults to 300.0.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.project_id = project_id
+        self.dataset = dataset
+        self.path = path
+        self.check_interval = check_interval
+        self.query = query.Query(self.project_id)
+
+    def __get_file(self, table: str) -> str:
+
+        return join(self.path, f"{self.project_id}.{self.dataset}.{table}.parquet")
+
+    def __get_version(self) -> str:
+        """Returns the last-modified times of the DDIC tables.
+
+        Returns:
+            str: version of the meta dataset.
+        """
+        modified = [
+            self.client.get_table(
+                f"{self.project_id}.{self.dataset}.{table}"
+            ).modified
+            for table in __class__._TABLES
+        ]
+        return "|".join(m.isoformat() if m else "" for m in modified)
+
+    def __read_file(self, table: str, version: str) -> pa.Table:
+        """Reads a local snapshot, if it exists and has the given version.
+
+        Args:
+            table (str): DDIC table.
+            version (str): expected version.
+
+        Returns:
+            pa.Table: snapshot or None.
+        """
+        file = self.__get_file(table)
+        if not Path(file).exists():
+            return None
+        metadata = pq.read_schema(file).metadata or {}
+        if metadata.get(b"version", b"").decode() != version:
+            return None
+        return pq.read_table(file)
+
+    def __download(self, table: str, sql: str, version: str) -> pa.Table:
+        """Reads a DDIC table from BigQuery and stores it locally.
+
+        Args:
+            table (str): DDIC table.
+            sql (str): Query.
+            version (str): version to tag the snapshot with.
+
+        Returns:
+            pa.Table: snapshot.
+        """
+        arrow_table = self.client.query(sql).result().to_arrow()
+        arrow_table = arrow_table.replace_schema_metadata({"version": version})
+        Path(self.path).mkdir(parents=True, exist_ok=True)
+        pq.write_table(arrow_table, self.__get_file(table))
+        self.logger.info(
+            "Downloaded %s rows of %s.%s", arrow_table.num_rows, self.dataset, table
+        )
+        return arrow_table
+
+    def __build(self, version: str) -> dict:
+        """Loads (or downloads) the snapshots and builds the indexes.
+
+        Args:
+            version (str): version of the meta dataset.
+
+        Returns:
+            dict: snapshot with version, check time and indexes.
+        """
+        dd03l = self.__read_file("dd03l", version)
+        if dd03l is None:
+            dd03l = self.__download(
+                "dd03l", self.query.read_sap_schema_all(self.dataset), version
+            )
+        dd07t = self.__read_file("dd07t", version)
+        if dd07t is None:
+            dd07t = self.__download(
+                "dd07t", self.query.read_sap_domain_all(self.dataset), version
+            )
+
+        # Rows are ordered by tabname, position resp. domname, valpos.
+        schemas = {}
+        checkfields = {}
+        for row in dd03l.to_pylist():
+            tabname = row.pop("tabname")
+            schemas.setdefault(tabname, []).append(row)
+            checkfields.setdefault((tabname, row["domname"]), row["fieldname"])
+
+        domains = {}
+        for domname, value in zip(
+            dd07t.column("domname").to_pylist(), dd07t.column("value").to_pylist()
+        ):
+            domains.setdefault(domname, []).append(value)
+
+        return {
+            "version": version,
+            "checked": time.monotonic(),
+            "schemas": schemas,
+            "checkfields": checkfields,
+            "domains": domains,
+        }
+
+    def __get_snapshot(self) -> dict:
+        """Returns the current snapshot, rebuilt if the DDIC tables have changed.
+
+        Returns:
+            dict: snapshot.
+        """
+        key = (self.project_id, self.dataset)
+        snapshot = __class__._snapshots.get(key)
+        if (
+            snapshot is not None
+            and time.monotonic() - snapshot["checked"] < self.check_interval
+        ):
+            return snapshot
+
+        version = self.__get_version()
+        if snapshot is not None and snapshot["version"] == version:
+            snapshot["checked"] = time.monotonic()
+            return snapshot
+
+        snapshot = self.__build(version)
+        __class__._snapshots[key] = snapshot
+        return snapshot
+
+    def refresh(self):
+        """Checks the last-modified time of the DDIC tables on next lookup."""
+        snapshot = __class__._snapshots.get((self.project_id, self.dataset))
+        if snapshot is not None:
+            snapshot["checked"] = float("-inf")
+
+    def read_sap_schema(self, table: str) -> list:
+        """Returns the fields of an SAP table.
+
+        Args:
+            table (str): SAP table name.
+
+        Returns:
+            list: fields (fieldname, keyflag, checktable, saptype, length,
+                decimals, domname) in DDIC order.
+        """
+        fields = self.__get_snapshot()["schemas"].get(table.upper(), [])
+        return [dict(field) for field in fields]
+
+    def read_sap_domain(self, domain: str) -> list:
+        """Returns the (English) values of an SAP domain.
+
+        Args:
+            domain (str): Domain name.
+
+        Returns:
+            list: domain values.
+        """
+        return list(self.__get_snapshot()["domains"].get(domain.upper(), []))
+
+    def read_sap_checkfield(self, checktable: str, domname: str) -> str:
+        """Returns the field of a check table with the given domain.
+
+        Args:
+            checktable (str): Check table name.
+            domname (str): Domain name.
+
+        Returns:
+            str: field name or "" if there is none.
+        """
+        return self.__get_snapshot()["checkfields"].get(
+            (checktable.upper(), domname.upper()), ""
+        )
@@ -22,13 +22,18 @@
 
 """Provides class for BigQuery download."""
 from google.cloud import bigquery
+from bq.client import ClientFactory
 from bq import query
 
 
 class Download:
     """Download data from a BigQuery table to a dataframe."""
 
-    client = bigquery.Client()
+
+    @property
+    def client(self) -> bigquery.Client:
+        """Shared BigQuery client (see `ClientFactory`)."""
+        return ClientFactory.get()
 
     def __init__(self, project_id: str):
         """Initialize self.
@@ -51,7 +56,7 @@ class Download:
         """
 
         sql = self.query.read_table_all(dataset, table)
-        return __class__.client.query(sql).result().to_dataframe()
+        return self.client.query(sql).result().to_dataframe()
 
 
 
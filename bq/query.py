@@ -22,6 +22,210 @@
 
 """Provides sql queries."""
 
+import datetime
+import decimal
+
+from google.cloud import bigquery
+
+
+class Select:
+    """Build a parameterized SELECT statement.
+
+    Values are passed as query parameters instead of quoted literals, e.g.
+
+        select = Query(project_id).select(dataset, 'vbap', ['vbeln', 'posnr'])
+        select.where('mandt', '100').where_in('vbeln', headers)
+        sql, parameters = select.build()
+
+    Parameter types are taken from the table schema if one is given, else
+    from the Python values. Values of STRING fields are cast to str, so
+    e.g. the int 4711 matches the STRING field value "4711".
+    """
+
+    _PARAMETER_TYPES = [
+        (bool, 'BOOL'),
+        (int, 'INT64'),
+        (float, 'FLOAT64'),
+        (decimal.Decimal, 'NUMERIC'),
+        (datetime.datetime, 'TIMESTAMP'),
+        (datetime.date, 'DATE'),
+        (bytes, 'BYTES'),
+        (str, 'STRING'),
+    ]
+
+    # Legacy SQL type names of table schemas
+    _SCHEMA_TYPES = {
+        'INTEGER': 'INT64',
+        'FLOAT': 'FLOAT64',
+        'BOOLEAN': 'BOOL',
+    }
+
+    def __init__(self, table_id: str, fields: list = None, schema: list = None):
+        """Initialize self.
+
+        Args:
+            table_id (str): Fully qualified table name.
+            fields (list, optional): Fields to select. Defaults to all fields.
+            schema (list, optional): Table schema (field dicts, API
+                representation) for the parameter types. Defaults to None.
+        """
+        self.table_id = table_id
+        self.types = {
+            field['name'].lower(): __class__._SCHEMA_TYPES.get(
+                field['type'].upper(), field['type'].upper()
+            )
+            for field in schema or []
+            if field.get('mode', 'NULLABLE').upper() != 'REPEATED'
+            and field['type'].upper() not in ('RECORD', 'STRUCT')
+        }
+        self.fields = list(fields) if fields else ['*']
+        self.predicates = []
+        self.parameters = []
+        self.order = []
+        self.max_rows = None
+
+    def __get_type(self, value) -> str:
+
+        if hasattr(value, 'item'):
+            # NumPy scalar
+            value = value.item()
+        for python_type, parameter_type in __class__._PARAMETER_TYPES:
+            if isinstance(value, python_type):
+                return parameter_type
+        raise ValueError(f'No query parameter type for {type(value).__name__}.')
+
+    def __get_value(self, value, parameter_type: str = None):
+
+        value = value.item() if hasattr(value, 'item') else value
+        if parameter_type == 'STRING' and not isinstance(value, str):
+            return str(value)
+        return value
+
+    def __get_field_type(self, field: str, parameter_type: str = None) -> str:
+
+        return parameter_type or self.types.get(field.lower())
+
+    def __add_parameter(self, value, parameter_type: str = None) -> str:
+        """Adds a scalar query parameter.
+
+        Args:
+            value: Parameter value.
+            parameter_type (str, optional): BigQuery type. Defaults to the
+                type of the value.
+
+        Returns:
+            str: parameter reference, e.g. "@p0".
+        """
+        name = f'p{len(self.parameters)}'
+        parameter_type = parameter_type or self.__get_type(value)
+        self.parameters.append(bigquery.ScalarQueryParameter(
+            name, parameter_type, self.__get_value(value, parameter_type)
+        ))
+        return '@' + name
+
+    def where(self, field: str, value, op: str = '=', parameter_type: str = None):
+        """Adds the predicate "<field> <op> @value".
+
+        Args:
+            field (str): Field name.
+            value: Value.
+            op (str, optional): Comparison operator. Defaults to '='.
+            parameter_type (str, optional): BigQuery type. Defaults to the
+                type of the field in the schema, else the type of the value.
+
+        Returns:
+            Select: self.
+        """
+        parameter_type = self.__get_field_type(field, parameter_type)
+        self.predicates.append(
+            f'{field} {op} {self.__add_parameter(value, parameter_type)}'
+        )
+        return self
+
+    def where_in(self, field: str, values, parameter_type: str = None):
+        """Adds the predicate "<field> IN UNNEST(@values)".
+
+        Args:
+            field (str): Field name.
+            values: Values (any iterable, e.g. a list or NumPy array).
+            parameter_type (str, optional): BigQuery type of the elements.
+                Defaults to the type of the field in the schema, else the
+                type of the first value.
+
+        Raises:
+            ValueError: no values and no parameter type.
+
+        Returns:
+            Select: self.
+        """
+        parameter_type = self.__get_field_type(field, parameter_type)
+        values = list(values)
+        if parameter_type is None:
+            if not values:
+                raise ValueError('Parameter type is required for empty values.')
+            parameter_type = self.__get_type(values[0])
+        values = [self.__get_value(v, parameter_type) for v in values]
+        name = f'p{len(self.parameters)}'
+        self.parameters.append(
+            bigquery.ArrayQueryParameter(name, parameter_type, values)
+        )
+        self.predicates.append(f'{field} IN UNNEST(@{name})')
+        return self
+
+    def where_raw(self, predicate: str, **parameters):
+        """Adds an arbitrary predicate with named parameters.
+
+        Args:
+            predicate (str): SQL predicate, e.g. "erdat >= @from_date".
+            parameters: Values of the named parameters in the predicate.
+
+        Returns:
+            Select: self.
+        """
+        for name, value in parameters.items():
+            self.parameters.append(bigquery.ScalarQueryParameter(
+                name, self.__get_type(value), self.__get_value(value)
+            ))
+        self.predicates.append(f'({predicate})')
+        return self
+
+    def order_by(self, *fields: str):
+        """Adds fields to the ORDER BY clause.
+
+        Returns:
+            Select: self.
+        """
+        self.order.extend(fields)
+        return self
+
+    def limit(self, max_rows: int):
+        """Sets the LIMIT clause.
+
+        Returns:
+            Select: self.
+        """
+        self.max_rows = max_rows
+        return self
+
+    def build(self) -> tuple:
+        """Builds the statement.
+
+        Returns:
+            tuple: SQL and list of query parameters.
+        """
+        sql = f'SELECT {", ".join(self.fields)} FROM `{self.table_id}`'
+        if self.predicates:
+            sql += ' WHERE ' + ' AND '.join(self.predicates)
+        if self.order:
+            sql += ' ORDER BY ' + ', '.join(self.order)
+        if self.max_rows is not None:
+            sql += f' LIMIT {int(self.max_rows)}'
+        return sql + ';', list(self.parameters)
+
+    def job_config(self) -> bigquery.QueryJobConfig:
+        """Returns a query job configuration with the query parameters."""
+        return bigquery.QueryJobConfig(query_parameters=list(self.parameters))
+
 
 class Query:
     """Build SQL Queries"""
@@ -41,6 +245,14 @@ class Query:
                     '.' + dataset + \
                     '.' + table
 
+    def select(self,
+               dataset: str,
+               table: str,
+               fields: list = None,
+               schema: list = None) -> Select:
+
+        return Select(self.__get_tablename(dataset, table), fields, schema)
+
     def read_table_all(self, dataset: str, table: str) -> str:
 
         return 'SELECT * FROM `' \
@@ -68,37 +280,42 @@ class Query:
                     `{self.__get_tablename(dataset, table)}` \
                     WHERE {client_field} = "{client_value}";'
 
-    # TODO refactor to merge into one query generator method
-    def read_header_fields(self,
-                          dataset: str,
-                          table: str,
-                          fields: list,
-                          client_field: str,
-                          client_value: str,
-                          link_field: str,
-                          link_value) -> str:
-
-        return f'SELECT {", ".join(fields)} FROM \
-                `{self.__get_tablename(dataset, table)}` \
-                WHERE {client_field} = "{client_value}" \
-                    AND {link_field} = "{link_value}";'
-
-    # TODO refactor to merge into one query generator method
-    def read_fields_with_date_and_key_filter(
-        self,
-        dataset: str,
-        table: str,
-        fields: list,
-        date_field: str,
-        date_value: str,
-        key_field: str,
-        key_value: str,
-    ) -> str:
-
-        return f'SELECT {", ".join(fields)} FROM \
-                `{self.__get_tablename(dataset, table)}` \
-                WHERE {date_field} = "{date_value}" \
-                    AND {key_field} = "{key_value}";'
+    def read_max_field(self,
+                       dataset: str,
+                       table: str,
+                       field: str,
+                       client_field: str = 'none',
+                       client_value: str = '000',
+                       min_value: int = None,
+                       max_value: int = None,
+                       schema: list = None) -> Select:
+
+        value = f'SAFE_CAST({field} AS INT64)'
+        select = self.select(dataset, table, [f'MAX({value}) AS value'], schema)
+        if not (client_field == 'none' and client_value == '000'):
+            select.where(client_field, client_value)
+        if min_value is not None and max_value is not None:
+            select.where_raw(
+                f'{value} BETWEEN @min_value AND @max_value',
+                min_value=int(min_value), max_value=int(max_value)
+            )
+        return select
+
+    def merge_table(self,
+                    dataset: str,
+                    table: str,
+                    source_dataset: str,
+                    source_table: str,
+                    keys: list,
+                    fields: list) -> str:
+
+        on = ' AND '.join(f'T.{k} = S.{k}' for k in keys)
+        updates = ', '.join(f'{f} = S.{f}' for f in fields if f not in keys)
+        when_matched = f'WHEN MATCHED THEN UPDATE SET {updates} ' if updates else ''
+        return f'MERGE `{self.__get_tablename(dataset, table)}` T \
+                USING `{self.__get_tablename(source_dataset, source_table)}` S \
+                ON {on} \
+                {when_matched}WHEN NOT MATCHED THEN INSERT ROW;'
 
     def truncate_table(self, dataset, table):
 
@@ -128,10 +345,31 @@ class Query:
                 '` WHERE domname = "' + domname.upper() + \
                 '" AND ddlanguage = "E" ORDER BY valpos;'
 
+    def read_sap_schema_all(self, dataset) -> str:
+
+        return 'SELECT  tabname, \
+                        fieldname, \
+                        keyflag, \
+                        checktable, \
+                        inttype as saptype, \
+                        CAST(intlen AS INT64) AS length, \
+                        CAST(decimals AS INT64) AS decimals, \
+                        domname \
+                FROM `' \
+            + self.__get_tablename(dataset, 'dd03l') + \
+            '` ORDER BY tabname, position;'
+
+    def read_sap_domain_all(self, dataset) -> str:
+
+        return 'SELECT domname, ddtext AS value \
+                FROM `' \
+                + self.__get_tablename(dataset, 'dd07t') + \
+                '` WHERE ddlanguage = "E" ORDER BY domname, valpos;'
+
     def read_sap_checkfield(self, dataset, checktable, domname) -> str:
 
         return 'SELECT fieldname \
                 FROM `'\
                 + self.__get_tablename(dataset, 'dd03l') + \
                 '` WHERE tabname = "' + checktable.upper() + \
-                ' AND domname = "' + domname.upper() + ';'
+                '" AND domname = "' + domname.upper() + '";'
@@ -22,26 +22,267 @@
 
 """Provides class for uploading data to big query."""
 
-import numpy as np
+import logging
+import os
+import pyarrow as pa
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
 
 from google.cloud import bigquery
+from google.cloud.bigquery_storage_v1 import types
 from google.api_core.exceptions import BadRequest, NotFound
+from bq import ddic
+from bq.client import ClientFactory
 from bq import query
 
 
 class Reader:
     """Read data / metadata from BigQuery."""
 
-    client = bigquery.Client()
 
-    def __init__(self, project_id: str):
+    @property
+    def client(self) -> bigquery.Client:
+        """Shared BigQuery client (see `ClientFactory`)."""
+        return ClientFactory.get()
+
+    def __init__(self, project_id: str, use_ddic_snapshot: bool = True):
         """Initialize self.
 
         Args:
             project_id (str): Google Cloud project ID.
+            use_ddic_snapshot (bool, optional): serve SAP schema, domain and
+                check field lookups from a local DDIC snapshot (see `ddic.DDIC`).
+                Defaults to True.
         """
+        self.logger = logging.getLogger(__name__)
         self.project_id = project_id
         self.query = query.Query(self.project_id)
+        self.use_ddic_snapshot = use_ddic_snapshot
+        self.__ddic = {}
+        self.__schemas = {}
+
+    def __get_ddic(self, dataset: str) -> ddic.DDIC:
+        """Returns the DDIC snapshot of a meta dataset, or None if disabled.
+
+        Args:
+            dataset (str): Meta dataset name.
+
+        Returns:
+            ddic.DDIC: DDIC snapshot.
+        """
+        if not self.use_ddic_snapshot:
+            return None
+        if dataset not in self.__ddic:
+            self.__ddic[dataset] = ddic.DDIC(self.project_id, dataset)
+        return self.__ddic[dataset]
+
+    def __ddic_lookup(self, dataset: str, method: str, *args):
+        """Runs a lookup against the DDIC snapshot of a meta dataset.
+
+        Args:
+            dataset (str): Meta dataset name.
+            method (str): DDIC method.
+
+        Returns:
+            Lookup result, or None if the snapshot is not available.
+        """
+        snapshot = self.__get_ddic(dataset)
+        if snapshot is None:
+            return None
+        try:
+            return getattr(snapshot, method)(*args)
+        except (BadRequest, NotFound) as e:
+            self.logger.warning(
+                "DDIC snapshot of %s not available, querying instead: %s", dataset, e
+            )
+            self.use_ddic_snapshot = False
+            return None
+
+    def __create_read_session(
+        self,
+        dataset: str,
+        table: str,
+        fields: list,
+        row_filter: str,
+        client_field: str,
+        client_value: str,
+        max_streams: int,
+    ) -> types.ReadSession:
+        """Creates an Arrow read session with projection and filter pushed down.
+
+        Args:
+            dataset (str): Dataset name.
+            table (str): Table name.
+            fields (list): Fields to read (all fields if empty).
+            row_filter (str): SQL predicate, e.g. "ERDAT >= '2024-01-01'".
+            client_field (str): client field or "none".
+            client_value (str): client.
+            max_streams (int): max. parallel streams (0 = server decides).
+
+        Returns:
+            types.ReadSession: Read session.
+        """
+        restrictions = []
+        if row_filter:
+            restrictions.append(f"({row_filter})")
+        if client_field != "none":
+            restrictions.append(f"{client_field} = '{client_value}'")
+
+        session = types.ReadSession(
+            table=f"projects/{self.project_id}/datasets/{dataset}/tables/{table}",
+            data_format=types.DataFormat.ARROW,
+            read_options=types.ReadSession.TableReadOptions(
+                selected_fields=fields or [],
+                row_restriction=" AND ".join(restrictions),
+            ),
+        )
+        return ClientFactory.get_read_client().create_read_session(
+            parent=f"projects/{self.project_id}",
+            read_session=session,
+            max_stream_count=max_streams,
+        )
+
+    def __get_session_schema(self, session: types.ReadSession) -> pa.Schema:
+
+        return pa.ipc.read_schema(
+            pa.py_buffer(session.arrow_schema.serialized_schema)
+        )
+
+    def read_table_arrow(
+        self,
+        dataset: str,
+        table: str,
+        fields: list = None,
+        row_filter: str = None,
+        client_field: str = "none",
+        client_value: str = "000",
+        max_streams: int = 0,
+    ) -> pa.Table:
+        """Reads a table with the Storage Read API into an Arrow table.
+
+        Only the requested fields and the rows matching the filter are
+        transferred; the streams of the read session are read in parallel.
+
+        Args:
+            dataset (str): Dataset name.
+            table (str): Table name.
+            fields (list, optional): Fields to read. Defaults to all fields.
+            row_filter (str, optional): SQL predicate. Defaults to None.
+            client_field (str, optional): client field. Defaults to "none".
+            client_value (str, optional): client. Defaults to "000".
+            max_streams (int, optional): max. parallel streams.
+                Defaults to 0 (server decides).
+
+        Returns:
+            pa.Table: Table content.
+        """
+        session = self.__create_read_session(
+            dataset, table, fields, row_filter, client_field, client_value, max_streams
+        )
+        schema = self.__get_session_schema(session)
+        if not session.streams:
+            return schema.empty_table()
+
+        def read_stream(stream):
+            reader = ClientFactory.get_read_client().read_rows(stream.name)
+            batches = [page.to_arrow() for page in reader.rows(session).pages]
+            return pa.Table.from_batches(batches, schema=schema)
+
+        # The server may return many streams; the threads only wait on I/O.
+        max_workers = min(len(session.streams), (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            tables = list(executor.map(read_stream, session.streams))
+        return pa.concat_tables(tables)
+
+    def read_table_columns(
+        self,
+        dataset: str,
+        table: str,
+        fields: list = None,
+        row_filter: str = None,
+        client_field: str = "none",
+        client_value: str = "000",
+    ) -> dict:
+        """Reads a table with the Storage Read API into NumPy columns.
+
+        Args:
+            dataset (str): Dataset name.
+            table (str): Table name.
+            fields (list, optional): Fields to read. Defaults to all fields.
+            row_filter (str, optional): SQL predicate. Defaults to None.
+            client_field (str, optional): client field. Defaults to "none".
+            client_value (str, optional): client. Defaults to "000".
+
+        Returns:
+            dict: field name -> np.ndarray.
+        """
+        arrow_table = self.read_table_arrow(
+            dataset, table, fields, row_filter, client_field, client_value
+        )
+        return {
+            name: column.to_numpy()
+            for name, column in zip(arrow_table.column_names, arrow_table.columns)
+        }
+
+    def iter_record_batches(
+        self,
+        dataset: str,
+        table: str,
+        fields: list = None,
+        row_filter: str = None,
+        client_field: str = "none",
+        client_value: str = "000",
+    ) -> Iterator[pa.RecordBatch]:
+        """Reads a table with the Storage Read API page by page.
+
+        Args:
+            dataset (str): Dataset name.
+            table (str): Table name.
+            fields (list, optional): Fields to read. Defaults to all fields.
+            row_filter (str, optional): SQL predicate. Defaults to None.
+            client_field (str, optional): client field. Defaults to "none".
+            client_value (str, optional): client. Defaults to "000".
+
+        Yields:
+            pa.RecordBatch: next page of rows.
+        """
+        session = self.__create_read_session(
+            dataset, table, fields, row_filter, client_field, client_value, 1
+        )
+        for stream in session.streams:
+            reader = ClientFactory.get_read_client().read_rows(stream.name)
+            for page in reader.rows(session).pages:
+                yield page.to_arrow()
+
+    def iter_records(
+        self,
+        dataset: str,
+        table: str,
+        fields: list = None,
+        row_filter: str = None,
+        client_field: str = "none",
+        client_value: str = "000",
+    ) -> Iterator[dict]:
+        """Reads a table with the Storage Read API record by record.
+
+        Only one page is held in memory at a time.
+
+        Args:
+            dataset (str): Dataset name.
+            table (str): Table name.
+            fields (list, optional): Fields to read. Defaults to all fields.
+            row_filter (str, optional): SQL predicate. Defaults to None.
+            client_field (str, optional): client field. Defaults to "none".
+            client_value (str, optional): client. Defaults to "000".
+
+        Yields:
+            dict: next record.
+        """
+        for batch in self.iter_record_batches(
+            dataset, table, fields, row_filter, client_field, client_value
+        ):
+            yield from batch.to_pylist()
 
     def __get_table_id(self, dataset: str, table: str) -> str:
         """concatenates input to fully qualified BigQuery table name.
@@ -73,20 +314,36 @@ class Reader:
         Returns:
             google.cloud.bigquery.table.Table: Table properties.
         """
-        return __class__.client.get_table(self.__get_table_id(dataset, table))
+        return self.client.get_table(self.__get_table_id(dataset, table))
 
     def read_bq_schema(self, dataset: str, table: str):
 
         try:
-            table_info = __class__.client.get_table(self.__get_table_id(dataset, table))
+            table_info = self.client.get_table(self.__get_table_id(dataset, table))
             return [field.to_api_repr() for field in table_info.schema]
         except BadRequest:
             return []
 
+    def __get_schema(self, dataset: str, table: str) -> list:
+        """Returns the cached BigQuery schema of a table (see `read_bq_schema`)."""
+        key = (dataset, table)
+        if key not in self.__schemas:
+            schema = self.read_bq_schema(dataset, table)
+            if not schema:
+                return schema
+            self.__schemas[key] = schema
+        return self.__schemas[key]
+
+    def __select(self, dataset: str, table: str, fields: list) -> query.Select:
+        """Starts a SELECT statement typing its parameters by the table schema."""
+        return self.query.select(
+            dataset, table, fields, schema=self.__get_schema(dataset, table)
+        )
+
     def read_table_field(self, dataset: str, table: str, field: str) -> list:
 
         sql = self.query.read_table_field(dataset, table, field)
-        job = __class__.client.query(sql)
+        job = self.client.query(sql)
         if not job.errors:
             df = job.result().to_dataframe()
             return self.__df_to_list(df)
@@ -105,21 +362,46 @@ class Reader:
         sql = self.query.read_table_fields(
             dataset, table, fields, client_field, client_value
         )
-        job = __class__.client.query(sql)
+        job = self.client.query(sql)
         if not job.errors:
             df = job.result().to_dataframe()
             return df.to_dict(orient="records")
         else:
             return []
 
-    def __convert_ndarray_to_list(self, l: list) -> list:
+    def read_max_field(
+        self,
+        dataset: str,
+        table: str,
+        field: str,
+        client_field: str = "none",
+        client_value: str = "000",
+        min_value: int = None,
+        max_value: int = None,
+    ) -> int:
+        """Reads the max. numeric value of a field.
+
+        Args:
+            dataset (str): Dataset name.
+            table (str): Table name.
+            field (str): Field (numeric or numeric string).
+            client_field (str, optional): client field. Defaults to "none".
+            client_value (str, optional): client. Defaults to "000".
+            min_value (int, optional): only values from min_value ...
+            max_value (int, optional): ... to max_value. Defaults to None
+                (all values).
 
-        for li in l:
-            for k in li.keys():
-                if isinstance(li[k], np.ndarray):
-                    li.update({k: li[k].tolist()})
-                    self.__convert_ndarray_to_list(li[k])
-        return l
+        Returns:
+            int: max. value or None if the table has no numeric value.
+        """
+        select = self.query.read_max_field(
+            dataset, table, field, client_field, client_value, min_value, max_value,
+            schema=self.__get_schema(dataset, table)
+        )
+        records = self.read_select(select)
+        if records and records[0]["value"] is not None:
+            return int(records[0]["value"])
+        return None
 
     def read_table_fields_with_repeated_records(
         self,
@@ -133,15 +415,53 @@ class Reader:
         sql = self.query.read_table_fields(
             dataset, table, fields, client_field, client_value
         )
-        job = __class__.client.query(sql)
-        results = []
+        job = self.client.query(sql)
         if not job.errors:
-            rows = job.result().to_dataframe().to_dict(orient="records")
-            results = self.__convert_ndarray_to_list(rows)
-            return results
+            # Arrow converts repeated records to lists of dicts directly.
+            return job.result().to_arrow().to_pylist()
+        else:
+            return []
 
+    def __run_select(self, select: query.Select):
+        """Runs a SELECT statement; returns its rows or None on errors."""
+        sql, _ = select.build()
+        job = self.client.query(sql, job_config=select.job_config())
+        if not job.errors:
+            return job.result()
         else:
-            return results
+            return None
+
+    def read_select(self, select: query.Select) -> list:
+        """Runs a parameterized SELECT statement.
+
+        Args:
+            select (query.Select): SELECT statement.
+
+        Returns:
+            list: records.
+        """
+        result = self.__run_select(select)
+        return result.to_arrow().to_pylist() if result is not None else []
+
+    def __read_grouped(self, select: query.Select, key_field: str) -> dict:
+        """Runs a SELECT statement and groups the records by a key field.
+
+        Args:
+            select (query.Select): SELECT statement.
+            key_field (str): Field to group by.
+
+        Returns:
+            dict: key value -> list of records.
+        """
+        requested = key_field in select.fields or "*" in select.fields
+        if not requested:
+            select.fields.append(key_field)
+
+        groups = {}
+        for row in self.read_select(select):
+            key = row[key_field] if requested else row.pop(key_field)
+            groups.setdefault(key, []).append(row)
+        return groups
 
     def read_header_fields(
         self,
@@ -154,17 +474,41 @@ class Reader:
         link_value: str,
     ) -> list:
 
-        sql = self.query.read_header_fields(
-            dataset, table, fields, client_field, client_value, link_field, link_value
-        )
-        job = __class__.client.query(sql)
-        if not job.errors:
-            df = job.result().to_dataframe()
-            return df.to_dict(orient="records")
-        else:
-            return []
+        select = self.__select(dataset, table, fields)
+        select.where(client_field, client_value).where(link_field, link_value)
+        result = self.__run_select(select)
+        return result.to_dataframe().to_dict(orient="records") if result is not None else []
+
+    def read_header_fields_batch(
+        self,
+        dataset: str,
+        table: str,
+        fields: list,
+        client_field: str,
+        client_value: str,
+        link_field: str,
+        link_values: list,
+    ) -> dict:
+        """Reads the records of many headers with one query.
+
+        Args:
+            dataset (str): Dataset name.
+            table (str): Table name.
+            fields (list): Fields to read.
+            client_field (str): client field.
+            client_value (str): client.
+            link_field (str): header key field.
+            link_values (list): header keys.
+
+        Returns:
+            dict: header key -> list of records.
+        """
+        if len(link_values) == 0:
+            return {}
+        select = self.__select(dataset, table, fields)
+        select.where(client_field, client_value).where_in(link_field, link_values)
+        return self.__read_grouped(select, link_field)
 
-    # TODO: Refactor to generic query with generic where clause
     def read_fields_with_date_and_key_filter(
         self,
         dataset: str,
@@ -176,15 +520,40 @@ class Reader:
         key_value: str,
     ) -> list:
 
-        sql = self.query.read_fields_with_date_and_key_filter(
-            dataset, table, fields, date_field, date_value, key_field, key_value
-        )
-        job = __class__.client.query(sql)
-        if not job.errors:
-            df = job.result().to_dataframe()
-            return df.to_dict(orient="records")
-        else:
-            return []
+        select = self.__select(dataset, table, fields)
+        select.where(date_field, date_value).where(key_field, key_value)
+        result = self.__run_select(select)
+        return result.to_dataframe().to_dict(orient="records") if result is not None else []
+
+    def read_fields_with_date_and_key_filter_batch(
+        self,
+        dataset: str,
+        table: str,
+        fields: list,
+        date_field: str,
+        date_value: str,
+        key_field: str,
+        key_values: list,
+    ) -> dict:
+        """Reads the records of many keys for a date with one query.
+
+        Args:
+            dataset (str): Dataset name.
+            table (str): Table name.
+            fields (list): Fields to read.
+            date_field (str): date field.
+            date_value (str): date.
+            key_field (str): key field.
+            key_values (list): keys.
+
+        Returns:
+            dict: key -> list of records.
+        """
+        if len(key_values) == 0:
+            return {}
+        select = self.__select(dataset, table, fields)
+        select.where(date_field, date_value).where_in(key_field, key_values)
+        return self.__read_grouped(select, key_field)
 
     def get_table(self, dataset: str, table: str):
         """read a table in BigQuery.
@@ -196,7 +565,7 @@ class Reader:
         Returns:
             google.cloud.bigquery.table.Table: Table properties.
         """
-        return __class__.client.get_table(self.__get_table_id(dataset, table))
+        return self.client.get_table(self.__get_table_id(dataset, table))
 
     def table_exists(self, dataset: str, table: str) -> bool:
         """Check if a BigQuery table exists
@@ -209,40 +578,53 @@ class Reader:
             bool: true (exists) or false (does not exist)
         """
         try:
-            __class__.client.get_table(self.__get_table_id(dataset, table))
+            self.client.get_table(self.__get_table_id(dataset, table))
             return True
         except NotFound:
             return False
 
     def read_sap_schema(self, dataset: str, table: str) -> list:
 
+        fields = self.__ddic_lookup(dataset, "read_sap_schema", table)
+        if fields is not None:
+            return fields
+
         # TODO: Check if pandas_gbq performs better?
         # https://googleapis.dev/python/pandas-gbq/latest/reading.html
         sql = self.query.read_sap_schema(dataset, table)
         try:
-            df = __class__.client.query(sql).result().to_dataframe()
+            df = self.client.query(sql).result().to_dataframe()
             return df.to_dict(orient="records")
         except BadRequest:
             return []
 
     def read_sap_domain(self, dataset: str, domain: str) -> list:
 
+        values = self.__ddic_lookup(dataset, "read_sap_domain", domain)
+        if values is not None:
+            return values
+
         # TODO: Check if pandas_gbq performs better?
         # https://googleapis.dev/python/pandas-gbq/latest/reading.html
         sql = self.query.read_sap_domain(dataset, domain)
         try:
-            df = __class__.client.query(sql).result().to_dataframe()
+            df = self.client.query(sql).result().to_dataframe()
             return self.__df_to_list(df)
         except BadRequest:
             return []
 
     def read_sap_checkfield(self, dataset: str, checktable: str, domname: str) -> str:
 
+        field = self.__ddic_lookup(dataset, "read_sap_checkfield", checktable, domname)
+        if field is not None:
+            return field
+
         # TODO: Check if pandas_gbq performs better?
         # https://googleapis.dev/python/pandas-gbq/latest/reading.html
         sql = self.query.read_sap_checkfield(dataset, checktable, domname)
-        job = __class__.client.query(sql)
+        job = self.client.query(sql)
         if not job.errors:
-            return job.result().to_dataframe().value.tolist()[0][0]
+            values = self.__df_to_list(job.result().to_dataframe())
+            return values[0] if values else ""
         else:
             return ""
@@ -21,19 +21,33 @@
 # SOFTWARE.
 
 """Provides class for uploading data to big query."""
+import io
 import logging
+import datetime
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
-from typing import List
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Iterable, List, Union
+from uuid import uuid4
 from google.cloud import bigquery
 
+from bq.client import ClientFactory
 from bq import query
-from gcs import hoarder
+from bq import writer
 
 class Upload:
     """ Upload data to a BigQuery table from a dataframe."""
 
-    client = bigquery.Client()
+
+    # Write modes which load into a staging table first.
+    _STAGED_WRITES = ['REPLACE', 'MERGE']
+
+    @property
+    def client(self) -> bigquery.Client:
+        """Shared BigQuery client (see `ClientFactory`)."""
+        return ClientFactory.get()
 
     def __init__(self, project_id: str):
         """Initialize self.
@@ -43,7 +57,6 @@ class Upload:
         """
         self.logger = logging.getLogger(__name__)
         self.project_id = project_id
-        self.hoarder = hoarder.Hoarder(project_id)
 
     def __get_table_id(self, dataset: str, table: str):
         """concatenates input to fully qualified BigQuery table name.
@@ -65,7 +78,8 @@ class Upload:
             table (str): Table name.
         """
         sql = query.Query(self.project_id).truncate_table(dataset, table)
-        __class__.client.query(sql)
+        # Wait for the truncate, otherwise it can race the following load.
+        self.client.query(sql).result()
 
     def upload(
             self,
@@ -74,17 +88,41 @@ class Upload:
             dataset: str,
             table: str,
             write: str,
-            bucket_name: str = ""
+            bucket_name: str = "",
+            backend: str = "load"
         ):
+        """Uploads a dataframe to a BigQuery table.
 
-        if any(s["type"] == "JSON" for s in schema):
-            self.__upload_with_json_columns(
-                dataframe,
+        Args:
+            dataframe (pd.DataFrame): rows.
+            schema (List[bigquery.SchemaField]): BigQuery schema.
+            dataset (str): Dataset name.
+            table (str): Table name.
+            write (str): "TRUNCATE", "APPEND", "REPLACE" or "MERGE"
+                (see `upload_staged`).
+            bucket_name (str, optional): not used anymore, JSON columns are
+                written with the Storage Write API. Defaults to "".
+            backend (str, optional): "load" (load job) or "storage"
+                (Storage Write API). Tables with JSON columns always use
+                "storage". Defaults to "load".
+
+        Returns:
+            List[dict]: result per batch for the "storage" backend
+                        (see bq.writer.Writer.write), else None.
+        """
+
+        _ = bucket_name
+        if write in __class__._STAGED_WRITES:
+            self.upload_staged([dataframe], schema, dataset, table, write)
+            return None
+
+        if backend == "storage" or any(s["type"] == "JSON" for s in schema):
+            return self.__upload_with_storage_write(
+                [dataframe],
                 schema,
                 dataset,
                 table,
-                write,
-                bucket_name
+                write
             )
 
         else:
@@ -100,7 +138,7 @@ class Upload:
                 schema=schema
             )
 
-            job = __class__.client.load_table_from_dataframe(
+            job = self.client.load_table_from_dataframe(
                 dataframe,
                 self.__get_table_id(
                     dataset, table),
@@ -111,47 +149,32 @@ class Upload:
             _ = job.result()
 
 
-    def __upload_with_json_columns(
+    def __upload_with_storage_write(
             self,
-            dataframe: pd.DataFrame,
+            batches: Iterable[pd.DataFrame],
             schema: List[bigquery.SchemaField],
             dataset: str,
             table: str,
-            write: str,
-            bucket_name: str
-        ):
+            write: str
+        ) -> List[dict]:
+        """Writes batches with the Storage Write API (pending stream).
+
+        Returns:
+            List[dict]: result per batch (see bq.writer.Writer.write).
+        """
 
-        try:
-            uri = self.hoarder.write_frame_as_json_file(
-                source_df=dataframe,
-                target_bucket_name=bucket_name,
-                target_table_id=table
-            ).get("uri")
-        except Exception as e:
-            self.logger.error("Cannot get file URI")
-            raise ValueError
-
-        write_disposition = 'WRITE_APPEND'
         if write == 'TRUNCATE':
-            # JobConfig's WRITE_TRUNCATE does NOT work!!
             self.__truncate_table(dataset, table)
-            write_disposition = 'WRITE_APPEND'
 
-        job_config = bigquery.LoadJobConfig(
-            write_disposition=write_disposition,
-            schema=schema,
-            source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
+        results = writer.Writer(self.project_id).write(
+            batches, schema, dataset, table
         )
-
-        job = __class__.client.load_table_from_uri(
-            uri,
-            self.__get_table_id(dataset, table),
-            job_config=job_config)
-
-        # Wait for the result
-        _ = job.result()
-        table = __class__.client.get_table(self.__get_table_id(dataset, table))
-        self.logger.info('Loaded %s rows to %s', table.num_rows, table)
+        for result in results:
+            if result["errors"]:
+                self.logger.error(
+                    'Batch %s failed: %s', result["batch"], result["errors"]
+                )
+        return results
 
     def upload_chunks(self,
                       chunk_size: int,
@@ -159,31 +182,257 @@ class Upload:
                       schema: List[bigquery.SchemaField],
                       dataset: str,
                       table: str,
-                      write: str):
+                      write: str) -> List[dict]:
+        """Uploads a dataframe in chunks with the Storage Write API.
 
-        for i in range(0, len(dataframe), chunk_size):
+        Args:
+            chunk_size (int): rows per chunk.
+            dataframe (pd.DataFrame): rows.
+            schema (List[bigquery.SchemaField]): BigQuery schema.
+            dataset (str): Dataset name.
+            table (str): Table name.
+            write (str): "TRUNCATE" or "APPEND".
 
-            chunk = dataframe[i:i+chunk_size]
+        Returns:
+            List[dict]: result per chunk (see bq.writer.Writer.write).
+        """
 
-            # Convert the chunk to a list of dictionaries for insertion
-            rows_to_insert = chunk.to_dict(orient='records')
+        chunks = (
+            dataframe[i:i+chunk_size]
+            for i in range(0, len(dataframe), chunk_size)
+        )
+        return self.__upload_with_storage_write(
+            chunks, schema, dataset, table, write
+        )
 
-            # Create a job configuration
-            job_config = bigquery.LoadJobConfig(
-                            schema=schema,
-                            write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
-                            )
+    def __load_batch(
+            self,
+            batch: Union[pd.DataFrame, pa.Table, pa.RecordBatch],
+            table_id: str,
+            job_config: bigquery.LoadJobConfig
+        ) -> int:
+        """Loads one batch as Parquet and waits for the load job.
+
+        DataFrames are converted by the BigQuery client (using the job's
+        schema), Arrow batches are written to an in-memory Parquet buffer.
+
+        Returns:
+            int: number of rows loaded.
+        """
+        if isinstance(batch, pd.DataFrame):
+            job = self.client.load_table_from_dataframe(
+                batch, table_id, job_config=job_config
+            )
+        else:
+            if isinstance(batch, pa.RecordBatch):
+                batch = pa.Table.from_batches([batch])
+            buffer = io.BytesIO()
+            pq.write_table(batch, buffer)
+            buffer.seek(0)
+            job = self.client.load_table_from_file(
+                buffer, table_id, job_config=job_config
+            )
+        job.result()
+        return job.output_rows if job.output_rows is not None else len(batch)
+
+    def __collect_loaded(self, done: set, indexes: dict, on_loaded: Callable) -> int:
+        """Reports finished load jobs, raising the first error after all are reported.
+
+        Args:
+            done (set): finished futures.
+            indexes (dict): future -> batch index.
+            on_loaded (Callable): callback (batch index, rows) or None.
+
+        Raises:
+            Exception: The first failed load job's error.
 
-            # Start the job
+        Returns:
+            int: number of rows loaded.
+        """
+        rows = 0
+        error = None
+        for future in done:
+            index = indexes.pop(future)
+            if future.exception() is not None:
+                error = error or future.exception()
+                continue
+            rows += future.result()
+            if on_loaded is not None:
+                on_loaded(index, future.result())
+        if error is not None:
+            raise error
+        return rows
+
+    def upload_stream(
+            self,
+            batches: Iterable[Union[pd.DataFrame, pa.Table, pa.RecordBatch]],
+            schema: List[bigquery.SchemaField],
+            dataset: str,
+            table: str,
+            write: str,
+            max_workers: int = 4,
+            max_pending: int = None,
+            on_loaded: Callable[[int, int], None] = None
+        ) -> int:
+        """Uploads batches from an iterator with parallel load jobs.
+
+        Batches are pulled from the iterator (e.g. a generator producing
+        the rows) while earlier batches are loaded, so generation and
+        upload overlap. At most `max_pending` batches are held in memory;
+        the iterator is not advanced until a load job finishes.
+
+        Args:
+            batches (Iterable): DataFrames or Arrow tables / record batches.
+            schema (List[bigquery.SchemaField]): BigQuery schema.
+            dataset (str): Dataset name.
+            table (str): Table name.
+            write (str): "TRUNCATE", "APPEND", "REPLACE" or "MERGE"
+                (see `upload_staged`).
+            max_workers (int, optional): parallel load jobs. Defaults to 4.
+            max_pending (int, optional): max. batches in memory.
+                Defaults to 2 * max_workers.
+            on_loaded (Callable, optional): called with the batch index and
+                row count of each batch once it is loaded (in completion
+                order, not batch order). Defaults to None.
+
+        Raises:
+            Exception: The first failed load job's error.
+
+        Returns:
+            int: number of rows loaded.
+        """
+
+        if write in __class__._STAGED_WRITES:
+            return self.upload_staged(
+                batches, schema, dataset, table, write,
+                max_workers=max_workers, max_pending=max_pending
+            )
+
+        if write == 'TRUNCATE':
+            # JobConfig's WRITE_TRUNCATE does NOT work!!
+            self.__truncate_table(dataset, table)
+
+        job_config = bigquery.LoadJobConfig(
+            write_disposition='WRITE_APPEND',
+            schema=schema,
+            source_format=bigquery.SourceFormat.PARQUET,
+        )
+        table_id = self.__get_table_id(dataset, table)
+        max_pending = max_pending or 2 * max_workers
+
+        rows = 0
+        pending = set()
+        indexes = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
             try:
-                table_ref = __class__.client.dataset(dataset).table(table)
-                table = __class__.client.get_table(table_ref)
-                errors = __class__.client.insert_rows(table, rows_to_insert)
-                if not errors:
-                    print(f"Batch {i//chunk_size + 1} inserted successfully.")
-                else:
-                    print(f"Encountered errors while inserting batch {i//chunk_size + 1}:")
-                    print(errors)
-            except Exception as e:
-                print(f"Error: {e}")
+                for index, batch in enumerate(batches):
+                    future = executor.submit(self.__load_batch, batch, table_id, job_config)
+                    indexes[future] = index
+                    pending.add(future)
+                    # Wait before pulling the next batch from the iterator
+                    if len(pending) >= max_pending:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        rows += self.__collect_loaded(done, indexes, on_loaded)
+                done, pending = wait(pending)
+                rows += self.__collect_loaded(done, indexes, on_loaded)
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+
+        self.logger.info('Loaded %s rows to %s', rows, table_id)
+        return rows
+
+    def upload_staged(
+            self,
+            batches: Iterable[Union[pd.DataFrame, pa.Table, pa.RecordBatch]],
+            schema: List[bigquery.SchemaField],
+            dataset: str,
+            table: str,
+            write: str = 'REPLACE',
+            keys: List[str] = None,
+            max_workers: int = 4,
+            max_pending: int = None
+        ) -> int:
+        """Uploads batches into a staging table, then swaps or merges them into the table.
+
+        The batches are loaded into a new staging table (in parallel, see
+        `upload_stream`). The target table is only changed at the end,
+        with one job: a copy job replacing its content (REPLACE) or a
+        MERGE statement (MERGE). Readers see the old content until then,
+        and loads of several tables can run concurrently.
+
+        Args:
+            batches (Iterable): DataFrames or Arrow tables / record batches.
+            schema (List[bigquery.SchemaField]): BigQuery schema.
+            dataset (str): Dataset name.
+            table (str): Table name.
+            write (str, optional): "REPLACE" or "MERGE". Defaults to "REPLACE".
+            keys (List[str], optional): key fields for MERGE. Defaults to
+                the REQUIRED fields of the schema.
+            max_workers (int, optional): parallel load jobs. Defaults to 4.
+            max_pending (int, optional): max. batches in memory.
+                Defaults to 2 * max_workers.
+
+        Raises:
+            ValueError: Invalid write mode or no keys for MERGE.
+
+        Returns:
+            int: number of rows loaded.
+        """
+
+        if write not in __class__._STAGED_WRITES:
+            raise ValueError(f"Write must be one of {__class__._STAGED_WRITES}.")
+
+        fields = [
+            f.to_api_repr() if isinstance(f, bigquery.SchemaField) else f
+            for f in schema
+        ]
+        if write == 'MERGE':
+            keys = keys or [
+                f["name"] for f in fields if f.get("mode", "NULLABLE").upper() == "REQUIRED"
+            ]
+            if not keys:
+                raise ValueError("MERGE requires key fields.")
+
+        staging = f'{table}__staging_{uuid4().hex[:8]}'
+        staging_id = self.__get_table_id(dataset, staging)
+        table_id = self.__get_table_id(dataset, table)
+
+        # Same partitioning and clustering as the target: a copy job can
+        # not change them.
+        target = self.client.get_table(table_id)
+        staging_table = bigquery.Table(staging_id, schema=schema)
+        staging_table.time_partitioning = target.time_partitioning
+        staging_table.range_partitioning = target.range_partitioning
+        staging_table.clustering_fields = target.clustering_fields
+        # Left-overs of failed runs are removed by BigQuery.
+        staging_table.expires = (
+            datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(days=1)
+        )
+        self.client.create_table(staging_table)
+
+        try:
+            rows = self.upload_stream(
+                batches, schema, dataset, staging, 'APPEND',
+                max_workers=max_workers, max_pending=max_pending
+            )
 
+            if write == 'REPLACE':
+                job_config = bigquery.CopyJobConfig(
+                    write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE
+                )
+                self.client.copy_table(
+                    staging_id, table_id, job_config=job_config
+                ).result()
+            else:
+                sql = query.Query(self.project_id).merge_table(
+                    dataset, table, dataset, staging,
+                    keys, [f["name"] for f in fields]
+                )
+                self.client.query(sql).result()
+        finally:
+            self.client.delete_table(staging_id, not_found_ok=True)
+
+        self.logger.info('%s %s rows into %s', write.capitalize() + 'd', rows, table_id)
+        return rows
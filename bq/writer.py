@@ -0,0 +1,438 @@
+# MIT License
+
+# Copyright (c) 2025 rameshsuraparaju
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Provides class for writing data to BigQuery with the Storage Write API.
+
+Rows are serialized to protocol buffers whose descriptor is derived from
+the BigQuery table schema, and appended to a write stream.  With a
+PENDING stream, rows become visible only when the stream is committed
+(all batches or none); with a COMMITTED stream, rows are visible as soon
+as they are appended, and offsets make retried appends exactly-once.
+"""
+
+import collections
+import json
+import logging
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable, List, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from google.cloud import bigquery
+from google.cloud.bigquery_storage_v1 import types
+from google.cloud.bigquery_storage_v1.writer import AppendRowsStream
+from google.protobuf import descriptor_pb2, descriptor_pool, message_factory
+
+from bq.client import ClientFactory
+
+
+class Writer:
+    """Write data to a BigQuery table with the Storage Write API."""
+
+    # Max. size of an append request is 10 MB.
+    _MAX_REQUEST_BYTES = 9 * 1024 * 1024
+
+    # Max. number of append requests awaiting a response
+    _MAX_IN_FLIGHT = 16
+
+    _EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    _EPOCH_ORDINAL = _EPOCH.date().toordinal()
+    _MICROSECOND = timedelta(microseconds=1)
+
+    _PROTO_TYPES = {
+        "INTEGER": descriptor_pb2.FieldDescriptorProto.TYPE_INT64,
+        "INT64": descriptor_pb2.FieldDescriptorProto.TYPE_INT64,
+        "FLOAT": descriptor_pb2.FieldDescriptorProto.TYPE_DOUBLE,
+        "FLOAT64": descriptor_pb2.FieldDescriptorProto.TYPE_DOUBLE,
+        "BOOLEAN": descriptor_pb2.FieldDescriptorProto.TYPE_BOOL,
+        "BOOL": descriptor_pb2.FieldDescriptorProto.TYPE_BOOL,
+        "BYTES": descriptor_pb2.FieldDescriptorProto.TYPE_BYTES,
+        "DATE": descriptor_pb2.FieldDescriptorProto.TYPE_INT32,
+        "TIMESTAMP": descriptor_pb2.FieldDescriptorProto.TYPE_INT64,
+        "RECORD": descriptor_pb2.FieldDescriptorProto.TYPE_MESSAGE,
+        "STRUCT": descriptor_pb2.FieldDescriptorProto.TYPE_MESSAGE,
+    }
+
+    def __init__(self, project_id: str):
+        """Initialize self.
+
+        Args:
+            project_id (str): Google Cloud Project ID.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.project_id = project_id
+
+    def __get_fields(self, schema: list) -> list:
+        """Normalizes a schema to a list of field dicts (API representation)."""
+        return [
+            f.to_api_repr() if isinstance(f, bigquery.SchemaField) else f
+            for f in schema
+        ]
+
+    def __get_proto_type(self, field_type: str) -> int:
+        """Maps a BigQuery type to a protocol buffer type.
+
+        Types without a native mapping (STRING, JSON, NUMERIC, BIGNUMERIC,
+        DATETIME, TIME, ...) are written as strings. SAP integer types
+        (INT1 - INT8) are written as INT64.
+        """
+        field_type = field_type.upper()
+        if field_type.startswith("INT"):
+            return descriptor_pb2.FieldDescriptorProto.TYPE_INT64
+        return __class__._PROTO_TYPES.get(
+            field_type, descriptor_pb2.FieldDescriptorProto.TYPE_STRING
+        )
+
+    def __build_descriptor(self, fields: list, name: str) -> descriptor_pb2.DescriptorProto:
+        """Builds a self-contained message descriptor for a schema.
+
+        Args:
+            fields (list): schema fields (API representation).
+            name (str): message name.
+
+        Returns:
+            google.protobuf.descriptor_pb2.DescriptorProto: descriptor.
+        """
+        proto = descriptor_pb2.DescriptorProto(name=name)
+        for number, field in enumerate(fields, start=1):
+            field_proto = proto.field.add(
+                name=field["name"],
+                number=number,
+                type=self.__get_proto_type(field["type"]),
+                label=(
+                    descriptor_pb2.FieldDescriptorProto.LABEL_REPEATED
+                    if field.get("mode", "NULLABLE").upper() == "REPEATED"
+                    else descriptor_pb2.FieldDescriptorProto.LABEL_OPTIONAL
+                ),
+            )
+            if field_proto.type == descriptor_pb2.FieldDescriptorProto.TYPE_MESSAGE:
+                nested_name = f"{name}_{field['name']}"
+                proto.nested_type.append(
+                    self.__build_descriptor(field.get("fields", []), nested_name)
+                )
+                field_proto.type_name = nested_name
+        return proto
+
+    def __get_message_class(self, descriptor: descriptor_pb2.DescriptorProto):
+        """Creates the message class for a descriptor."""
+        file_proto = descriptor_pb2.FileDescriptorProto(
+            name=f"{descriptor.name}.proto", syntax="proto2"
+        )
+        file_proto.message_type.append(descriptor)
+        pool = descriptor_pool.DescriptorPool()
+        pool.Add(file_proto)
+        message_descriptor = pool.FindMessageTypeByName(descriptor.name)
+        if hasattr(message_factory, "GetMessageClass"):
+            return message_factory.GetMessageClass(message_descriptor)
+        return message_factory.MessageFactory(pool).GetPrototype(message_descriptor)
+
+    def __is_null(self, value) -> bool:
+
+        if isinstance(value, (list, tuple, dict)) or hasattr(value, "__array__"):
+            return False
+        return bool(pd.isna(value))
+
+    def __to_datetime(self, value) -> datetime:
+        """Converts a value to a datetime without the year 2262 limit of pd.Timestamp."""
+        if isinstance(value, np.datetime64):
+            value = value.astype("datetime64[us]").item()
+        if isinstance(value, datetime):
+            return value
+        if isinstance(value, date):
+            return datetime(value.year, value.month, value.day)
+        if isinstance(value, str):
+            return datetime.fromisoformat(value)
+        return pd.Timestamp(value).to_pydatetime()
+
+    def __to_micros(self, value) -> int:
+        """Converts a value to microseconds since the epoch; naive values are taken as UTC."""
+        if isinstance(value, pd.Timestamp):
+            return value.as_unit("ns").value // 1000
+        value = self.__to_datetime(value)
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return (value - __class__._EPOCH) // __class__._MICROSECOND
+
+    def __convert(self, field: dict, value):
+        """Converts a value to the protocol buffer representation of its field type."""
+        field_type = field["type"].upper()
+        if field_type == "DATE":
+            return self.__to_datetime(value).toordinal() - __class__._EPOCH_ORDINAL
+        if field_type == "TIMESTAMP":
+            return self.__to_micros(value)
+        if field_type == "DATETIME":
+            return self.__to_datetime(value).strftime("%Y-%m-%d %H:%M:%S.%f")
+        if field_type == "JSON":
+            return value if isinstance(value, str) else json.dumps(value, default=str)
+        proto_type = self.__get_proto_type(field_type)
+        if proto_type == descriptor_pb2.FieldDescriptorProto.TYPE_INT64:
+            return int(value)
+        if proto_type == descriptor_pb2.FieldDescriptorProto.TYPE_DOUBLE:
+            return float(value)
+        if proto_type == descriptor_pb2.FieldDescriptorProto.TYPE_BOOL:
+            return bool(value)
+        if proto_type == descriptor_pb2.FieldDescriptorProto.TYPE_BYTES:
+            return value if isinstance(value, bytes) else str(value).encode("utf-8")
+        return str(value)
+
+    def __fill(self, message, fields: list, row: dict) -> None:
+        """Sets the fields of a message from a row dict."""
+        for field in fields:
+            value = row.get(field["name"])
+            if self.__is_null(value):
+                continue
+            is_record = field["type"].upper() in ("RECORD", "STRUCT")
+            if field.get("mode", "NULLABLE").upper() == "REPEATED":
+                target = getattr(message, field["name"])
+                for item in value:
+                    if is_record:
+                        self.__fill(target.add(), field.get("fields", []), item)
+                    elif not self.__is_null(item):
+                        target.append(self.__convert(field, item))
+            elif is_record:
+                self.__fill(getattr(message, field["name"]), field.get("fields", []), value)
+            else:
+                setattr(message, field["name"], self.__convert(field, value))
+
+    def __convert_array(self, field: dict, array: pa.ChunkedArray) -> Union[list, None]:
+        """Converts a column with Arrow compute; None if it needs the per-value path."""
+        field_type = field["type"].upper()
+        arrow_type = array.type
+        proto_type = self.__get_proto_type(field_type)
+        try:
+            if field_type == "TIMESTAMP":
+                if pa.types.is_timestamp(arrow_type):
+                    array = array.cast(pa.timestamp("us", tz=arrow_type.tz), safe=False)
+                    return array.cast(pa.int64()).to_pylist()
+                if pa.types.is_date(arrow_type):
+                    days = array.cast(pa.date32()).cast(pa.int32()).cast(pa.int64())
+                    return [None if d is None else d * 86400000000 for d in days.to_pylist()]
+            elif field_type == "DATE":
+                if pa.types.is_date(arrow_type) or pa.types.is_timestamp(arrow_type):
+                    return array.cast(pa.date32(), safe=False).cast(pa.int32()).to_pylist()
+            elif field_type in ("DATETIME", "JSON"):
+                return None
+            elif proto_type == descriptor_pb2.FieldDescriptorProto.TYPE_INT64:
+                if pa.types.is_integer(arrow_type) or pa.types.is_string(arrow_type):
+                    return array.cast(pa.int64()).to_pylist()
+                if pa.types.is_floating(arrow_type):
+                    return array.cast(pa.int64(), safe=False).to_pylist()
+            elif proto_type == descriptor_pb2.FieldDescriptorProto.TYPE_DOUBLE:
+                if pa.types.is_integer(arrow_type) or pa.types.is_floating(arrow_type):
+                    return array.cast(pa.float64()).to_pylist()
+            elif proto_type == descriptor_pb2.FieldDescriptorProto.TYPE_BOOL:
+                if pa.types.is_boolean(arrow_type):
+                    return array.to_pylist()
+            elif proto_type == descriptor_pb2.FieldDescriptorProto.TYPE_STRING:
+                if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+                    return array.to_pylist()
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            pass
+        return None
+
+    def __convert_column(self, field: dict, column) -> list:
+        """Converts a scalar column to protocol buffer values (None for nulls)."""
+        array = None
+        if isinstance(column, (pa.Array, pa.ChunkedArray)):
+            array = pa.chunked_array([column]) if isinstance(column, pa.Array) else column
+        else:
+            try:
+                array = pa.chunked_array([pa.array(column, from_pandas=True)])
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+                pass
+        if array is not None:
+            values = self.__convert_array(field, array)
+            if values is not None:
+                return values
+        values = array.to_pylist() if array is not None else column.tolist()
+        return [None if self.__is_null(v) else self.__convert(field, v) for v in values]
+
+    def __serialize(self, message_class, fields: list, batch) -> list:
+        """Serializes the rows of a batch column by column.
+
+        Scalar columns are converted as a whole (with Arrow where the types
+        allow it), so that only the message construction is done per row.
+        """
+        if isinstance(batch, pd.DataFrame):
+            num_rows, names = len(batch), set(batch.columns)
+            get_column = lambda name: batch[name]
+        else:
+            num_rows, names = batch.num_rows, set(batch.column_names)
+            get_column = batch.column
+
+        scalars, nested = [], []
+        for field in fields:
+            name = field["name"]
+            if name not in names:
+                continue
+            column = get_column(name)
+            if (field.get("mode", "NULLABLE").upper() == "REPEATED"
+                    or field["type"].upper() in ("RECORD", "STRUCT")):
+                values = column.to_pylist() if hasattr(column, "to_pylist") else column.tolist()
+                nested.append((field, values))
+            else:
+                scalars.append((name, self.__convert_column(field, column)))
+
+        rows = []
+        for i in range(num_rows):
+            message = message_class(
+                **{name: values[i] for name, values in scalars if values[i] is not None}
+            )
+            for field, values in nested:
+                self.__fill(message, [field], {field["name"]: values[i]})
+            rows.append(message.SerializeToString())
+        return rows
+
+    def __split_requests(self, rows: list) -> list:
+        """Splits serialized rows into append requests below the size limit."""
+        requests = []
+        start = size = 0
+        for i, row in enumerate(rows):
+            if size + len(row) > __class__._MAX_REQUEST_BYTES and i > start:
+                requests.append(rows[start:i])
+                start, size = i, 0
+            size += len(row)
+        if start < len(rows):
+            requests.append(rows[start:])
+        return requests
+
+    def __await(self, result: dict, future) -> None:
+        """Waits for an append request and records its errors in the batch result."""
+        try:
+            response = future.result()
+            result["errors"].extend(
+                f"row {e.index}: {e.message}" for e in response.row_errors
+            )
+        except Exception as err:
+            result["errors"].append(str(err))
+
+    def write(
+        self,
+        batches: Iterable[pd.DataFrame],
+        schema: List[bigquery.SchemaField],
+        dataset: str,
+        table: str,
+        stream_type: str = "PENDING",
+        max_in_flight: int = _MAX_IN_FLIGHT
+    ) -> List[dict]:
+        """Appends batches of rows to a table.
+
+        Args:
+            batches (Iterable[pd.DataFrame]): batches of rows (DataFrames or
+                Arrow tables / record batches).
+            schema (List[bigquery.SchemaField]): BigQuery schema (SchemaField
+                objects or API representation).
+            dataset (str): Dataset name.
+            table (str): Table name.
+            stream_type (str, optional): "PENDING" (rows are committed
+                together after all batches were appended without errors) or
+                "COMMITTED" (rows are visible once appended).
+                Defaults to "PENDING".
+            max_in_flight (int, optional): max. number of append requests
+                awaiting a response; further batches are serialized only
+                when the oldest request has completed. Defaults to 16.
+
+        Returns:
+            List[dict]: result per batch with keys
+                batch (int): batch number,
+                offset (int): stream offset of the first row,
+                rows (int): number of rows,
+                errors (list): error messages,
+                committed (bool): rows are committed to the table.
+        """
+        if stream_type not in ("PENDING", "COMMITTED"):
+            raise ValueError("Stream type must be PENDING or COMMITTED.")
+
+        fields = self.__get_fields(schema)
+        descriptor = self.__build_descriptor(fields, "Row")
+        message_class = self.__get_message_class(descriptor)
+
+        client = ClientFactory.get_write_client()
+        parent = client.table_path(self.project_id, dataset, table)
+        stream = client.create_write_stream(
+            parent=parent,
+            write_stream=types.WriteStream(type_=getattr(types.WriteStream.Type, stream_type)),
+        )
+        template = types.AppendRowsRequest(
+            write_stream=stream.name,
+            proto_rows=types.AppendRowsRequest.ProtoData(
+                writer_schema=types.ProtoSchema(proto_descriptor=descriptor)
+            ),
+        )
+        append_stream = AppendRowsStream(client, template)
+
+        results = []
+        futures = collections.deque()
+        offset = 0
+        try:
+            for i, batch in enumerate(batches):
+                rows = self.__serialize(message_class, fields, batch)
+                result = {
+                    "batch": i + 1, "offset": offset, "rows": len(rows),
+                    "errors": [], "committed": False,
+                }
+                results.append(result)
+                for request_rows in self.__split_requests(rows):
+                    request = types.AppendRowsRequest(
+                        offset=offset,
+                        proto_rows=types.AppendRowsRequest.ProtoData(
+                            rows=types.ProtoRows(serialized_rows=request_rows)
+                        ),
+                    )
+                    while len(futures) >= max_in_flight:
+                        self.__await(*futures.popleft())
+                    futures.append((result, append_stream.send(request)))
+                    offset += len(request_rows)
+
+            while futures:
+                self.__await(*futures.popleft())
+        finally:
+            append_stream.close()
+
+        client.finalize_write_stream(name=stream.name)
+        failed = any(r["errors"] for r in results)
+        if stream_type == "COMMITTED":
+            for result in results:
+                result["committed"] = not result["errors"]
+        elif not failed:
+            response = client.batch_commit_write_streams(
+                types.BatchCommitWriteStreamsRequest(
+                    parent=parent, write_streams=[stream.name]
+                )
+            )
+            errors = [e.error_message for e in response.stream_errors]
+            for result in results:
+                result["errors"].extend(errors)
+                result["committed"] = not errors
+        else:
+            self.logger.error("Stream %s not committed, batches failed.", stream.name)
+
+        self.logger.info(
+            "Wrote %s rows to %s (%s batches failed)",
+            sum(r["rows"] for r in results if r["committed"]),
+            parent,
+            sum(1 for r in results if r["errors"]),
+        )
+        return results
@@ -24,38 +24,15 @@
 
 import json
 import jsonschema
-from jsonschema import validate
+from jsonschema.exceptions import best_match
 from pathlib import Path
 
+from load import load
+
 
 class Dump:
     """Config is a class for JSON file loading and validation."""
 
-    def __load_file(self, file: str) -> dict:
-        """load contents of a file (JSON) into a dict object
-
-        Args:
-            file (str): file to be loaded
-
-        Raises:
-            FileNotFoundError: File not Found
-            Exception: File is malformed or empty
-
-        Returns:
-            dict: dict representation of the file's JSON content
-        """
-
-        if not Path(file).is_file():
-            raise FileNotFoundError(f"File: '{file}' does not exist.")
-
-        with open(file, mode='r', encoding='utf-8') as f:
-            try:
-                content = json.load(f)
-            except json.JSONDecodeError:
-                e_msg = f'File {file} is malformed or empty.'
-                raise Exception(e_msg) from None
-        return content
-
     def __dump_file(self, file: str, data:dict) -> bool:
         """writes the data (dict) as a JSON object into the file
 
@@ -81,12 +58,12 @@ class Dump:
             raise Exception from err
 
 
-    def __validate(self, config: dict, schema: dict) -> bool:
+    def __validate(self, config: dict, validator) -> bool:
         """validates configuration against JSON schema
 
         Args:
             config (dict): configuration object.
-            schema(dict): schema to validate the file content.
+            validator (jsonschema.protocols.Validator): compiled schema.
 
         Raises:
             Exception: jsonschema.exceptions.ValidationError
@@ -95,10 +72,9 @@ class Dump:
             bool: configuration is valid or not.
         """
 
-        try:
-            validate(instance=config, schema=schema)
-        except jsonschema.exceptions.ValidationError as err:
-            raise Exception from err
+        error = best_match(validator.iter_errors(config))
+        if error is not None:
+            raise Exception(error.message) from error
         return True
 
     def dump(self, file: str, data: dict, schema_file: str) -> bool:
@@ -117,9 +93,10 @@ class Dump:
         Returns:
             bool: file written or not
         """
-        schema = self.__load_file(schema_file)
+        # Compiled validators are cached by Load.
+        validator = load.Load().get_validator(schema_file)
         try:
-            if self.__validate(data, schema):
+            if self.__validate(data, validator):
                 return self.__dump_file(file, data)
         except jsonschema.exceptions.ValidationError as schema_err:
             raise Exception(schema_err) from schema_err
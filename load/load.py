@@ -22,15 +22,32 @@
 
 """Provides class JSON file loading and validation."""
 
+import hashlib
 import json
+import os
+import threading
 import jsonschema
-from jsonschema import validate
+import pyarrow as pa
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
+from os.path import expanduser, join
 from pathlib import Path
+from typing import Iterator
 
 
 class Load:
     """Config is a class for JSON file loading and validation."""
 
+    # Compiled validators shared by all instances, by schema file.
+    _validators = {}
+    _lock = threading.Lock()
+
+    DEFAULT_CACHE_PATH = join(expanduser("~"), ".datagen", "seeds")
+
+    _NDJSON_SUFFIXES = [".ndjson", ".jsonl"]
+    _READ_SIZE = 1 << 20
+    _BATCH_SIZE = 10000
+
     def __load_file(self, file: str) -> dict:
         """load a JSON file in to a dict.
 
@@ -56,12 +73,48 @@ class Load:
                 raise Exception(e_msg) from None
         return content
 
-    def __validate(self, config: dict, schema: dict) -> bool:
+    def get_validator(self, schema_file: str):
+        """Returns the compiled validator of a JSON schema file.
+
+        The schema is loaded and checked once per process, and again only
+        when the file is modified.
+
+        Args:
+            schema_file (str): JSON schema file.
+
+        Raises:
+            FileNotFoundError: File not found.
+            Exception: Incorrect or malformed JSON format in file.
+
+        Returns:
+            jsonschema.protocols.Validator: validator of the schema's draft
+                (Draft 7 if the schema does not declare one).
+        """
+        path = str(Path(schema_file).resolve())
+        if not Path(path).is_file():
+            raise FileNotFoundError(f"File: '{schema_file}' does not exist.")
+        mtime = Path(path).stat().st_mtime_ns
+
+        cached = __class__._validators.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        with __class__._lock:
+            cached = __class__._validators.get(path)
+            if cached is None or cached[0] != mtime:
+                schema = self.__load_file(path)
+                cls = validator_for(schema, default=jsonschema.Draft7Validator)
+                cls.check_schema(schema)
+                cached = (mtime, cls(schema))
+                __class__._validators[path] = cached
+        return cached[1]
+
+    def __validate(self, config: dict, schema_file: str) -> bool:
         """validates configuration against JSON schema
 
         Args:
             config (dict): configuration object.
-            schema(dict): schema to validate the file content.
+            schema_file (str): schema to validate the file content.
 
         Raises:
             Exception: Invalid configuration
@@ -70,12 +123,53 @@ class Load:
             bool: configuration is valid or not.
         """
 
-        try:
-            validate(instance=config, schema=schema)
-        except jsonschema.exceptions.ValidationError as err:
-            raise Exception(err) from None
+        error = best_match(self.get_validator(schema_file).iter_errors(config))
+        if error is not None:
+            raise Exception(error) from None
         return True
 
+    def iter_errors(self, data, schema_file: str):
+        """Yields the validation errors of data, one at a time.
+
+        Args:
+            data: JSON object (dict, list, ...).
+            schema_file (str): JSON schema file.
+
+        Yields:
+            jsonschema.exceptions.ValidationError: next error.
+        """
+        yield from self.get_validator(schema_file).iter_errors(data)
+
+    def validate_many(
+        self, records: list, schema_file: str, max_errors: int = None
+    ) -> list:
+        """validates records (e.g. of a seed file) one by one against a JSON schema
+
+        Args:
+            records (list): records.
+            schema_file (str): JSON schema file of one record.
+            max_errors (int, optional): stop after this many errors.
+                Defaults to None (all errors).
+
+        Returns:
+            list: errors as dicts with index (of the record), path (within
+                the record) and message. Empty if all records are valid.
+        """
+        validator = self.get_validator(schema_file)
+        errors = []
+        for index, record in enumerate(records):
+            if validator.is_valid(record):
+                continue
+            for error in validator.iter_errors(record):
+                errors.append({
+                    "index": index,
+                    "path": "/".join(str(p) for p in error.absolute_path),
+                    "message": error.message,
+                })
+                if max_errors is not None and len(errors) >= max_errors:
+                    return errors
+        return errors
+
     def load(self, file: str, schema_file: str = None) -> dict:
         """loads JSON file and validates against its JSON schema definition
 
@@ -88,8 +182,191 @@ class Load:
         """
         config = self.__load_file(file)
         if schema_file:
-            schema = self.__load_file(schema_file)
-            if self.__validate(config, schema):
+            if self.__validate(config, schema_file):
                 return config
         else:
             return config
+
+    def __iter_json_array(self, f, file: str) -> Iterator:
+        """Parses the elements of a JSON array incrementally.
+
+        Args:
+            f: file opened for reading, positioned at the "[".
+            file (str): file name (for error messages).
+
+        Raises:
+            Exception: Incorrect or malformed JSON format in file.
+
+        Yields:
+            next element.
+        """
+        decoder = json.JSONDecoder()
+        buffer = f.read(__class__._READ_SIZE).lstrip()[1:]
+        pos = 0
+        eof = False
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if buffer.startswith("]", pos):
+                return
+            try:
+                element, end = decoder.raw_decode(buffer, pos)
+                # A value ending at the end of the buffer may be cut off,
+                # e.g. the number 1000001 read as 100.
+                complete = end < len(buffer) or eof
+            except json.JSONDecodeError:
+                if eof:
+                    raise Exception(f'File {file} is malformed or empty.') from None
+                complete = False
+            if not complete:
+                # Keep only the unparsed rest of the buffer.
+                chunk = f.read(__class__._READ_SIZE)
+                eof = not chunk
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                continue
+            pos = end
+            yield element
+
+    def iter_records(self, file: str, schema_file: str = None) -> Iterator[dict]:
+        """Yields the records of a seed file one at a time.
+
+        Supports NDJSON (one record per line, files *.ndjson or *.jsonl),
+        JSON arrays (parsed incrementally) and single JSON objects.
+
+        Args:
+            file (str): seed file.
+            schema_file (str, optional): JSON schema file of one record.
+
+        Raises:
+            FileNotFoundError: File not found.
+            Exception: Incorrect or malformed JSON format, or invalid record.
+
+        Yields:
+            dict: next record.
+        """
+        if not Path(file).is_file():
+            raise FileNotFoundError(f"File: '{file}' does not exist.")
+        validator = self.get_validator(schema_file) if schema_file else None
+
+        with open(file, mode='r', encoding='utf-8') as f:
+            if Path(file).suffix.lower() in __class__._NDJSON_SUFFIXES:
+                records = (
+                    json.loads(line) for line in f if line.strip()
+                )
+            else:
+                first = f.read(__class__._READ_SIZE)
+                f.seek(0)
+                if first.lstrip().startswith("["):
+                    records = self.__iter_json_array(f, file)
+                else:
+                    records = iter([self.__load_file(file)])
+
+            try:
+                for index, record in enumerate(records):
+                    if validator is not None:
+                        error = best_match(validator.iter_errors(record))
+                        if error is not None:
+                            raise Exception(
+                                f'Record {index} in {file} is invalid: {error.message}'
+                            )
+                    yield record
+            except json.JSONDecodeError:
+                raise Exception(f'File {file} is malformed or empty.') from None
+
+    def __get_cache_file(self, file: str, cache_path: str) -> str:
+
+        digest = hashlib.sha256(str(Path(file).resolve()).encode()).hexdigest()[:32]
+        return join(cache_path, f"{Path(file).stem}-{digest}.arrow")
+
+    def __get_version(self, file: str, schema_file: str) -> str:
+        """Returns the version of a seed file: mtime and size of it and its schema."""
+        stats = [Path(file).stat()]
+        if schema_file:
+            stats.append(Path(schema_file).stat())
+        return "|".join(f"{s.st_mtime_ns}:{s.st_size}" for s in stats)
+
+    def __to_table(self, records: list) -> pa.Table:
+        """Converts records to an Arrow table with the fields of all records.
+
+        pa.Table.from_pylist takes the fields of the first record only;
+        fields missing in a record are null here.
+        """
+        fields = {}
+        for record in records:
+            fields.update(dict.fromkeys(record))
+        return pa.Table.from_pydict(
+            {field: [record.get(field) for record in records] for field in fields}
+        )
+
+    def load_table(
+        self, file: str, schema_file: str = None, cache_path: str = DEFAULT_CACHE_PATH
+    ) -> pa.Table:
+        """loads a seed file as Arrow table, from a memory-mapped cache file.
+
+        The cache file (Arrow IPC) is built on first load and reused as long
+        as the seed file (and its schema) are unchanged. Its memory is mapped,
+        not read, so only the pages actually accessed are resident.
+
+        Args:
+            file (str): seed file (see `iter_records`).
+            schema_file (str, optional): JSON schema file of one record.
+            cache_path (str, optional): directory of the cache files.
+                Defaults to ~/.datagen/seeds.
+
+        Raises:
+            FileNotFoundError: File not found.
+            Exception: Incorrect or malformed JSON format, or invalid record.
+
+        Returns:
+            pa.Table: records of the seed file.
+        """
+        if not Path(file).is_file():
+            raise FileNotFoundError(f"File: '{file}' does not exist.")
+        cache_file = self.__get_cache_file(file, cache_path)
+        version = self.__get_version(file, schema_file)
+
+        if Path(cache_file).is_file():
+            table = pa.ipc.open_file(pa.memory_map(cache_file)).read_all()
+            metadata = table.schema.metadata or {}
+            if metadata.get(b"version", b"").decode() == version:
+                return table
+
+        tables = []
+        batch = []
+        for record in self.iter_records(file, schema_file):
+            batch.append(record)
+            if len(batch) >= __class__._BATCH_SIZE:
+                tables.append(self.__to_table(batch))
+                batch = []
+        if batch or not tables:
+            tables.append(self.__to_table(batch))
+        # Fields missing in a batch are null, types are widened as needed
+        table = pa.concat_tables(tables, promote_options="permissive")
+        table = table.replace_schema_metadata({"version": version})
+
+        Path(cache_path).mkdir(parents=True, exist_ok=True)
+        temp_file = f"{cache_file}.{os.getpid()}.tmp"
+        with pa.OSFile(temp_file, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table, max_chunksize=__class__._BATCH_SIZE)
+        os.replace(temp_file, cache_file)
+
+        return pa.ipc.open_file(pa.memory_map(cache_file)).read_all()
+
+    def iter_cached_records(
+        self, file: str, schema_file: str = None, cache_path: str = DEFAULT_CACHE_PATH
+    ) -> Iterator[dict]:
+        """Yields the records of a seed file from its memory-mapped cache file.
+
+        Args:
+            file (str): seed file.
+            schema_file (str, optional): JSON schema file of one record.
+            cache_path (str, optional): directory of the cache files.
+                Defaults to ~/.datagen/seeds.
+
+        Yields:
+            dict: next record.
+        """
+        for batch in self.load_table(file, schema_file, cache_path).to_batches():
+            yield from batch.to_pylist()
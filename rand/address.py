@@ -21,25 +21,165 @@
 # SOFTWARE.
 """ Provides class for random address generation. """
 import logging
+import os
 
-from random import choice
+import numpy as np
+import pandas as pd
 from geonamescache import GeonamesCache
 from geopy import geocoders
 import pgeocode
 from babel.numbers import get_territory_currencies
 
-from faker import Faker
-from faker.providers import internet
+from rand import fakerpool
+from rand import geocache
+
+class _CountryIndex:
+    """City and postal code arrays of a single country for bulk sampling.
+
+    Postal codes are stored grouped by city (CSR layout): the postal code
+    rows of city `i` are `postal_start[i]:postal_start[i] + postal_count[i]`.
+    """
+
+    def __init__(self, country_code: str, cities: list):
+        """Initialize self.
+
+        Args:
+            country_code (str): ISO Country code (alpha 2).
+            cities (list): GeonamesCache city dicts of the country.
+        """
+
+        self.country_code = country_code
+        self.city_names = np.array([c.get("name") for c in cities], dtype=object)
+        self.city_latitudes = np.array(
+            [c.get("latitude", 0.0) for c in cities], dtype=float
+        )
+        self.city_longitudes = np.array(
+            [c.get("longitude", 0.0) for c in cities], dtype=float
+        )
+
+        postal = self.__read_postal_codes(country_code)
+        keys = postal["place_name"].str.lower().to_numpy(dtype=object)
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        postal = postal.iloc[order]
+
+        self.postal_codes = postal["postal_code"].to_numpy(dtype=object)
+        self.state_names = postal["state_name"].to_numpy(dtype=object)
+        self.state_codes = postal["state_code"].to_numpy(dtype=object)
+        self.postal_latitudes = postal["latitude"].to_numpy(dtype=float)
+        self.postal_longitudes = postal["longitude"].to_numpy(dtype=float)
+
+        places, starts, counts = np.unique(keys, return_index=True, return_counts=True)
+        lookup = dict(zip(places, zip(starts, counts)))
+        self.postal_start = np.zeros(len(self.city_names), dtype=np.int64)
+        self.postal_count = np.zeros(len(self.city_names), dtype=np.int64)
+        for i, name in enumerate(self.city_names):
+            start, count = lookup.get(str(name).lower(), (0, 0))
+            self.postal_start[i] = start
+            self.postal_count[i] = count
+
+        self._postal_places = keys
+        self._locations = None
+
+    @property
+    def locations(self) -> dict:
+        """(state, city) -> (latitude, longitude) lookup table.
+
+        Keys are lower case. Postal code centroids are averaged per state
+        and place; an empty state key holds the city coordinates from
+        GeonamesCache (or the postal centroid of the place if GeonamesCache
+        does not know the city).
+        """
+        if self._locations is None:
+            postal = pd.DataFrame({
+                "state": pd.Series(self.state_names, dtype=object).str.lower(),
+                "city": self._postal_places,
+                "latitude": self.postal_latitudes,
+                "longitude": self.postal_longitudes,
+            }).dropna(subset=["latitude", "longitude"])
+
+            locations = {}
+            for (state, city), row in postal.groupby(["state", "city"]).mean().iterrows():
+                locations[(state, city)] = (row["latitude"], row["longitude"])
+            for city, row in postal.groupby("city")[["latitude", "longitude"]].mean().iterrows():
+                locations[("", city)] = (row["latitude"], row["longitude"])
+            for name, lat, lon in zip(
+                self.city_names, self.city_latitudes, self.city_longitudes
+            ):
+                locations[("", str(name).lower())] = (lat, lon)
+            self._locations = locations
+        return self._locations
+
+    def __read_postal_codes(self, country_code: str) -> pd.DataFrame:
+        """Reads the pgeocode postal code table of a country.
+
+        Args:
+            country_code (str): ISO Country code (alpha 2).
+
+        Returns:
+            pandas.DataFrame: postal code table, empty if the country
+                              is not supported by pgeocode.
+        """
+        columns = ["postal_code", "place_name", "state_name", "state_code"]
+        try:
+            # Downloads the country file to the pgeocode cache if missing.
+            # The cached file holds all places, not only unique postal codes.
+            pgeocode.Nominatim(country_code, unique=False)
+            data = pd.read_csv(
+                os.path.join(pgeocode.STORAGE_DIR, country_code.upper() + ".txt"),
+                dtype={"postal_code": str},
+                na_values=pgeocode.NA_VALUES,
+                keep_default_na=False,
+            )
+        except (ValueError, OSError) as e:
+            logging.getLogger(__name__).warning(
+                "No postal codes for country %s, using cities only: %s", country_code, e
+            )
+            data = pd.DataFrame(columns=columns + ["latitude", "longitude"])
+
+        data = data[columns + ["latitude", "longitude"]].copy()
+        data[columns] = data[columns].fillna("").astype(str)
+        return data
+
+    def sample_postal_rows(self, cities: np.ndarray, rng: np.random.Generator):
+        """Picks a random postal code row for each city.
+
+        Args:
+            cities (numpy.ndarray): city indexes.
+            rng (numpy.random.Generator): random generator.
+
+        Returns:
+            numpy.ndarray: postal code row indexes, -1 if city has no postal code.
+        """
+        counts = self.postal_count[cities]
+        offsets = (rng.random(len(cities)) * counts).astype(np.int64)
+        return np.where(counts > 0, self.postal_start[cities] + offsets, -1)
+
 
 class Address:
     """Address is a class for random address generation."""
 
-    def __init__(self, min_len: int = 10, max_len: int = 100):
+    # Built once per process and shared by all instances.
+    _cities_by_country = None
+    _country_indexes = {}
+    _currencies = {}
+    _country_codes = None
+    _geolocator = None
+    _geocode_cache = geocache.GeocodeCache()
+
+    # Mean length of a degree of latitude in km.
+    _KM_PER_DEGREE = 111.32
+
+    _GEOCODING_MODES = ["nominatim", "offline"]
+
+    def __init__(self, min_len: int = 10, max_len: int = 100, seed: int = None):
         """Initialize self.
 
         Args:
             min_len (int, optional): min. length of street name. Defaults to 5.
             max_len (int, optional): max. length of street name. Defaults to 10.
+            seed (int, optional): seed for reproducible addresses.
+                Defaults to None.
         """
 
         self.logger = logging.getLogger(__name__)
@@ -48,6 +188,63 @@ class Address:
         self.max_len = max_len
         self.gc = GeonamesCache()
         self.locales = []
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.pool = fakerpool.FakerPool()
+        self.__fake = None
+        self.geocoding = "nominatim"
+        self.jitter_km = 0.0
+        self.geocode_cache = __class__._geocode_cache
+
+    def __get_country_index(self, country_code: str) -> _CountryIndex:
+        """Returns the (cached) city and postal code index of a country.
+
+        Args:
+            country_code (str): ISO Country code (alpha 2).
+
+        Returns:
+            _CountryIndex: index of the country.
+        """
+        index = __class__._country_indexes.get(country_code)
+        if index is None:
+            if __class__._cities_by_country is None:
+                cities_by_country = {}
+                for city in self.gc.get_cities().values():
+                    cities_by_country.setdefault(city.get("countrycode"), []).append(city)
+                __class__._cities_by_country = cities_by_country
+            index = _CountryIndex(
+                country_code,
+                __class__._cities_by_country.get(country_code, [])
+            )
+            __class__._country_indexes[country_code] = index
+        return index
+
+    def __get_currency(self, country_code: str) -> str:
+        """Returns the (cached) currency code of a country."""
+        if country_code not in __class__._currencies:
+            currencies = get_territory_currencies(country_code)
+            __class__._currencies[country_code] = currencies[0] if currencies else ""
+        return __class__._currencies[country_code]
+
+    def __get_country_weights(self, country_weights: dict = None) -> tuple:
+        """Normalizes country weights to probabilities.
+
+        Args:
+            country_weights (dict, optional): weights by ISO Country code.
+                Defaults to equal weights for the countries of the locales.
+
+        Returns:
+            tuple: (list of country codes, numpy.ndarray of probabilities)
+        """
+        if not country_weights:
+            codes = [l.split("_")[1].upper() for l in self.locales if "_" in l]
+            country_weights = dict.fromkeys(codes or ["US"], 1)
+
+        codes = list(country_weights.keys())
+        weights = np.array([country_weights[c] for c in codes], dtype=float)
+        if (weights < 0).any() or weights.sum() <= 0:
+            raise ValueError("Country weights must be positive.")
+        return codes, weights / weights.sum()
 
     def __get_country(self, country_code: str) -> dict:
         """Generates a random country dict."""
@@ -64,13 +261,7 @@ class Address:
         Returns:
             str: City name.
         """
-        return choice(
-            [
-                c.get("name")
-                for c in list(map(list, zip(*self.gc.get_cities().items())))[1]
-                if c.get("countrycode") == country_code
-            ]
-        )
+        return self.rng.choice(self.__get_country_index(country_code).city_names)
 
     def __get_location(self, country_code: str, city_name: str) -> dict:
         """Generates a location with PO Code, state infos.
@@ -85,26 +276,81 @@ class Address:
                 statename (str): State name.
                 statecode (str): State Code.
         """
-        try:
-            location = [
-                "" if str(x) == "nan" else x
-                for x in choice(
-                    pgeocode.Nominatim(country_code)
-                    .query_location(city_name)
-                    .values.tolist()
-                )
-            ]
-            return {
-                "pocode": location[1],
-                "statename": location[3],
-                "statecode": location[4],
-            }
-        except IndexError:
+        index = self.__get_country_index(country_code)
+        cities = np.flatnonzero(index.city_names == city_name)
+        rows = index.sample_postal_rows(cities[:1], self.rng)
+        if not rows.size or rows[0] < 0:
             return {"pocode": "", "statename": "", "statecode": ""}
+        return {
+            "pocode": index.postal_codes[rows[0]],
+            "statename": index.state_names[rows[0]],
+            "statecode": index.state_codes[rows[0]],
+        }
 
     def set_locales(self, locales: list) -> None:
 
         self.locales = locales
+        self.__fake = None
+
+    def __get_faker(self):
+        """Returns the (pooled) Faker instance for the locales."""
+        if self.__fake is None:
+            self.__fake = self.pool.get(self.locales, self.seed)
+        return self.__fake
+
+    def set_geocoding(self, mode: str, jitter_km: float = 0.0) -> None:
+        """Sets how geolocations are determined.
+
+        Args:
+            mode (str): "nominatim" (geocode via network, one request per
+                address) or "offline" (lookup in the GeonamesCache city
+                coordinates and pgeocode postal code centroids).
+            jitter_km (float, optional): standard deviation in km of a random
+                offset added to offline geolocations, to spread addresses
+                within a city. Defaults to 0.0.
+
+        Raises:
+            ValueError: Unknown mode.
+        """
+        if mode not in __class__._GEOCODING_MODES:
+            raise ValueError(
+                f"Geocoding mode must be one of {__class__._GEOCODING_MODES}."
+            )
+        self.geocoding = mode
+        self.jitter_km = jitter_km
+
+    def set_geocode_cache(self, cache: geocache.GeocodeCache) -> None:
+        """Sets the cache for nominatim geolocations.
+
+        By default all instances share one in-process cache. Pass a
+        GeocodeCache with a file path to keep geolocations across runs.
+
+        Args:
+            cache (geocache.GeocodeCache): geolocation cache.
+        """
+        self.geocode_cache = cache
+
+    def __get_country_code(self, country: str) -> str:
+        """Resolves a country name (or ISO Country code) to the ISO Country code."""
+        if __class__._country_codes is None:
+            __class__._country_codes = {
+                c.get("name").lower(): code
+                for code, c in self.gc.get_countries().items()
+            }
+        if len(country) == 2 and country.upper() in self.gc.get_countries():
+            return country.upper()
+        return __class__._country_codes.get(country.lower(), "")
+
+    def __jitter(self, latitudes: np.ndarray, longitudes: np.ndarray) -> tuple:
+        """Adds a random offset of `jitter_km` to coordinates."""
+        if self.jitter_km <= 0:
+            return latitudes, longitudes
+        scale = self.jitter_km / __class__._KM_PER_DEGREE
+        lat = latitudes + self.rng.normal(0.0, scale, len(latitudes))
+        lon = longitudes + self.rng.normal(0.0, scale, len(longitudes)) / np.maximum(
+            np.cos(np.radians(latitudes)), 0.01
+        )
+        return np.clip(lat, -90.0, 90.0), (lon + 180.0) % 360.0 - 180.0
 
     def gen_address(self) -> dict:
         """Generates a address dict.
@@ -126,7 +372,7 @@ class Address:
             location = self.__get_location(country_code, city)
             street = self.gen_street_address()
             geoloc = self.get_geolocation(city, str(location["statename"]), country_name)
-            currency_code = get_territory_currencies(country_code)[0]
+            currency_code = self.__get_currency(country_code)
 
             return {
                 "country_code": country_code,
@@ -143,59 +389,190 @@ class Address:
         except TypeError:
             return None
 
+    def gen_addresses(self, n: int, country_weights: dict = None) -> pd.DataFrame:
+        """Generates a batch of addresses.
+
+        Countries, cities, postal codes and states are sampled in bulk
+        from per-country indexes which are built once per process.
+        Geolocation is taken from the postal code centroid (or the city
+        coordinates) plus the jitter set with `set_geocoding`.
+
+        Args:
+            n (int): number of addresses.
+            country_weights (dict, optional): weights by ISO Country code
+                e.g. {"DE": 3, "US": 1}. Defaults to equal weights for the
+                countries of the locales.
+
+        Returns:
+            pandas.DataFrame: One address per row with the columns of
+                              `gen_address`.
+        """
+        codes, probabilities = self.__get_country_weights(country_weights)
+        countries = self.rng.choice(len(codes), size=n, p=probabilities)
+
+        columns = {
+            key: np.full(n, "", dtype=object)
+            for key in [
+                "country_code", "country_name", "state_code", "state_name",
+                "postal_code", "city_name", "currency_code"
+            ]
+        }
+        latitudes = np.zeros(n, dtype=float)
+        longitudes = np.zeros(n, dtype=float)
+
+        for i, country_code in enumerate(codes):
+            rows = np.flatnonzero(countries == i)
+            if not rows.size:
+                continue
+            columns["country_code"][rows] = country_code
+            columns["country_name"][rows] = self.__get_country(country_code)
+            columns["currency_code"][rows] = self.__get_currency(country_code)
+
+            index = self.__get_country_index(country_code)
+            if not len(index.city_names):
+                continue
+            cities = self.rng.integers(0, len(index.city_names), size=rows.size)
+            columns["city_name"][rows] = index.city_names[cities]
+            latitudes[rows] = index.city_latitudes[cities]
+            longitudes[rows] = index.city_longitudes[cities]
+
+            postal = index.sample_postal_rows(cities, self.rng)
+            found = postal >= 0
+            columns["postal_code"][rows[found]] = index.postal_codes[postal[found]]
+            columns["state_name"][rows[found]] = index.state_names[postal[found]]
+            columns["state_code"][rows[found]] = index.state_codes[postal[found]]
+
+            # Prefer the postal code centroid where pgeocode has one.
+            centroid = found.copy()
+            centroid[found] = ~np.isnan(index.postal_latitudes[postal[found]])
+            latitudes[rows[centroid]] = index.postal_latitudes[postal[centroid]]
+            longitudes[rows[centroid]] = index.postal_longitudes[postal[centroid]]
+
+        latitudes, longitudes = self.__jitter(latitudes, longitudes)
+
+        streets = self.gen_street_addresses(n)
+
+        return pd.DataFrame({
+            "country_code": columns["country_code"],
+            "country_name": columns["country_name"],
+            "state_code": columns["state_code"],
+            "state_name": columns["state_name"],
+            "postal_code": columns["postal_code"],
+            "city_name": columns["city_name"],
+            "street": streets,
+            "latitude": latitudes,
+            "longitude": longitudes,
+            "currency_code": columns["currency_code"],
+        })
+
     def get_geolocation(
         self,
         city: str,
         state: str,
         country: str
     ) -> dict:
-        """Get geolocation (lat, long) for a given address"""
+        """Get geolocation (lat, long) for a given address.
+
+        Uses the mode set with `set_geocoding`. Nominatim results are
+        cached (see `set_geocode_cache`), so an address is geocoded once.
+        Returns 0.0 / 0.0 (and logs a warning) if the address cannot be
+        located.
+
+        Args:
+            city (str): City name.
+            state (str): State name.
+            country (str): Country name or ISO Country code (alpha 2).
+
+        Returns:
+            dict: dict with keys latitude (float), longitude (float).
+        """
+
+        if self.geocoding == "offline":
+            return self.__get_offline_geolocation(city, state, country)
 
         address = (city + ", " + state + ", " + country)
+        key = self.geocode_cache.get_key(city, state, country)
+        cached = self.geocode_cache.get(key)
+        if cached is not None:
+            return cached
+
         try:
-            geolocator = geocoders.Nominatim(user_agent="datagenApp")
-            geolocation = geolocator.geocode(address)
+            if __class__._geolocator is None:
+                __class__._geolocator = geocoders.Nominatim(user_agent="datagenApp")
+            geolocation = __class__._geolocator.geocode(address)
             if geolocation is not None:
+                self.geocode_cache.put(key, geolocation.latitude, geolocation.longitude)
                 return {"latitude": geolocation.latitude, "longitude": geolocation.longitude}
             else:
+                # Cache misses of nominatim too, they will not resolve next time either.
+                self.geocode_cache.put(key, 0.0, 0.0)
+                self.logger.warning("No geolocation found for %s", address)
                 return {"latitude": 0.0, "longitude": 0.0}
         except Exception as e:
             self.logger.error(e)
             return {"latitude": 0.0, "longitude": 0.0}
 
+    def __get_offline_geolocation(self, city: str, state: str, country: str) -> dict:
+        """Looks up a geolocation in the (country, state, city) table.
+
+        Args:
+            city (str): City name.
+            state (str): State name.
+            country (str): Country name or ISO Country code (alpha 2).
+
+        Returns:
+            dict: dict with keys latitude (float), longitude (float).
+        """
+        country_code = self.__get_country_code(country)
+        location = None
+        if country_code:
+            locations = self.__get_country_index(country_code).locations
+            location = locations.get(
+                (state.lower(), city.lower()),
+                locations.get(("", city.lower()))
+            )
+        if location is None:
+            self.logger.warning(
+                "No geolocation found for %s, %s, %s", city, state, country
+            )
+            return {"latitude": 0.0, "longitude": 0.0}
+
+        lat, lon = self.__jitter(np.array([location[0]]), np.array([location[1]]))
+        return {"latitude": float(lat[0]), "longitude": float(lon[0])}
+
     def gen_address2(self) -> str:
 
-        fake = Faker(self.locales)
+        fake = self.__get_faker()
         return fake.address()
 
     def gen_street_address(self) -> str:
 
-        fake = Faker(self.locales)
+        fake = self.__get_faker()
         return fake.street_address()
 
     def gen_street_name(self) -> str:
 
-        fake = Faker(self.locales)
+        fake = self.__get_faker()
         return fake.street_name()
 
     def gen_street_suffix(self) -> str:
 
-        fake = Faker(self.locales)
+        fake = self.__get_faker()
         return fake.street_suffix()
 
     def gen_city(self) -> str:
 
-        fake = Faker(self.locales)
+        fake = self.__get_faker()
         return fake.city()
 
     def gen_country(self) -> str:
 
-        fake = Faker(self.locales)
+        fake = self.__get_faker()
         return fake.country()
 
     def gen_country_code(self) -> str:
 
-        fake = Faker(self.locales)
+        fake = self.__get_faker()
         return fake.current_country_code()
 
     def gen_state(self) -> str:
@@ -208,52 +585,71 @@ class Address:
 
     def gen_postcode(self) -> str:
 
-        fake = Faker(self.locales)
+        fake = self.__get_faker()
         return fake.postcode()
 
     def gen_building_number(self) -> str:
 
-        fake = Faker(self.locales)
+        fake = self.__get_faker()
         return fake.building_number()
 
     def gen_country_calling_code(self) -> str:
 
-        fake = Faker(self.locales)
+        fake = self.__get_faker()
         return fake.country_calling_code()
 
     def gen_msisdn(self) -> str:
 
-        fake = Faker(self.locales)
+        fake = self.__get_faker()
         return fake.msisdn()
 
     def gen_phone_number(self) -> str:
 
-        fake = Faker(self.locales)
+        fake = self.__get_faker()
         return fake.phone_number()
 
     def gen_email(self):
 
-        fake = Faker(self.locales)
+        fake = self.__get_faker()
         return fake.email()
 
     def gen_company_email(self):
 
-        fake = Faker(self.locales)
+        fake = self.__get_faker()
         return fake.company_email()
 
     def gen_free_email(self):
 
-        fake = Faker(self.locales)
+        fake = self.__get_faker()
         return fake.free_email()
 
     def gen_uri(self, deep:int):
 
-        # add_provider is not implemented in multiple locale mode
-        fake = Faker()
-        fake.add_provider(internet)
+        # internet is one of the default providers of the en_US Faker
+        fake = self.pool.get()
         _ = deep
         return fake.uri()
 
+    def gen_street_addresses(self, n: int) -> list:
+
+        return self.pool.batch(self.__get_faker(), "street_address", n)
+
+    def gen_postcodes(self, n: int) -> list:
+
+        return self.pool.batch(self.__get_faker(), "postcode", n)
+
+    def gen_phone_numbers(self, n: int) -> list:
+
+        return self.pool.batch(self.__get_faker(), "phone_number", n)
+
+    def gen_emails(self, n: int) -> list:
+
+        return self.pool.batch(self.__get_faker(), "email", n)
+
+    def gen_company_emails(self, n: int) -> list:
+
+        return self.pool.batch(self.__get_faker(), "company_email", n)
+
     def get_currency_code(
         self,
         locale: str = "en_US",
@@ -33,18 +33,30 @@ the date formatted string to DATE type.
 import logging
 
 from datetime import date, datetime, timedelta
-from random import randint, choices
+from random import Random
 import calendar
-from faker import Faker
+import numpy as np
+
+from rand import fakerpool
 
 
 class Date:
     """Date is a class for random date generation."""
 
-    Faker.seed(4711)
-    faker = Faker()
     logger = logging.getLogger(__name__)
 
+    def __init__(self, seed: int = None):
+        """Initialize self.
+
+        Args:
+            seed (int, optional): seed for reproducible dates
+                (see rand.seed.Seed). Defaults to None.
+        """
+        self.random = Random(seed)
+        self.rng = np.random.default_rng(seed)
+        # Unseeded: the shared instance, one sequence across all instances.
+        self.faker = fakerpool.FakerPool().get(seed=seed)
+
     def gen_date_between(self, start: str, end: str) -> date:
         """Generates a date in between two input dates
 
@@ -61,7 +73,7 @@ class Date:
 
         try:
             delta = date.fromisoformat(end) - date.fromisoformat(start)
-            return date.fromisoformat(start) + timedelta(randint(1, delta.days))
+            return date.fromisoformat(start) + timedelta(self.random.randint(1, delta.days))
         except ValueError as err:
             raise ValueError(err) from None
 
@@ -86,7 +98,7 @@ class Date:
             month_year = months[0].split("-")
             start = month_year[0] + "-" + month_year[1] + "-01"
         else:
-            month_year = choices(months, weights=weights, k=1)[0].split("-")
+            month_year = self.random.choices(months, weights=weights, k=1)[0].split("-")
             start = month_year[0] + "-" + month_year[1] + "-01"
             end = (
                 month_year[0]
@@ -98,10 +110,80 @@ class Date:
 
         return self.gen_date_between(start, end)
 
+    def gen_dates_between(self, start: str, end: str, n: int) -> np.ndarray:
+        """Generates dates in between two input dates
+
+        Args:
+            start (str): Earliest date in ISO format.
+            end (str): Latest date in ISO format.
+            n (int): number of dates.
+
+        Raises:
+            ValueError: One of the input dates are not in ISO format
+                        or end is not after start.
+
+        Returns:
+            numpy.ndarray: dates (datetime64[D]) in between lower and upper.
+        """
+
+        try:
+            lower = np.datetime64(date.fromisoformat(start), "D")
+            upper = np.datetime64(date.fromisoformat(end), "D")
+        except ValueError as err:
+            raise ValueError(err) from None
+
+        days = int((upper - lower).astype(np.int64))
+        if days < 1:
+            raise ValueError("End date must be after start date.")
+        return lower + self.rng.integers(1, days + 1, size=n)
+
+    def gen_skewed_dates_between(self, months: list, weights: list, n: int) -> np.ndarray:
+        """Generates dates within months picked with a skew.
+
+        Args:
+            months (list): months ('YYYY-MM') to choose from.
+            weights (list): weights for the months (sum to 100).
+            n (int): number of dates.
+
+        Returns:
+            numpy.ndarray: dates (datetime64[D]) within the months.
+        """
+
+        if len(months) != len(weights):
+            raise ValueError("Months and weights must have the same length.")
+        if sum(weights) != 100:
+            raise ValueError("Weights must sum to 100.")
+
+        month_starts = np.array([m[:7] for m in months], dtype="datetime64[M]")
+        first_days = month_starts.astype("datetime64[D]")
+        month_days = ((month_starts + 1).astype("datetime64[D]") - first_days).astype(np.int64)
+
+        picks = self.rng.choice(len(months), size=n, p=np.asarray(weights) / 100)
+        offsets = (self.rng.random(n) * month_days[picks]).astype(np.int64)
+        return first_days[picks] + offsets
+
     def gen_timestamp_between(self, start: str, end: str) -> datetime:
 
         return self.faker.date_time_between(start, end)
 
+    def gen_timestamps_between(self, start: str, end: str, n: int) -> np.ndarray:
+        """Generates timestamps in between two input timestamps
+
+        Args:
+            start (str): Earliest timestamp in ISO format.
+            end (str): Latest timestamp in ISO format.
+            n (int): number of timestamps.
+
+        Returns:
+            numpy.ndarray: timestamps (datetime64[us]) in between lower and upper.
+        """
+
+        lower = np.datetime64(start, "us")
+        micros = int((np.datetime64(end, "us") - lower).astype(np.int64))
+        if micros < 1:
+            raise ValueError("End timestamp must be after start timestamp.")
+        return lower + self.rng.integers(0, micros, size=n).astype("timedelta64[us]")
+
     def gen_date_around(self, key_date: str, range_days: int) -> date:
         """Generates a date around a specified key date.
 
@@ -117,11 +199,37 @@ class Date:
         """
 
         try:
-            delta = randint(1, range_days) * (randint(0, 1) * 2 - 1)
+            delta = self.random.randint(1, range_days) * (self.random.randint(0, 1) * 2 - 1)
             return date.fromisoformat(key_date) + timedelta(days=delta)
         except ValueError as err:
             raise ValueError(err) from None
 
+    def gen_dates_around(self, key_dates, range_days: int, n: int = None) -> np.ndarray:
+        """Generates dates around key dates.
+
+        Args:
+            key_dates (str | array-like): Key date in ISO format, or one
+                key date per output date (e.g. the header dates of items).
+            range_days (int): Max. days earlier or later to the key date.
+            n (int, optional): number of dates. Defaults to the number of
+                key dates.
+
+        Returns:
+            numpy.ndarray: dates (datetime64[D]) around the key dates.
+        """
+
+        try:
+            keys = np.asarray(key_dates, dtype="datetime64[D]")
+        except ValueError as err:
+            raise ValueError(err) from None
+
+        if n is None:
+            n = keys.size
+        delta = self.rng.integers(1, range_days + 1, size=n) * (
+            self.rng.integers(0, 2, size=n) * 2 - 1
+        )
+        return keys + delta
+
     def gen_date_after_days(self, start_date: date, days: int) -> date:
         return start_date + timedelta(days=days)
 
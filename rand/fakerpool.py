@@ -0,0 +1,107 @@
+# MIT License
+
+# Copyright (c) 2025 rameshsuraparaju
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Provides class for sharing Faker instances.
+
+Constructing a Faker instance loads the providers of every locale and is
+far more expensive than generating a value with it.  FakerPool keeps one
+instance per set of locales for the whole process.
+"""
+
+import logging
+import random
+import threading
+
+from faker import Faker
+
+
+class FakerPool:
+    """Shared Faker instances keyed by locales."""
+
+    _fakers = {}
+    _lock = threading.Lock()
+
+    def __init__(self) -> None:
+
+        self.logger = logging.getLogger(__name__)
+
+    def get(self, locales: list = None, seed: int = None) -> Faker:
+        """Returns a Faker instance for the locales.
+
+        Unseeded instances are shared by all callers with the same locales.
+        Seeded instances are created per call (and should be kept by the
+        caller), so that their sequence of values only depends on the seed.
+
+        Args:
+            locales (list, optional): Faker locales. Defaults to None (en_US).
+            seed (int, optional): seed of the instance. Defaults to None.
+
+        Returns:
+            faker.Faker: Faker instance.
+        """
+        key = tuple(locales) if locales else ("en_US",)
+        if seed is not None:
+            fake = Faker(list(key))
+            fake.seed_instance(seed)
+            return fake
+
+        with __class__._lock:
+            fake = __class__._fakers.get(key)
+            if fake is None:
+                fake = Faker(list(key))
+                __class__._fakers[key] = fake
+            return fake
+
+    def batch(self, fake: Faker, method: str, n: int, *args, **kwargs) -> list:
+        """Generates `n` values with a Faker provider method.
+
+        The provider method is resolved once per locale instead of once
+        per value. With multiple locales, each value is generated by a
+        locale picked with the locale weights of the instance (as Faker does).
+
+        Args:
+            fake (faker.Faker): Faker instance.
+            method (str): provider method name e.g. "street_address".
+            n (int): number of values.
+            *args: positional arguments of the provider method.
+            **kwargs: keyword arguments of the provider method.
+
+        Returns:
+            list: generated values.
+        """
+        if len(fake.locales) == 1:
+            func = getattr(fake, method)
+            return [func(*args, **kwargs) for _ in range(n)]
+
+        factories = []
+        weights = []
+        for i, factory in enumerate(fake.factories):
+            if hasattr(factory, method):
+                factories.append(getattr(factory, method))
+                weights.append(fake.weights[i] if fake.weights else 1)
+        if not factories:
+            raise AttributeError(f"No generator object has attribute '{method}'")
+
+        # Separate stream for the locale picks, values do not depend on n.
+        picker = random.Random(fake.factories[0].random.random())
+        picks = picker.choices(range(len(factories)), weights, k=n)
+        return [factories[p](*args, **kwargs) for p in picks]
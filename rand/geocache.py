@@ -0,0 +1,205 @@
+# MIT License
+
+# Copyright (c) 2025 rameshsuraparaju
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Provides class for caching geolocations.
+
+Geolocations are kept in a two-level cache: an in-process LRU and,
+optionally, a persistent SQLite file shared by subsequent runs.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+
+from collections import OrderedDict
+from pathlib import Path
+
+
+class GeocodeCache:
+    """Two-level (in-process LRU and SQLite file) cache of geolocations."""
+
+    def __init__(
+        self,
+        path: str = None,
+        max_size: int = 10000,
+        max_disk_size: int = None,
+        ttl: float = None
+    ):
+        """Initialize self.
+
+        Args:
+            path (str, optional): SQLite file for the persistent level.
+                Defaults to None (in-process cache only).
+            max_size (int, optional): max. entries in the in-process LRU.
+                Defaults to 10000.
+            max_disk_size (int, optional): max. entries in the SQLite file,
+                least recently used entries are evicted. Defaults to None
+                (unlimited).
+            ttl (float, optional): time to live of an entry in seconds.
+                Defaults to None (entries never expire).
+        """
+
+        self.logger = logging.getLogger(__name__)
+        self.max_size = max_size
+        self.max_disk_size = max_disk_size
+        self.ttl = ttl
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.__lock = threading.Lock()
+        self.__memory = OrderedDict()
+        self.__db = None
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self.__db = sqlite3.connect(path, check_same_thread=False)
+            self.__db.execute(
+                "CREATE TABLE IF NOT EXISTS geolocation ("
+                " address TEXT PRIMARY KEY,"
+                " latitude REAL NOT NULL,"
+                " longitude REAL NOT NULL,"
+                " created REAL NOT NULL,"
+                " accessed REAL NOT NULL)"
+            )
+            self.__db.execute(
+                "CREATE INDEX IF NOT EXISTS geolocation_accessed"
+                " ON geolocation (accessed)"
+            )
+            self.__db.commit()
+
+    @staticmethod
+    def get_key(city: str, state: str, country: str) -> str:
+        """Normalizes an address to a cache key.
+
+        Args:
+            city (str): City name.
+            state (str): State name.
+            country (str): Country name.
+
+        Returns:
+            str: "city, state, country" in lower case with single spaces.
+        """
+        return ", ".join(" ".join(str(p).split()).lower() for p in (city, state, country))
+
+    def __expired(self, created: float) -> bool:
+
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    def get(self, key: str) -> dict:
+        """Reads a geolocation from the cache.
+
+        Args:
+            key (str): cache key, see `get_key`.
+
+        Returns:
+            dict: dict with keys latitude (float), longitude (float)
+                  or None if the key is not cached (or expired).
+        """
+        with self.__lock:
+            entry = self.__memory.get(key)
+            if entry is not None:
+                if not self.__expired(entry[2]):
+                    self.__memory.move_to_end(key)
+                    self.hits += 1
+                    return {"latitude": entry[0], "longitude": entry[1]}
+                del self.__memory[key]
+
+            if self.__db is not None:
+                row = self.__db.execute(
+                    "SELECT latitude, longitude, created FROM geolocation WHERE address = ?",
+                    (key,)
+                ).fetchone()
+                if row is not None and not self.__expired(row[2]):
+                    self.__db.execute(
+                        "UPDATE geolocation SET accessed = ? WHERE address = ?",
+                        (time.time(), key)
+                    )
+                    self.__db.commit()
+                    self.__put_memory(key, row)
+                    self.disk_hits += 1
+                    return {"latitude": row[0], "longitude": row[1]}
+                if row is not None:
+                    self.__db.execute("DELETE FROM geolocation WHERE address = ?", (key,))
+                    self.__db.commit()
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, latitude: float, longitude: float) -> None:
+        """Writes a geolocation to both cache levels.
+
+        Args:
+            key (str): cache key, see `get_key`.
+            latitude (float): Latitude.
+            longitude (float): Longitude.
+        """
+        now = time.time()
+        with self.__lock:
+            self.__put_memory(key, (latitude, longitude, now))
+            if self.__db is None:
+                return
+            self.__db.execute(
+                "INSERT OR REPLACE INTO geolocation VALUES (?, ?, ?, ?, ?)",
+                (key, latitude, longitude, now, now)
+            )
+            if self.max_disk_size is not None:
+                deleted = self.__db.execute(
+                    "DELETE FROM geolocation WHERE address IN ("
+                    " SELECT address FROM geolocation ORDER BY accessed DESC"
+                    " LIMIT -1 OFFSET ?)",
+                    (self.max_disk_size,)
+                ).rowcount
+                self.evictions += max(deleted, 0)
+            self.__db.commit()
+
+    def __put_memory(self, key: str, entry: tuple) -> None:
+
+        self.__memory[key] = entry
+        self.__memory.move_to_end(key)
+        while len(self.__memory) > self.max_size:
+            self.__memory.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        """Returns the cache counters.
+
+        Returns:
+            dict: hits (in-process), disk_hits, misses, evictions and size
+                  (entries in the in-process LRU).
+        """
+        with self.__lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self.__memory),
+            }
+
+    def close(self) -> None:
+        """Closes the SQLite file."""
+        with self.__lock:
+            if self.__db is not None:
+                self.__db.close()
+                self.__db = None
@@ -25,9 +25,11 @@
 import logging
 
 from os.path import abspath, dirname, join
-from uuid import uuid4
-from random import choice, choices
-from string import ascii_letters, ascii_lowercase, digits
+from uuid import UUID
+from random import Random
+from string import ascii_letters, ascii_lowercase, ascii_uppercase, digits
+
+import numpy as np
 
 from load import load
 
@@ -36,6 +38,132 @@ class ID:
 
     logger = logging.getLogger(__name__)
 
+    _HEX_DIGITS = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+
+    _CHECKSUM_CHARS = ascii_uppercase + "012345"
+
+    # Unique ranks are drawn without replacement only if there are at most
+    # this many possible identifiers per identifier drawn.
+    _DENSE_FACTOR = 4
+
+    # Salesforce entity-key prefixes, loaded once per process.
+    _prefixes = None
+
+    def __init__(self, seed: int = None):
+        """Initialize self.
+
+        Args:
+            seed (int, optional): seed for reproducible identifiers
+                (see rand.seed.Seed). Defaults to None.
+        """
+        self.random = Random(seed)
+        self.rng = np.random.default_rng(seed)
+
+    def __draw_ids(self, chars: str, n: int, length: int) -> np.ndarray:
+        """Draws `n` identifiers of `length` characters at once.
+
+        Args:
+            chars (str): characters to choose from (ASCII).
+            n (int): number of identifiers.
+            length (int): length of each identifier.
+
+        Returns:
+            numpy.ndarray: identifiers as byte strings (dtype S<length>).
+        """
+        alphabet = np.frombuffer(chars.encode("ascii"), dtype=np.uint8)
+        codes = alphabet[self.rng.integers(0, len(alphabet), size=(n, length))]
+        return np.ascontiguousarray(codes).view(f"S{length}").ravel()
+
+    def __gen_ids(self, chars: str, n: int, length: int, unique: bool) -> np.ndarray:
+        """Generates `n` identifiers, optionally unique within the batch.
+
+        Unique identifiers are drawn as distinct ranks and converted to
+        characters.  If `n` is a large part of the possible identifiers,
+        the ranks are drawn without replacement; otherwise (e.g. 8 digit
+        numbers) they are drawn with replacement and only the few duplicates
+        are drawn again, so no array of all possible ranks is allocated.
+        For more than 2**63 possible identifiers the ranks do not fit an
+        integer; duplicate identifiers are then drawn again the same way.
+
+        Args:
+            chars (str): characters to choose from (ASCII).
+            n (int): number of identifiers.
+            length (int): length of each identifier.
+            unique (bool): identifiers must be unique within the batch.
+
+        Raises:
+            ValueError: `n` unique identifiers do not exist for `length`.
+
+        Returns:
+            numpy.ndarray: identifiers (dtype U<length>).
+        """
+        if length <= 0:
+            return np.full(n, "", dtype="U1")
+
+        capacity = len(chars) ** length
+        if not unique:
+            ids = self.__draw_ids(chars, n, length)
+        elif capacity < n:
+            raise ValueError(
+                f"Cannot generate {n} unique identifiers of length {length}."
+            )
+        elif capacity <= np.iinfo(np.int64).max:
+            if capacity <= __class__._DENSE_FACTOR * n:
+                ranks = self.rng.choice(capacity, size=n, replace=False)
+            else:
+                ranks = self.__draw_unique(
+                    lambda k: self.rng.integers(0, capacity, size=k, dtype=np.int64), n
+                )
+            ranks = ranks.astype(np.uint64)
+            powers = np.uint64(len(chars)) ** np.arange(length - 1, -1, -1, dtype=np.uint64)
+            positions = (ranks[:, None] // powers) % np.uint64(len(chars))
+            alphabet = np.frombuffer(chars.encode("ascii"), dtype=np.uint8)
+            ids = np.ascontiguousarray(alphabet[positions]).view(f"S{length}").ravel()
+        else:
+            ids = self.__draw_unique(lambda k: self.__draw_ids(chars, k, length), n)
+        return ids.astype(f"U{length}")
+
+    def __draw_unique(self, draw, n: int) -> np.ndarray:
+        """Draws `n` distinct values, drawing only the duplicates again.
+
+        Args:
+            draw (Callable): draws k random values, draw(k) -> numpy.ndarray.
+            n (int): number of values.
+
+        Returns:
+            numpy.ndarray: distinct values.
+        """
+        values = draw(n)
+        while True:
+            _, first = np.unique(values, return_index=True)
+            missing = len(values) - len(first)
+            if missing == 0:
+                return values
+            values = np.concatenate([values[np.sort(first)], draw(missing)])
+
+    def __gen_uuids(self, n: int, hyphens: bool) -> np.ndarray:
+        """Generates `n` random (version 4) UUIDs as hex strings.
+
+        Args:
+            n (int): number of UUIDs.
+            hyphens (bool): format with hyphens (8-4-4-4-12).
+
+        Returns:
+            numpy.ndarray: UUIDs (dtype U36 or U32).
+        """
+        raw = self.rng.integers(0, 256, size=(n, 16), dtype=np.uint8)
+        raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40  # version 4
+        raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80  # variant RFC 4122
+
+        chars = np.empty((n, 32), dtype=np.uint8)
+        chars[:, 0::2] = __class__._HEX_DIGITS[raw >> 4]
+        chars[:, 1::2] = __class__._HEX_DIGITS[raw & 0x0F]
+        if hyphens:
+            chars = np.insert(chars, [8, 12, 16, 20], ord("-"), axis=1)
+
+        length = chars.shape[1]
+        return np.ascontiguousarray(chars).view(f"S{length}").ravel().astype(f"U{length}")
+
     def gen_string_uuid(self) -> str:
         """Generates UUID as a string.  Will contain hyphens ('-')
 
@@ -43,7 +171,7 @@ class ID:
             str: UUID as string.
         """
 
-        return str(uuid4())
+        return str(UUID(int=self.random.getrandbits(128), version=4))
 
     def gen_alphanumeric_uuid(self) -> str:
         """Generates UUID as a string.  Will not contain hyphens ('-')
@@ -52,7 +180,7 @@ class ID:
             str: UUID as a string with alphanumeric characters only.
         """
 
-        return str(uuid4().hex)
+        return UUID(int=self.random.getrandbits(128), version=4).hex
 
     def gen_upper_alphanumeric_uuid(self) -> str:
         """Generates UUID as alphanumeric string in UPPERCASE.
@@ -74,7 +202,7 @@ class ID:
         Returns:
             str: A generated numeric identifier.
         """
-        return ''.join(choice(digits) for _ in range(length))
+        return ''.join(self.random.choice(digits) for _ in range(length))
 
 
     def gen_alphanumeric_id(self, length: int) -> str:
@@ -87,12 +215,12 @@ class ID:
             str: A generated alphanumeric identifier.
         """
         chars = ascii_lowercase + digits
-        return ''.join(choice(chars) for _ in range(length))
+        return ''.join(self.random.choice(chars) for _ in range(length))
 
     def gen_hyphenated_alphanumeric_id(self, length: int) -> str:
 
         chars = ascii_letters + digits + '-' + '_'
-        return ''.join(choices(chars, k= length))
+        return ''.join(self.random.choices(chars, k= length))
 
     def gen_upper_alphanumeric_id(self, length: int) -> str:
         """Generates an alphanumeric identifier in UPPERCASE.
@@ -106,12 +234,130 @@ class ID:
         return self.gen_alphanumeric_id(length).upper()
 
 
-    def __get_prefixes(self) -> list:
+    def gen_string_uuids(self, n: int) -> np.ndarray:
+        """Generates UUIDs as strings.  Will contain hyphens ('-')
+
+        Args:
+            n (int): number of UUIDs.
+
+        Returns:
+            numpy.ndarray: UUIDs as strings.
+        """
+        return self.__gen_uuids(n, hyphens=True)
 
-        d = dirname(abspath(__file__))
-        prefix_file = join(d, 'salesforce-identifier-prefixes.json')
-        prefix_schema_file = join(d, 'salesforce-identifier-prefixes.schema.json')
-        return load.Load().load(prefix_file, prefix_schema_file)
+    def gen_alphanumeric_uuids(self, n: int) -> np.ndarray:
+        """Generates UUIDs as strings.  Will not contain hyphens ('-')
+
+        Args:
+            n (int): number of UUIDs.
+
+        Returns:
+            numpy.ndarray: UUIDs as strings with alphanumeric characters only.
+        """
+        return self.__gen_uuids(n, hyphens=False)
+
+    def gen_upper_alphanumeric_uuids(self, n: int) -> np.ndarray:
+        """Generates UUIDs as alphanumeric strings in UPPERCASE.
+
+        Args:
+            n (int): number of UUIDs.
+
+        Returns:
+            numpy.ndarray: UUIDs as strings in UPPERCASE
+                           with alphanumeric characters only.
+        """
+        return np.char.upper(self.__gen_uuids(n, hyphens=False))
+
+    def gen_numeric_ids(self, n: int, length: int, unique: bool = False) -> np.ndarray:
+        """Generates numeric identifiers.
+
+        Args:
+            n (int): number of identifiers.
+            length (int): length of the identifiers.
+            unique (bool, optional): identifiers are unique within the batch.
+                Defaults to False.
+
+        Returns:
+            numpy.ndarray: generated numeric identifiers.
+        """
+        return self.__gen_ids(digits, n, length, unique)
+
+    def gen_alphanumeric_ids(self, n: int, length: int, unique: bool = False) -> np.ndarray:
+        """Generates alphanumeric identifiers.
+
+        Args:
+            n (int): number of identifiers.
+            length (int): length of the identifiers.
+            unique (bool, optional): identifiers are unique within the batch.
+                Defaults to False.
+
+        Returns:
+            numpy.ndarray: generated alphanumeric identifiers.
+        """
+        return self.__gen_ids(ascii_lowercase + digits, n, length, unique)
+
+    def gen_hyphenated_alphanumeric_ids(
+        self, n: int, length: int, unique: bool = False
+    ) -> np.ndarray:
+
+        return self.__gen_ids(ascii_letters + digits + '-' + '_', n, length, unique)
+
+    def gen_upper_alphanumeric_ids(
+        self, n: int, length: int, unique: bool = False
+    ) -> np.ndarray:
+        """Generates alphanumeric identifiers in UPPERCASE.
+
+        Args:
+            n (int): number of identifiers.
+            length (int): length of the identifiers.
+            unique (bool, optional): identifiers are unique within the batch.
+                Defaults to False.
+
+        Returns:
+            numpy.ndarray: generated alphanumeric identifiers in UPPERCASE.
+        """
+        return self.__gen_ids(ascii_uppercase + digits, n, length, unique)
+
+    def __get_prefixes(self) -> dict:
+        """Loads the entity-key prefix mappings once per process.
+
+        Returns:
+            dict: key prefix by Salesforce entity.
+        """
+        if __class__._prefixes is None:
+            d = dirname(abspath(__file__))
+            prefix_file = join(d, 'salesforce-identifier-prefixes.json')
+            prefix_schema_file = join(d, 'salesforce-identifier-prefixes.schema.json')
+            __class__._prefixes = {
+                p.get('entity'): p.get('keyPrefix', 'XXX')
+                for p in load.Load().load(prefix_file, prefix_schema_file)
+            }
+        return __class__._prefixes
+
+    def __get_prefix(self, entity: str) -> str:
+        """Returns the key prefix of a Salesforce entity.
+
+        Raises:
+            ValueError: Unknown entity.
+        """
+        try:
+            return self.__get_prefixes()[entity]
+        except KeyError:
+            msg = f"No key prefix for Salesforce entity '{entity}'."
+            self.logger.error(msg)
+            raise ValueError(msg) from None
+
+    def __get_checksum(self, id15: str) -> str:
+        """Computes the case-safe suffix of a 15 character Salesforce ID.
+
+        Each block of 5 characters is mapped to one character: bit i is set
+        if the i-th character of the block is an uppercase letter.
+        """
+        suffix = ''
+        for i in range(0, 15, 5):
+            bits = sum(1 << j for j, c in enumerate(id15[i:i+5]) if c in ascii_uppercase)
+            suffix += __class__._CHECKSUM_CHARS[bits]
+        return suffix
 
     def gen_salesforce_id(self, entity:str) -> str:
         """generates a 18 character Salesforce ID.
@@ -120,18 +366,41 @@ class ID:
         Returns:
             str: Salesforce ID
         """
-        prefixes = self.__get_prefixes()
-        try:
-            prefix = [
-                p for p in prefixes
-                if p.get('entity') == entity
-            ][0].get('keyPrefix','XXX')
-        except IndexError as err:
-            print(err)
-
-        instance = self.gen_alphanumeric_id(2)
+        prefix = self.__get_prefix(entity)
+
+        chars = ascii_letters + digits
+        instance = ''.join(self.random.choices(chars, k=2))
         reserve = '0'
-        id = self.gen_alphanumeric_id(12)
+        id = ''.join(self.random.choices(chars, k=9))
+
+        id15 = prefix + instance + reserve + id
+        return id15 + self.__get_checksum(id15)
+
+    def gen_salesforce_ids(self, entity: str, n: int, unique: bool = False) -> np.ndarray:
+        """generates 18 character Salesforce IDs.
+        Args:
+            entity(str): Salesforce entity type
+            n (int): number of IDs.
+            unique (bool, optional): IDs are unique within the batch.
+                Defaults to False.
+        Returns:
+            numpy.ndarray: Salesforce IDs
+        """
+        prefix = self.__get_prefix(entity)
+
+        # instance (2) and id (9) characters, the reserved character is '0'
+        body = self.__gen_ids(ascii_letters + digits, n, 11, unique)
+        body = body.astype("S11").view(np.uint8).reshape(n, 11)
+
+        id15 = np.empty((n, 15), dtype=np.uint8)
+        id15[:, :3] = np.frombuffer(prefix.encode("ascii"), dtype=np.uint8)
+        id15[:, 3:5] = body[:, :2]
+        id15[:, 5] = ord('0')
+        id15[:, 6:] = body[:, 2:]
 
-        return prefix + instance + reserve + id
+        upper = ((id15 >= ord('A')) & (id15 <= ord('Z'))).reshape(n, 3, 5)
+        bits = upper @ (1 << np.arange(5))
+        checksum_chars = np.frombuffer(__class__._CHECKSUM_CHARS.encode("ascii"), dtype=np.uint8)
 
+        id18 = np.concatenate([id15, checksum_chars[bits]], axis=1)
+        return np.ascontiguousarray(id18).view("S18").ravel().astype("U18")
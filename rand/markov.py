@@ -0,0 +1,153 @@
+# MIT License
+
+# Copyright (c) 2025 rameshsuraparaju
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Provides class for offline text generation with Markov chains.
+
+A word level Markov chain is trained from example texts (e.g. cached
+model responses, see rand.promptcache) and generates new texts on the
+CPU, without network.  Transitions are stored as flat NumPy arrays and
+all texts of a batch are generated together, one word position at a
+time.
+"""
+
+import logging
+
+import numpy as np
+
+
+class Markov:
+    """Word level Markov chain text generator."""
+
+    _START = "\x02"
+    _END = "\x03"
+
+    def __init__(self, order: int = 2, seed: int = None):
+        """Initialize self.
+
+        Args:
+            order (int, optional): number of preceding words a word
+                depends on. Defaults to 2.
+            seed (int, optional): seed for generation. Defaults to None.
+        """
+
+        self.logger = logging.getLogger(__name__)
+        self.order = order
+        self.rng = np.random.default_rng(seed)
+        self.words = None
+
+    def train(self, texts: list) -> None:
+        """Builds the transition tables from example texts.
+
+        Args:
+            texts (list): example texts.
+
+        Raises:
+            ValueError: No example text.
+        """
+
+        texts = [t for t in texts if t and t.strip()]
+        if not texts:
+            raise ValueError("At least one example text is required.")
+
+        word_ids = {__class__._START: 0, __class__._END: 1}
+        state_ids = {}
+        counts = {}
+        for text in texts:
+            tokens = [0] * self.order
+            tokens += [word_ids.setdefault(w, len(word_ids)) for w in text.split()]
+            tokens.append(1)
+            for i in range(self.order, len(tokens)):
+                state = state_ids.setdefault(tuple(tokens[i - self.order:i]), len(state_ids))
+                edge = (state, tokens[i])
+                counts[edge] = counts.get(edge, 0) + 1
+
+        # Destination state of every edge (-1 after the end token)
+        states = {v: k for k, v in state_ids.items()}
+        edges = sorted(counts)
+        sources = np.array([e[0] for e in edges], dtype=np.int64)
+        self.edge_words = np.array([e[1] for e in edges], dtype=np.int64)
+        self.edge_states = np.array(
+            [
+                state_ids.get(states[s][1:] + (w,), -1) if w != 1 else -1
+                for s, w in edges
+            ],
+            dtype=np.int64
+        )
+
+        # Cumulative probability within each source state, offset by the
+        # state id: searching state + u (u in [0, 1)) finds the next edge.
+        weights = np.array([counts[e] for e in edges], dtype=float)
+        totals = np.bincount(sources, weights=weights)
+        cumulative = np.cumsum(weights)
+        first = np.searchsorted(sources, sources)
+        before = np.where(first > 0, cumulative[first - 1], 0.0)
+        self.edge_keys = sources + (cumulative - before) / totals[sources]
+
+        self.start_state = state_ids[tuple([0] * self.order)]
+        self.words = np.array(list(word_ids), dtype=object)
+
+    def gen_texts(self, n: int, max_words: int = 80) -> list:
+        """Generates texts.
+
+        Args:
+            n (int): number of texts.
+            max_words (int, optional): max. words per text. Defaults to 80.
+
+        Raises:
+            ValueError: Generator is not trained.
+
+        Returns:
+            list: generated texts.
+        """
+
+        if self.words is None:
+            raise ValueError("Markov chain is not trained.")
+
+        state = np.full(n, self.start_state, dtype=np.int64)
+        alive = np.arange(n)
+        tokens = np.full((n, max_words), -1, dtype=np.int64)
+        for position in range(max_words):
+            if not alive.size:
+                break
+            edges = np.searchsorted(
+                self.edge_keys,
+                state[alive] + self.rng.random(alive.size),
+                side="right"
+            )
+            words = self.edge_words[edges]
+            tokens[alive, position] = np.where(words == 1, -1, words)
+            state[alive] = self.edge_states[edges]
+            alive = alive[words != 1]
+
+        return [" ".join(self.words[row[row > 1]]) for row in tokens]
+
+    def gen_text(self, max_words: int = 80) -> str:
+        """Generates a text.
+
+        Args:
+            max_words (int, optional): max. words. Defaults to 80.
+
+        Returns:
+            str: generated text.
+        """
+
+        return self.gen_texts(1, max_words)[0]
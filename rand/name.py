@@ -24,16 +24,31 @@
 
 import logging
 
-from faker import Faker
+from rand import fakerpool
 
 
 class Name:
     """Random name (persons and companies) generation. """
 
-    def __init__(self) -> None:
+    def __init__(self, seed: int = None) -> None:
+        """Initialize self.
+
+        Args:
+            seed (int, optional): seed for reproducible names.
+                Defaults to None.
+        """
 
         self.logger = logging.getLogger(__name__)
         self.locales = ["en_US"]
+        self.seed = seed
+        self.pool = fakerpool.FakerPool()
+        self.__fake = None
+
+    def __get_faker(self):
+        """Returns the (pooled) Faker instance for the locales."""
+        if self.__fake is None:
+            self.__fake = self.pool.get(self.locales, self.seed)
+        return self.__fake
 
     def set_locales(self, locales: list):
 
@@ -49,28 +64,49 @@ class Name:
         "de_DE"
         """
         self.locales = locales
+        self.__fake = None
 
     def gen_first_name(self) -> str:
 
-        fake = Faker(self.locales)
+        fake = self.__get_faker()
         return fake.first_name()
 
     def gen_last_name(self) -> str:
 
-        fake = Faker(self.locales)
+        fake = self.__get_faker()
         return fake.last_name()
 
     def gen_name(self) -> str:
 
-        fake = Faker(self.locales)
+        fake = self.__get_faker()
         return fake.name()
 
     def gen_company(self) -> dict:
 
-        fake = Faker(self.locales)
+        fake = self.__get_faker()
         return fake.company()
 
     def gen_company_suffix(self) -> str:
 
-        fake = Faker(self.locales)
+        fake = self.__get_faker()
         return fake.company_suffix()
+
+    def gen_first_names(self, n: int) -> list:
+
+        return self.pool.batch(self.__get_faker(), "first_name", n)
+
+    def gen_last_names(self, n: int) -> list:
+
+        return self.pool.batch(self.__get_faker(), "last_name", n)
+
+    def gen_names(self, n: int) -> list:
+
+        return self.pool.batch(self.__get_faker(), "name", n)
+
+    def gen_companies(self, n: int) -> list:
+
+        return self.pool.batch(self.__get_faker(), "company", n)
+
+    def gen_company_suffixes(self, n: int) -> list:
+
+        return self.pool.batch(self.__get_faker(), "company_suffix", n)
@@ -0,0 +1,286 @@
+# MIT License
+
+# Copyright (c) 2025 rameshsuraparaju
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Provides class for sequential document number allocation.
+
+Modeled on SAP number range intervals (table NRIV): an interval
+(from number, to number) is defined per client, number range object
+(e.g. VBELN for sales documents, BELNR for accounting documents) and
+number range number.  The number level (last number handed out) is
+persisted in a local SQLite file, so that parallel workers and
+subsequent runs never allocate the same number twice.
+"""
+
+import logging
+import sqlite3
+import threading
+
+from os.path import expanduser, join
+from pathlib import Path
+
+import numpy as np
+
+
+class NumberRange:
+    """Allocates contiguous blocks of document numbers per number range interval."""
+
+    DEFAULT_PATH = join(expanduser("~"), ".datagen", "nriv.sqlite")
+
+    def __init__(self, path: str = DEFAULT_PATH, timeout: float = 60.0):
+        """Initialize self.
+
+        Args:
+            path (str, optional): SQLite file holding the number levels.
+                Defaults to ~/.datagen/nriv.sqlite.
+            timeout (float, optional): seconds to wait for a lock held by
+                another process. Defaults to 60.0.
+        """
+        self.logger = logging.getLogger(__name__)
+        # One transaction at a time on the shared connection.
+        self.lock = threading.Lock()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode, transactions are opened explicitly.
+        self.db = sqlite3.connect(
+            path, timeout=timeout, isolation_level=None, check_same_thread=False
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS nriv ("
+            " client TEXT NOT NULL,"
+            " object TEXT NOT NULL,"
+            " nrrangenr TEXT NOT NULL,"
+            " fromnumber INTEGER NOT NULL,"
+            " tonumber INTEGER NOT NULL,"
+            " nrlevel INTEGER NOT NULL,"
+            " PRIMARY KEY (client, object, nrrangenr))"
+        )
+
+    def define(
+        self,
+        client: str,
+        nr_object: str,
+        nr_range: str,
+        from_number: int,
+        to_number: int,
+        replace: bool = False
+    ) -> None:
+        """Defines a number range interval.
+
+        An existing interval keeps its number level unless `replace` is set.
+
+        Args:
+            client (str): SAP client (MANDT).
+            nr_object (str): number range object e.g. "RV_BELEG".
+            nr_range (str): number range number e.g. "01".
+            from_number (int): first number of the interval.
+            to_number (int): last number of the interval.
+            replace (bool, optional): reset the interval and its number level.
+                Defaults to False.
+
+        Raises:
+            ValueError: from_number is greater than to_number.
+        """
+        if from_number > to_number:
+            raise ValueError("from_number must not be greater than to_number.")
+        verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+        with self.lock:
+            self.db.execute(
+                f"{verb} INTO nriv VALUES (?, ?, ?, ?, ?, ?)",
+                (client, nr_object, nr_range, from_number, to_number, from_number - 1)
+            )
+
+    def get_level(self, client: str, nr_object: str, nr_range: str) -> int:
+        """Returns the number level (last allocated number) of an interval.
+
+        Raises:
+            ValueError: Interval is not defined.
+        """
+        with self.lock:
+            row = self.db.execute(
+                "SELECT nrlevel FROM nriv WHERE client = ? AND object = ? AND nrrangenr = ?",
+                (client, nr_object, nr_range)
+            ).fetchone()
+        if row is None:
+            raise ValueError(
+                f"Number range interval {client}/{nr_object}/{nr_range} is not defined."
+            )
+        return row[0]
+
+    def allocate(
+        self,
+        client: str,
+        nr_object: str,
+        nr_range: str,
+        size: int,
+        max_number: int = None
+    ) -> tuple:
+        """Allocates a block of consecutive numbers.
+
+        The block is reserved in one transaction, so concurrent processes
+        always receive disjoint blocks.
+
+        Args:
+            client (str): SAP client (MANDT).
+            nr_object (str): number range object.
+            nr_range (str): number range number.
+            size (int): number of numbers.
+            max_number (int, optional): last number the caller can use
+                (e.g. the largest number of the field length), if below
+                the interval's to number. Defaults to None.
+
+        Raises:
+            ValueError: Interval is not defined or exhausted, or the block
+                would exceed max_number. Nothing is allocated then.
+
+        Returns:
+            tuple: (first, last) number of the block.
+        """
+        if size <= 0:
+            raise ValueError("size must be greater than 0.")
+
+        with self.lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.db.execute(
+                    "SELECT tonumber, nrlevel FROM nriv"
+                    " WHERE client = ? AND object = ? AND nrrangenr = ?",
+                    (client, nr_object, nr_range)
+                ).fetchone()
+                if row is None:
+                    raise ValueError(
+                        f"Number range interval {client}/{nr_object}/{nr_range} is not defined."
+                    )
+                to_number, level = row
+                if level + size > to_number:
+                    raise ValueError(
+                        f"Number range interval {client}/{nr_object}/{nr_range} is exhausted."
+                    )
+                if max_number is not None and level + size > max_number:
+                    raise ValueError(f"Number {level + size} exceeds {max_number}.")
+                self.db.execute(
+                    "UPDATE nriv SET nrlevel = ?"
+                    " WHERE client = ? AND object = ? AND nrrangenr = ?",
+                    (level + size, client, nr_object, nr_range)
+                )
+                self.db.execute("COMMIT")
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+        return level + 1, level + size
+
+    def gen_numbers(
+        self,
+        client: str,
+        nr_object: str,
+        nr_range: str,
+        n: int,
+        length: int = 10
+    ) -> np.ndarray:
+        """Allocates `n` numbers and formats them with leading zeros.
+
+        Args:
+            client (str): SAP client (MANDT).
+            nr_object (str): number range object.
+            nr_range (str): number range number.
+            n (int): number of numbers.
+            length (int, optional): length of the formatted number
+                (e.g. 10 for VBELN, BELNR). Defaults to 10.
+
+        Raises:
+            ValueError: Interval is exhausted or the numbers do not fit
+                into `length` digits.
+
+        Returns:
+            numpy.ndarray: document numbers as strings.
+        """
+        first, last = self.allocate(
+            client, nr_object, nr_range, n, max_number=10 ** length - 1
+        )
+
+        numbers = np.arange(first, last + 1, dtype=np.int64)
+        powers = 10 ** np.arange(length - 1, -1, -1, dtype=np.int64)
+        chars = ((numbers[:, None] // powers) % 10 + ord("0")).astype(np.uint8)
+        return np.ascontiguousarray(chars).view(f"S{length}").ravel().astype(f"U{length}")
+
+    def seed_from_table(
+        self,
+        reader,
+        dataset: str,
+        table: str,
+        key_field: str,
+        client: str,
+        nr_object: str,
+        nr_range: str,
+        client_field: str = "none"
+    ) -> int:
+        """Raises the number level to the max. key already in a table.
+
+        Used to resume APPEND runs: numbers allocated afterwards are
+        greater than every key of the interval loaded before.  Keys
+        outside the interval (e.g. of other intervals) are ignored.
+
+        Args:
+            reader (bq.read.Reader): BigQuery reader.
+            dataset (str): Dataset name.
+            table (str): Table name.
+            key_field (str): key column holding the numbers e.g. "vbeln".
+            client (str): SAP client (MANDT).
+            nr_object (str): number range object.
+            nr_range (str): number range number.
+            client_field (str, optional): client column e.g. "mandt".
+                Defaults to "none" (table is not client dependent).
+
+        Raises:
+            ValueError: Interval is not defined.
+
+        Returns:
+            int: number level after seeding.
+        """
+        with self.lock:
+            row = self.db.execute(
+                "SELECT fromnumber, tonumber FROM nriv"
+                " WHERE client = ? AND object = ? AND nrrangenr = ?",
+                (client, nr_object, nr_range)
+            ).fetchone()
+        if row is None:
+            raise ValueError(
+                f"Number range interval {client}/{nr_object}/{nr_range} is not defined."
+            )
+        from_number, to_number = row
+
+        # Keys of other intervals (e.g. external numbers) must not count.
+        client_value = client if client_field != "none" else "000"
+        max_key = reader.read_max_field(
+            dataset, table, key_field, client_field, client_value,
+            from_number, to_number
+        )
+        if max_key is not None:
+            with self.lock:
+                self.db.execute(
+                    "UPDATE nriv SET nrlevel = MAX(nrlevel, ?)"
+                    " WHERE client = ? AND object = ? AND nrrangenr = ?",
+                    (int(max_key), client, nr_object, nr_range)
+                )
+        return self.get_level(client, nr_object, nr_range)
+
+    def close(self) -> None:
+        """Closes the SQLite file."""
+        self.db.close()
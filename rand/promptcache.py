@@ -0,0 +1,181 @@
+# MIT License
+
+# Copyright (c) 2025 rameshsuraparaju
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Provides class for caching generated texts.
+
+Responses of the text model are stored in a SQLite file, content
+addressed by (prompt template, parameters, model, temperature).  Up to
+`variants` responses are kept per key and served at random, so that
+repeated prompts stay diverse without paying for new completions.
+"""
+
+import hashlib
+import json
+import logging
+import random
+import sqlite3
+import threading
+import time
+
+from pathlib import Path
+
+
+class PromptCache:
+    """Content addressed cache of prompt responses."""
+
+    def __init__(self, path: str, variants: int = 3, seed: int = None):
+        """Initialize self.
+
+        Args:
+            path (str): SQLite file of the cache.
+            variants (int, optional): responses kept per key. A key is
+                served from the cache once it has this many responses.
+                Defaults to 3.
+            seed (int, optional): seed for sampling responses.
+                Defaults to None.
+        """
+
+        self.logger = logging.getLogger(__name__)
+        self.variants = variants
+        self.random = random.Random(seed)
+        self.hits = 0
+        self.misses = 0
+
+        self.__lock = threading.Lock()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.__db = sqlite3.connect(path, check_same_thread=False)
+        self.__db.execute(
+            "CREATE TABLE IF NOT EXISTS response ("
+            " key TEXT NOT NULL,"
+            " template TEXT NOT NULL,"
+            " text TEXT NOT NULL,"
+            " created REAL NOT NULL)"
+        )
+        self.__db.execute("CREATE INDEX IF NOT EXISTS response_key ON response (key)")
+        self.__db.execute(
+            "CREATE INDEX IF NOT EXISTS response_template ON response (template)"
+        )
+        self.__db.commit()
+
+    @staticmethod
+    def get_key(template: str, params: dict, model: str, temperature: float) -> str:
+        """Computes the cache key of a prompt.
+
+        Args:
+            template (str): prompt template name e.g. "case_subject".
+            params (dict): template parameters e.g. {"reason": "..."}.
+            model (str): model name.
+            temperature (float): sampling temperature.
+
+        Returns:
+            str: SHA-256 hex digest.
+        """
+        content = json.dumps([template, params, model, temperature], sort_keys=True)
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def __get_texts(self, key: str) -> list:
+
+        return [
+            row[0] for row in self.__db.execute(
+                "SELECT text FROM response WHERE key = ?", (key,)
+            )
+        ]
+
+    def get(self, key: str) -> str:
+        """Returns a random cached response once a key has all its variants.
+
+        Args:
+            key (str): cache key, see `get_key`.
+
+        Returns:
+            str: response or None if fewer than `variants` are cached
+                 (a new response should be generated and `put`).
+        """
+        with self.__lock:
+            texts = self.__get_texts(key)
+            if len(texts) < self.variants:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return self.random.choice(texts)
+
+    def sample(self, key: str) -> str:
+        """Returns a random cached response of a key, however many are cached.
+
+        Args:
+            key (str): cache key, see `get_key`.
+
+        Returns:
+            str: response or None if nothing is cached.
+        """
+        with self.__lock:
+            texts = self.__get_texts(key)
+            if not texts:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return self.random.choice(texts)
+
+    def put(self, key: str, template: str, text: str) -> None:
+        """Adds a response to a key.
+
+        Args:
+            key (str): cache key, see `get_key`.
+            template (str): prompt template name.
+            text (str): response.
+        """
+        with self.__lock:
+            self.__db.execute(
+                "INSERT INTO response VALUES (?, ?, ?, ?)",
+                (key, template, text, time.time())
+            )
+            self.__db.commit()
+
+    def get_template_texts(self, template: str) -> list:
+        """Returns all cached responses of a prompt template.
+
+        Args:
+            template (str): prompt template name.
+
+        Returns:
+            list: responses.
+        """
+        with self.__lock:
+            return [
+                row[0] for row in self.__db.execute(
+                    "SELECT text FROM response WHERE template = ?", (template,)
+                )
+            ]
+
+    def stats(self) -> dict:
+        """Returns the cache counters.
+
+        Returns:
+            dict: hits, misses.
+        """
+        with self.__lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        """Closes the SQLite file."""
+        with self.__lock:
+            self.__db.close()
@@ -0,0 +1,298 @@
+# MIT License
+
+# Copyright (c) 2025 rameshsuraparaju
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Provides class for sampling foreign keys from parent tables.
+
+The key columns of a parent table are read once per client (MANDT) into
+NumPy arrays.  Child rows then draw their foreign keys vectorized from
+this index, with a uniform or a skewed (Zipf, Pareto) popularity of the
+parent keys, and item tables are fanned out from their headers with
+SAP-style item numbers (POSNR), e.g.
+
+    sampler = ReferenceSampler(reader, seed=4711)
+    customers = sampler.sample(dataset, "kna1", ["kunnr"], n, "zipf", 1.1,
+                               client_field="mandt", client_value="100")
+    items = sampler.fan_out(dataset, "vbak", ["vbeln"], 1, 10,
+                            client_field="mandt", client_value="100")
+"""
+
+import logging
+
+import numpy as np
+
+
+class ReferenceSampler:
+    """Samples foreign keys from an in-memory index of parent key columns."""
+
+    _DISTRIBUTIONS = ["uniform", "zipf", "pareto"]
+
+    def __init__(self, reader, seed: int = None):
+        """Initialize self.
+
+        Args:
+            reader (bq.read.Reader): BigQuery reader.
+            seed (int, optional): random seed. Defaults to None.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.reader = reader
+        self.rng = np.random.default_rng(seed)
+        self.indexes = {}
+        self.weights = {}
+
+    def __get_index_key(
+        self, dataset: str, table: str, key_fields: list, client_value: str
+    ) -> tuple:
+
+        return (dataset, table.lower(), tuple(f.lower() for f in key_fields), client_value)
+
+    def load(
+        self,
+        dataset: str,
+        table: str,
+        key_fields: list,
+        client_field: str = "none",
+        client_value: str = "000",
+    ) -> dict:
+        """Reads the key columns of a parent table (once per client).
+
+        Args:
+            dataset (str): Dataset name.
+            table (str): Parent table name.
+            key_fields (list): Key fields, e.g. ["vbeln"].
+            client_field (str, optional): client field. Defaults to "none".
+            client_value (str, optional): client. Defaults to "000".
+
+        Raises:
+            ValueError: Parent table has no rows for the client, or no
+                column for a key field.
+
+        Returns:
+            dict: field (as in key_fields) -> np.ndarray of keys.
+        """
+        index_key = self.__get_index_key(dataset, table, key_fields, client_value)
+        if index_key not in self.indexes:
+            columns = self.reader.read_table_columns(
+                dataset, table, list(key_fields),
+                client_field=client_field, client_value=client_value,
+            )
+            # Column names are in the case of the table schema, e.g. "Id"
+            columns = {name.lower(): values for name, values in columns.items()}
+            missing = [f for f in key_fields if f.lower() not in columns]
+            if missing:
+                raise ValueError(f"Table {table} has no fields {missing}.")
+            columns = {f.lower(): columns[f.lower()] for f in key_fields}
+            size = len(next(iter(columns.values())))
+            if size == 0:
+                raise ValueError(
+                    f"Table {table} has no rows for client {client_value}."
+                )
+            self.indexes[index_key] = columns
+            self.logger.info("Loaded %s keys of %s.%s", size, dataset, table)
+        index = self.indexes[index_key]
+        return {field: index[field.lower()] for field in key_fields}
+
+    def __get_weights(
+        self, index_key: tuple, size: int, distribution: str, a: float
+    ) -> np.ndarray:
+        """Returns the cumulative popularity of the keys of an index.
+
+        The popularity is assigned to the keys in random order (not in
+        the order of the table), once per index and distribution.
+
+        Args:
+            index_key (tuple): index.
+            size (int): number of keys.
+            distribution (str): "zipf" or "pareto".
+            a (float): shape parameter.
+
+        Returns:
+            np.ndarray: cumulative weights, normalized to 1.
+        """
+        weights_key = (index_key, distribution, a)
+        if weights_key not in self.weights:
+            if distribution == "zipf":
+                ranks = self.rng.permutation(size) + 1
+                weights = ranks.astype(np.float64) ** -a
+            else:
+                weights = self.rng.pareto(a, size) + 1.0
+            cumulative = np.cumsum(weights)
+            self.weights[weights_key] = cumulative / cumulative[-1]
+        return self.weights[weights_key]
+
+    def sample_rows(
+        self,
+        dataset: str,
+        table: str,
+        key_fields: list,
+        n: int,
+        distribution: str = "uniform",
+        a: float = 1.2,
+        client_field: str = "none",
+        client_value: str = "000",
+    ) -> np.ndarray:
+        """Samples row positions of a parent table's key index.
+
+        Args:
+            dataset (str): Dataset name.
+            table (str): Parent table name.
+            key_fields (list): Key fields.
+            n (int): number of samples.
+            distribution (str, optional): "uniform", "zipf" or "pareto".
+                Defaults to "uniform".
+            a (float, optional): shape parameter of "zipf" and "pareto"
+                (smaller = more skewed). Defaults to 1.2.
+            client_field (str, optional): client field. Defaults to "none".
+            client_value (str, optional): client. Defaults to "000".
+
+        Raises:
+            ValueError: Invalid distribution.
+
+        Returns:
+            np.ndarray: row positions.
+        """
+        if distribution not in __class__._DISTRIBUTIONS:
+            raise ValueError(f"Distribution must be one of {__class__._DISTRIBUTIONS}.")
+
+        columns = self.load(dataset, table, key_fields, client_field, client_value)
+        size = len(next(iter(columns.values())))
+        if distribution == "uniform":
+            return self.rng.integers(0, size, n)
+
+        index_key = self.__get_index_key(dataset, table, key_fields, client_value)
+        cumulative = self.__get_weights(index_key, size, distribution, a)
+        rows = np.searchsorted(cumulative, self.rng.random(n), side="right")
+        return np.minimum(rows, size - 1)
+
+    def sample(
+        self,
+        dataset: str,
+        table: str,
+        key_fields: list,
+        n: int,
+        distribution: str = "uniform",
+        a: float = 1.2,
+        client_field: str = "none",
+        client_value: str = "000",
+    ) -> dict:
+        """Samples foreign keys from a parent table.
+
+        Args:
+            dataset (str): Dataset name.
+            table (str): Parent table name.
+            key_fields (list): Key fields.
+            n (int): number of samples.
+            distribution (str, optional): "uniform", "zipf" or "pareto".
+                Defaults to "uniform".
+            a (float, optional): shape parameter of "zipf" and "pareto".
+                Defaults to 1.2.
+            client_field (str, optional): client field. Defaults to "none".
+            client_value (str, optional): client. Defaults to "000".
+
+        Returns:
+            dict: field -> np.ndarray of n keys.
+        """
+        rows = self.sample_rows(
+            dataset, table, key_fields, n, distribution, a, client_field, client_value
+        )
+        columns = self.load(dataset, table, key_fields, client_field, client_value)
+        return {field: values[rows] for field, values in columns.items()}
+
+    def __gen_item_counts(
+        self, n: int, min_items: int, max_items: int, distribution: str, a: float
+    ) -> np.ndarray:
+        """Draws the number of items of each header.
+
+        Args:
+            n (int): number of headers.
+            min_items (int): min. items per header.
+            max_items (int): max. items per header.
+            distribution (str): "uniform", "zipf" or "pareto".
+            a (float): shape parameter.
+
+        Returns:
+            np.ndarray: items per header.
+        """
+        if distribution == "uniform":
+            counts = self.rng.integers(min_items, max_items + 1, n)
+        elif distribution == "zipf":
+            counts = min_items - 1 + self.rng.zipf(max(a, 1.0 + 1e-9), n)
+        else:
+            counts = np.floor(max(min_items, 1) * (self.rng.pareto(a, n) + 1.0))
+        return np.clip(counts, min_items, max_items).astype(np.int64)
+
+    def fan_out(
+        self,
+        dataset: str,
+        table: str,
+        key_fields: list,
+        min_items: int = 1,
+        max_items: int = 10,
+        distribution: str = "uniform",
+        a: float = 2.0,
+        posnr_field: str = "posnr",
+        posnr_step: int = 10,
+        posnr_length: int = 6,
+        client_field: str = "none",
+        client_value: str = "000",
+    ) -> dict:
+        """Generates the item keys of all headers of a header table.
+
+        Each header gets between min_items and max_items items, numbered
+        posnr_step, 2 * posnr_step, ... within the header.
+
+        Args:
+            dataset (str): Dataset name.
+            table (str): Header table name, e.g. "vbak".
+            key_fields (list): Header key fields, e.g. ["vbeln"].
+            min_items (int, optional): min. items per header. Defaults to 1.
+            max_items (int, optional): max. items per header. Defaults to 10.
+            distribution (str, optional): distribution of the items per
+                header: "uniform", "zipf" or "pareto". Defaults to "uniform".
+            a (float, optional): shape parameter of "zipf" and "pareto".
+                Defaults to 2.0.
+            posnr_field (str, optional): item number field. Defaults to "posnr".
+            posnr_step (int, optional): item number increment. Defaults to 10.
+            posnr_length (int, optional): item number length (zero padded).
+                Defaults to 6.
+            client_field (str, optional): client field. Defaults to "none".
+            client_value (str, optional): client. Defaults to "000".
+
+        Raises:
+            ValueError: Invalid distribution or item counts.
+
+        Returns:
+            dict: field -> np.ndarray, header key fields and item number.
+        """
+        if distribution not in __class__._DISTRIBUTIONS:
+            raise ValueError(f"Distribution must be one of {__class__._DISTRIBUTIONS}.")
+        if min_items < 0 or max_items < min_items:
+            raise ValueError("Item counts must satisfy 0 <= min_items <= max_items.")
+
+        columns = self.load(dataset, table, key_fields, client_field, client_value)
+        n = len(next(iter(columns.values())))
+        counts = self.__gen_item_counts(n, min_items, max_items, distribution, a)
+
+        items = {field: np.repeat(values, counts) for field, values in columns.items()}
+        starts = np.repeat(np.cumsum(counts) - counts, counts)
+        positions = (np.arange(counts.sum()) - starts + 1) * posnr_step
+        items[posnr_field] = np.char.zfill(positions.astype(str), posnr_length)
+        return items
@@ -0,0 +1,118 @@
+# MIT License
+
+# Copyright (c) 2025 rameshsuraparaju
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Provides class for reproducible random streams.
+
+All random generators of a run derive from one run seed.  Each stream is
+identified by keys such as (table, column, chunk) and derived with a
+NumPy SeedSequence, so streams are statistically independent and only
+depend on the run seed and their keys - not on the process or the order
+in which they are requested.  Splitting a table into chunks keyed by
+chunk number (not by worker) therefore produces the same data whether
+the chunks are generated by one process or many.
+
+Example:
+    seed = Seed(4711)
+    ids = ID(seed.get_seed("vbak", "vbeln", chunk)).gen_numeric_ids(n, 10)
+"""
+
+import logging
+import random
+import zlib
+
+import numpy as np
+
+
+class Seed:
+    """Hands out independent, reproducible random streams of a run."""
+
+    def __init__(self, entropy: int = None):
+        """Initialize self.
+
+        Args:
+            entropy (int, optional): run seed. Defaults to None (fresh
+                entropy from the OS, see `entropy` to reproduce the run).
+        """
+        self.logger = logging.getLogger(__name__)
+        self.entropy = np.random.SeedSequence(entropy).entropy
+        self.logger.info("Run seed: %s", self.entropy)
+
+    def __get_spawn_key(self, keys: tuple) -> tuple:
+        """Maps stream keys to non-negative integers.
+
+        Strings are hashed with CRC32, which (unlike hash()) is the same
+        in every process.
+        """
+        spawn_key = []
+        for key in keys:
+            if isinstance(key, (int, np.integer)) and key >= 0:
+                spawn_key.append(int(key))
+            else:
+                spawn_key.append(zlib.crc32(str(key).encode("utf-8")))
+        return tuple(spawn_key)
+
+    def get_sequence(self, *keys) -> np.random.SeedSequence:
+        """Returns the seed sequence of a stream.
+
+        Args:
+            *keys: stream keys e.g. table, column, chunk number.
+
+        Returns:
+            numpy.random.SeedSequence: seed sequence.
+        """
+        return np.random.SeedSequence(self.entropy, spawn_key=self.__get_spawn_key(keys))
+
+    def get_seed(self, *keys) -> int:
+        """Returns a 64 bit integer seed of a stream.
+
+        Use for generators seeded with an int (ID, Date, Name, Address,
+        TaktCalendar, Faker).
+
+        Args:
+            *keys: stream keys e.g. table, column, chunk number.
+
+        Returns:
+            int: seed.
+        """
+        return int(self.get_sequence(*keys).generate_state(1, np.uint64)[0])
+
+    def get_rng(self, *keys) -> np.random.Generator:
+        """Returns a NumPy random generator of a stream.
+
+        Args:
+            *keys: stream keys e.g. table, column, chunk number.
+
+        Returns:
+            numpy.random.Generator: random generator.
+        """
+        return np.random.default_rng(self.get_sequence(*keys))
+
+    def get_random(self, *keys) -> random.Random:
+        """Returns a Python random generator of a stream.
+
+        Args:
+            *keys: stream keys e.g. table, column, chunk number.
+
+        Returns:
+            random.Random: random generator.
+        """
+        return random.Random(self.get_seed(*keys))
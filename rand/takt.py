@@ -0,0 +1,228 @@
+# MIT License
+
+# Copyright (c) 2025 rameshsuraparaju
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Provides class for takt based time series calendars.
+
+A table's `series` configuration (`takt`: year / month / week / day and
+`range`: number of takts backwards from the current date) is turned into
+a calendar once per run.  The calendar holds the period boundaries and,
+per day, the period index, working day flag, fiscal year / period
+(SAP GJAHR / MONAT) and seasonality weight as NumPy arrays, so that row
+generators can sample periods and dates in bulk.
+"""
+
+import logging
+
+from datetime import date
+
+import numpy as np
+
+
+class TaktCalendar:
+    """Calendar of the periods (takts) of a time series."""
+
+    _TAKTS = ["year", "month", "week", "day"]
+
+    def __init__(
+        self,
+        takt: str,
+        takt_range: int,
+        end: str = None,
+        fiscal_year_start: int = 1,
+        weekmask: str = "Mon Tue Wed Thu Fri",
+        holidays: list = None,
+        month_weights: list = None,
+        weekday_weights: list = None,
+        trend: float = 0.0,
+        seed: int = None
+    ):
+        """Initialize self.
+
+        Args:
+            takt (str): period length: "year", "month", "week" or "day".
+            takt_range (int): number of periods backwards from `end`,
+                including the period of `end`.
+            end (str, optional): last date in ISO format. Defaults to today.
+            fiscal_year_start (int, optional): calendar month in which the
+                fiscal year starts (e.g. 4 for April - March). The fiscal
+                year is the calendar year in which it starts. Defaults to 1.
+            weekmask (str, optional): working days, see numpy.busday.
+                Defaults to "Mon Tue Wed Thu Fri".
+            holidays (list, optional): non-working dates in ISO format.
+                Defaults to None.
+            month_weights (list, optional): 12 seasonality weights, one per
+                calendar month. Defaults to None (flat).
+            weekday_weights (list, optional): 7 weights Monday - Sunday,
+                applied to working days. Defaults to None (all 1).
+            trend (float, optional): growth of the weight from one period
+                to the next e.g. 0.02 for 2 %. Defaults to 0.0.
+            seed (int, optional): seed for sampling. Defaults to None.
+
+        Raises:
+            ValueError: Invalid takt, range or weights.
+        """
+
+        self.logger = logging.getLogger(__name__)
+
+        if takt not in __class__._TAKTS:
+            raise ValueError(f"Takt must be one of {__class__._TAKTS}.")
+        if takt_range < 1:
+            raise ValueError("Range must be at least 1.")
+        if month_weights is not None and len(month_weights) != 12:
+            raise ValueError("Month weights must have 12 values.")
+        if weekday_weights is not None and len(weekday_weights) != 7:
+            raise ValueError("Weekday weights must have 7 values.")
+        if not 1 <= fiscal_year_start <= 12:
+            raise ValueError("Fiscal year start must be a month (1 - 12).")
+
+        self.takt = takt
+        self.takt_range = takt_range
+        self.fiscal_year_start = fiscal_year_start
+        self.rng = np.random.default_rng(seed)
+
+        self.end = np.datetime64(end or date.today().isoformat(), "D")
+        self.period_starts = self.__get_period_starts()
+        self.period_ends = np.append(self.period_starts[1:], self.end + 1)
+
+        # Days of the calendar and their attributes
+        self.days = np.arange(self.period_starts[0], self.end + 1)
+        self.day_periods = np.searchsorted(self.period_starts, self.days, side="right") - 1
+        self.working_days = np.is_busday(
+            self.days,
+            weekmask=weekmask,
+            holidays=np.array(holidays or [], dtype="datetime64[D]")
+        )
+        self.fiscal_years, self.fiscal_periods = self.get_fiscal_periods(self.days)
+
+        # Non-working days have a weight of 0
+        weights = self.working_days.astype(float)
+        if weekday_weights is not None:
+            # 1970-01-01 was a Thursday (weekday 3)
+            weekdays = (self.days.astype(np.int64) + 3) % 7
+            weights = weights * np.asarray(weekday_weights, dtype=float)[weekdays]
+        if month_weights is not None:
+            months = self.days.astype("datetime64[M]").astype(np.int64) % 12
+            weights = weights * np.asarray(month_weights, dtype=float)[months]
+        weights = weights * (1.0 + trend) ** self.day_periods
+        if weights.sum() <= 0:
+            raise ValueError("Calendar has no day with a positive weight.")
+
+        self.day_weights = weights
+        self.period_weights = np.bincount(
+            self.day_periods, weights=weights, minlength=len(self.period_starts)
+        )
+        self.__cumulative_weights = np.cumsum(weights)
+        self.__period_first_days = np.searchsorted(self.days, self.period_starts)
+
+    @staticmethod
+    def from_series(series: dict, **kwargs):
+        """Creates a calendar from a table's `series` configuration.
+
+        Args:
+            series (dict): dict with keys takt (str) and range (int).
+            **kwargs: further arguments of TaktCalendar.
+
+        Returns:
+            TaktCalendar: calendar.
+        """
+        return TaktCalendar(series.get("takt"), int(series.get("range")), **kwargs)
+
+    def __get_period_starts(self) -> np.ndarray:
+        """Computes the first day of each period, oldest first."""
+        steps = np.arange(self.takt_range - 1, -1, -1)
+        if self.takt == "year":
+            starts = self.end.astype("datetime64[Y]") - steps
+        elif self.takt == "month":
+            starts = self.end.astype("datetime64[M]") - steps
+        elif self.takt == "week":
+            # Weeks start on Monday, 1970-01-01 was a Thursday
+            monday = self.end - (self.end.astype(np.int64) + 3) % 7
+            starts = monday - 7 * steps
+        else:
+            starts = self.end - steps
+        return starts.astype("datetime64[D]")
+
+    def get_fiscal_periods(self, dates: np.ndarray) -> tuple:
+        """Determines fiscal year and fiscal period of dates.
+
+        Args:
+            dates (numpy.ndarray): dates (datetime64).
+
+        Returns:
+            tuple: (fiscal years (GJAHR), fiscal periods (MONAT 1 - 12))
+                   as integer arrays.
+        """
+        months = np.asarray(dates, dtype="datetime64[M]").astype(np.int64)
+        shifted = months - (self.fiscal_year_start - 1)
+        return shifted // 12 + 1970, shifted % 12 + 1
+
+    def get_periods(self, dates: np.ndarray) -> np.ndarray:
+        """Determines the period index of dates (-1 if before the calendar)."""
+        dates = np.asarray(dates, dtype="datetime64[D]")
+        return np.searchsorted(self.period_starts, dates, side="right") - 1
+
+    def sample_periods(self, n: int) -> np.ndarray:
+        """Samples period indexes proportional to the period weights.
+
+        Args:
+            n (int): number of periods.
+
+        Returns:
+            numpy.ndarray: period indexes.
+        """
+        p = self.period_weights / self.period_weights.sum()
+        return self.rng.choice(len(self.period_starts), size=n, p=p)
+
+    def sample_dates_in_periods(self, periods: np.ndarray) -> np.ndarray:
+        """Samples one date within each given period, proportional to the day weights.
+
+        Days with a weight of 0 (e.g. non-working days) are not sampled,
+        unless the whole period has no weight; then its first day is used.
+
+        Args:
+            periods (numpy.ndarray): period indexes.
+
+        Returns:
+            numpy.ndarray: dates (datetime64[D]).
+        """
+        periods = np.asarray(periods, dtype=np.int64)
+        first = self.__period_first_days[periods]
+        last = np.append(self.__period_first_days[1:], len(self.days))[periods] - 1
+
+        cumulative = self.__cumulative_weights
+        lower = np.where(first > 0, cumulative[first - 1], 0.0)
+        upper = cumulative[last]
+        targets = lower + self.rng.random(len(periods)) * (upper - lower)
+        days = np.searchsorted(cumulative, targets, side="right")
+        days = np.where(upper > lower, np.minimum(days, last), first)
+        return self.days[days]
+
+    def sample_dates(self, n: int) -> np.ndarray:
+        """Samples dates proportional to the period and day weights.
+
+        Args:
+            n (int): number of dates.
+
+        Returns:
+            numpy.ndarray: dates (datetime64[D]).
+        """
+        return self.sample_dates_in_periods(self.sample_periods(n))
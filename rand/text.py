@@ -22,11 +22,47 @@
 
 """ Provides class for random text generation."""
 
+import asyncio
+import json
 import logging
 import os
+import random
+import time
 
 import google.generativeai as genai
 
+from rand import markov
+from rand import promptcache
+
+
+class _TokenBucket:
+    """Rate limit for asynchronous requests."""
+
+    def __init__(self, rate: float, capacity: int):
+        """Initialize self.
+
+        Args:
+            rate (float): tokens (requests) added per second.
+            capacity (int): max. tokens i.e. burst size.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Waits until a token is available and takes it."""
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
 
 class Text:
     """Random text generation."""
@@ -35,11 +71,216 @@ class Text:
 
     _MESSAGE_EMPTY_NAME_OR_INDUSTRY = "Both name and industry must be specified."
 
-    def __init__(self) -> None:
+    _MODEL_NAME = 'gemini-pro'
+
+    _TEMPERATURE = 0.9
+
+    _ENGINES = ["llm", "markov", "template"]
+
+    # Slot-filled templates per prompt template, used by the "template"
+    # engine and as fallback if the model fails.
+    _TEMPLATES = {
+        "account_description": [
+            "{name} is a company in {industry} sector.",
+            "{name} is an established player in the {industry} industry.",
+            "{name} operates in {industry} and is evaluating new solutions.",
+            "{name} is a growing {industry} business with a regional footprint.",
+        ],
+        "contact_description": [
+            "{name} is a senior decision maker.",
+            "{name} leads the data and analytics team and signs off budgets.",
+            "{name} is a technical evaluator who influences the buying decision.",
+            "{name} is the executive sponsor for the current initiative.",
+        ],
+        "lead_description": [
+            "{product}",
+            "Customer is interested in {product} after a webinar.",
+            "Inbound request for {product}, follow-up call to qualify budget.",
+            "Referral lead asking about pricing for {product}.",
+        ],
+        "opportunity_description": [
+            "Regarding requirement for {product} at {company}.",
+            "{company} plans to replace its current solution with {product}.",
+            "Cost savings initiative at {company} driving demand for {product}.",
+            "{company} needs {product} to meet new regulatory requirements.",
+        ],
+        "task_description": [
+            "{subject}",
+            "Prepare agenda on {subject} for {name}.",
+            "Follow up with {name} on {subject} and share action items.",
+        ],
+        "event_description": [
+            "{subject}",
+            "Meeting with {name} about {subject}.",
+            "Review {subject} with {name} and agree on next steps.",
+        ],
+        "case_subject": [
+            "{reason}",
+            "Issue: {reason}",
+            "Need help with {reason}",
+        ],
+        "case_description": [
+            "{reason}",
+            "We are experiencing {reason} and need support.",
+            "Since yesterday we have {reason}. Please advise.",
+        ],
+        "youtube_segment": [
+            "{segment_type}{ad_name}segment",
+            "{segment_type} viewers of {ad_name}",
+            "{ad_name} {segment_type} audience",
+        ],
+    }
+
+    def __init__(
+        self,
+        model=None,
+        cache: promptcache.PromptCache = None,
+        corpus_only: bool = False
+    ) -> None:
+        """Initialize self.
+
+        Args:
+            model (optional): generative model with the interface of
+                genai.GenerativeModel (generate_content and
+                generate_content_async). Defaults to None (gemini-pro).
+            cache (promptcache.PromptCache, optional): cache of responses.
+                Defaults to None (no caching).
+            corpus_only (bool, optional): serve texts only from the cache,
+                never call the model (corpus mode). Defaults to False.
+        """
 
         self.logger = logging.getLogger(__name__)
         api_key = os.getenv('GOOGLE_GEMINI_API_KEY')
         genai.configure(api_key=api_key)
+        self.model = model
+        # Fixed before the model is created lazily, so cache keys do not
+        # change after the first model call ("models/gemini-pro").
+        model_name = getattr(model, 'model_name', None) or __class__._MODEL_NAME
+        self.model_name = model_name.removeprefix('models/')
+        self.cache = cache
+        self.corpus_only = corpus_only
+        if corpus_only and cache is None:
+            raise ValueError("Corpus mode requires a cache.")
+        self.engines = {}
+        self.markovs = {}
+        self.random = random.Random()
+
+    def set_engine(self, template: str, engine: str, generator: markov.Markov = None) -> None:
+        """Selects the text engine of a prompt template (i.e. a column).
+
+        Args:
+            template (str): prompt template name e.g. "case_description".
+            engine (str): "llm" (model, default), "markov" (offline Markov
+                chain) or "template" (offline slot-filled templates).
+            generator (markov.Markov, optional): trained Markov chain for
+                the "markov" engine. Defaults to None (trained from the
+                cached responses of the template, see `train_markov`).
+
+        Raises:
+            ValueError: Unknown engine or template.
+        """
+        if engine not in __class__._ENGINES:
+            raise ValueError(f"Engine must be one of {__class__._ENGINES}.")
+        if template not in __class__._TEMPLATES:
+            raise ValueError(f"Unknown prompt template '{template}'.")
+        if engine == "markov":
+            self.markovs[template] = generator or self.train_markov(template)
+        self.engines[template] = engine
+
+    def train_markov(self, template: str, order: int = 2) -> markov.Markov:
+        """Trains a Markov chain from the cached responses of a prompt template.
+
+        Args:
+            template (str): prompt template name.
+            order (int, optional): order of the chain. Defaults to 2.
+
+        Raises:
+            ValueError: No cache or no cached responses.
+
+        Returns:
+            markov.Markov: trained Markov chain.
+        """
+        if self.cache is None:
+            raise ValueError("Training from cached responses requires a cache.")
+        generator = markov.Markov(order)
+        generator.train(self.cache.get_template_texts(template))
+        return generator
+
+    def __fill_template(self, template: str, params: dict) -> str:
+
+        return self.random.choice(__class__._TEMPLATES[template]).format(**params)
+
+    def __get_model(self):
+        """Returns the model, created once per instance."""
+        if self.model is None:
+            self.model = genai.GenerativeModel(__class__._MODEL_NAME)
+        return self.model
+
+    def __get_cache_key(self, template: str, params: dict, max_output_tokens: int) -> str:
+
+        return self.cache.get_key(
+            template,
+            dict(params, max_output_tokens=max_output_tokens),
+            self.model_name,
+            __class__._TEMPERATURE
+        )
+
+    def __get_cached_text(self, key: str) -> str:
+        """Looks up a cached text, raises LookupError in corpus mode if none."""
+
+        if self.corpus_only:
+            text = self.cache.sample(key)
+            if text is None:
+                raise LookupError("No cached text in corpus mode.")
+            return text
+        return self.cache.get(key)
+
+    def __gen_template_text(
+        self,
+        template: str,
+        params: dict,
+        prompt: str,
+        max_output_tokens: int
+    ) -> str:
+        """Generates text for a prompt template, using the cache if set.
+
+        Args:
+            template (str): prompt template name e.g. "case_subject".
+            params (dict): template parameters.
+            prompt (str): prompt built from template and parameters.
+            max_output_tokens (int): max. tokens.
+
+        Returns:
+            str: generated (or cached) text.
+        """
+
+        engine = self.engines.get(template, "llm")
+        if engine == "markov":
+            return self.markovs[template].gen_text()
+        if engine == "template":
+            return self.__fill_template(template, params)
+
+        if self.cache is None:
+            return self.gen_text(prompt, max_output_tokens)
+
+        key = self.__get_cache_key(template, params, max_output_tokens)
+        text = self.__get_cached_text(key)
+        if text is None:
+            text = self.gen_text(prompt, max_output_tokens)
+            self.cache.put(key, template, text)
+        return text
+
+    def __get_generation_config(self, max_output_tokens: int) -> dict:
+
+        return {
+            'max_output_tokens': max_output_tokens,
+            'temperature': __class__._TEMPERATURE,
+            'top_p': 1,
+        }
+
+    def __clean(self, text: str) -> str:
+
+        return text.replace('*', '').replace('\n', ' ')
 
     def __get_account_description_prompt(self, name, industry) -> str:
 
@@ -161,19 +402,243 @@ class Text:
             self.logger.error(msg)
             raise ValueError(msg)
 
-        model = genai.GenerativeModel('gemini-pro')
-
-        response = model.generate_content(
+        response = self.__get_model().generate_content(
             prompt,
-            generation_config={
-                'max_output_tokens': max_output_tokens,
-                'temperature': 0.9,
-                'top_p': 1,
-            },
+            generation_config=self.__get_generation_config(max_output_tokens),
             stream=False,
         )
 
-        return response.text.replace('*', '').replace('\n', ' ')
+        return self.__clean(response.text)
+
+    def __pack_prompts(self, prompts: list) -> str:
+        """Combines several prompts into one asking for a JSON array of answers."""
+
+        requests = "\n\n".join(
+            f"Request {i + 1}:\n{prompt.strip()}" for i, prompt in enumerate(prompts)
+        )
+        return (
+            f"Answer each of the following {len(prompts)} requests separately.\n"
+            f"Return only a JSON array of {len(prompts)} strings, "
+            "one answer per request, in the order of the requests.\n\n"
+            + requests
+        )
+
+    def __unpack_response(self, text: str, count: int) -> list:
+        """Splits the answer to a packed prompt, None if it is malformed."""
+
+        text = text.strip()
+        if text.startswith("```"):
+            text = text.strip("`")
+            text = text[text.find("["):]
+        try:
+            answers = json.loads(text)
+        except json.JSONDecodeError:
+            return None
+        if (not isinstance(answers, list) or len(answers) != count
+                or not all(isinstance(a, str) for a in answers)):
+            return None
+        return answers
+
+    async def __generate_async(
+        self,
+        prompt: str,
+        max_output_tokens: int,
+        bucket: _TokenBucket,
+        max_retries: int
+    ) -> str:
+        """Generates text for a prompt with rate limit and retries.
+
+        Retries are delayed with exponential backoff (and jitter).
+        The last error is raised if all attempts fail.
+        """
+
+        for attempt in range(max_retries + 1):
+            await bucket.acquire()
+            try:
+                response = await self.__get_model().generate_content_async(
+                    prompt,
+                    generation_config=self.__get_generation_config(max_output_tokens),
+                )
+                return response.text
+            except Exception as err:
+                if attempt == max_retries:
+                    raise
+                delay = min(60.0, 2 ** attempt) * (0.5 + random.random())
+                self.logger.warning("Retrying in %.1fs after error: %s", delay, err)
+                await asyncio.sleep(delay)
+
+    async def agen_texts(
+        self,
+        prompts: list,
+        max_output_tokens: int,
+        concurrency: int = 8,
+        pack_size: int = 1,
+        requests_per_minute: int = 60,
+        max_retries: int = 5,
+        fallbacks: list = None,
+        template: str = "text",
+        params: list = None
+    ) -> list:
+        """Generates texts for many prompts concurrently.
+
+        Up to `pack_size` prompts are sent as one request asking for a
+        JSON array of answers, which is split back per prompt. If the
+        answer cannot be split, the prompts of the pack are sent
+        one by one. With a cache, only prompts without (enough) cached
+        responses are sent; in corpus mode none are.
+
+        Args:
+            prompts (list): prompts.
+            max_output_tokens (int): max. tokens per prompt.
+            concurrency (int, optional): max. requests in flight. Defaults to 8.
+            pack_size (int, optional): prompts per request. Defaults to 1.
+            requests_per_minute (int, optional): rate limit. Defaults to 60.
+            max_retries (int, optional): retries per request. Defaults to 5.
+            fallbacks (list, optional): text per prompt returned if
+                generation fails. Defaults to None (None is returned).
+            template (str, optional): prompt template name the responses
+                are cached under. Defaults to "text" (free prompts).
+            params (list, optional): template parameters (dict) per prompt,
+                cache keys are built from them as by the `gen_*` methods.
+                Defaults to None (cache keys are built from the prompts).
+
+        Returns:
+            list: generated text per prompt.
+        """
+
+        if any(p == "" for p in prompts) or max_output_tokens <= 0:
+            msg = __class__._MESSAGE_EMPTY_PROMPT_ZERO_TOKENS
+            self.logger.error(msg)
+            raise ValueError(msg)
+
+        results = [None] * len(prompts)
+        keys = [None] * len(prompts)
+        pending = list(range(len(prompts)))
+        if self.cache is not None:
+            pending = []
+            for i, prompt in enumerate(prompts):
+                keys[i] = self.__get_cache_key(
+                    template,
+                    params[i] if params is not None else {"prompt": prompt},
+                    max_output_tokens
+                )
+                try:
+                    results[i] = self.__get_cached_text(keys[i])
+                except LookupError:
+                    results[i] = fallbacks[i] if fallbacks else None
+                    continue
+                if results[i] is None:
+                    pending.append(i)
+
+        bucket = _TokenBucket(requests_per_minute / 60.0, concurrency)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        def set_result(i: int, text: str) -> None:
+            results[i] = self.__clean(text)
+            if self.cache is not None:
+                self.cache.put(keys[i], template, results[i])
+
+        async def generate_one(i: int) -> None:
+            try:
+                text = await self.__generate_async(
+                    prompts[i], max_output_tokens, bucket, max_retries
+                )
+                set_result(i, text)
+            except Exception as err:
+                self.logger.error("Text generation failed: %s", err)
+                results[i] = fallbacks[i] if fallbacks else None
+
+        async def generate_pack(start: int) -> None:
+            indexes = pending[start:start + pack_size]
+            async with semaphore:
+                if len(indexes) > 1:
+                    answers = None
+                    try:
+                        text = await self.__generate_async(
+                            self.__pack_prompts([prompts[i] for i in indexes]),
+                            max_output_tokens * len(indexes),
+                            bucket,
+                            max_retries
+                        )
+                        answers = self.__unpack_response(text, len(indexes))
+                    except Exception as err:
+                        self.logger.error("Text generation failed: %s", err)
+                    if answers is not None:
+                        for i, answer in zip(indexes, answers):
+                            set_result(i, answer)
+                        return
+                for i in indexes:
+                    await generate_one(i)
+
+        await asyncio.gather(
+            *(generate_pack(start) for start in range(0, len(pending), pack_size))
+        )
+        return results
+
+    def gen_texts(self, prompts: list, max_output_tokens: int, **kwargs) -> list:
+        """Generates texts for many prompts concurrently.
+
+        Synchronous wrapper of `agen_texts`, see there for the arguments.
+
+        Returns:
+            list: generated text per prompt.
+        """
+
+        return asyncio.run(self.agen_texts(prompts, max_output_tokens, **kwargs))
+
+    def __get_prompt(self, template: str, params: dict) -> tuple:
+        """Builds the prompt of a prompt template.
+
+        Returns:
+            tuple: (prompt (str), max. output tokens (int))
+        """
+        prompts = {
+            "account_description": (self.__get_account_description_prompt, 100),
+            "contact_description": (self.__get_contact_description_prompt, 100),
+            "lead_description": (self.__get_lead_description_prompt, 300),
+            "opportunity_description": (self.__get_opportunity_description_prompt, 100),
+            "task_description": (self.__get_task_description_prompt, 100),
+            "event_description": (self.__get_event_description_prompt, 100),
+            "case_subject": (self.__get_case_subject_prompt, 100),
+            "case_description": (self.__get_case_description_prompt, 300),
+            "youtube_segment": (self.__get_youtube_segment_prompt, 300),
+        }
+        prompt, max_output_tokens = prompts[template]
+        return prompt(**params), max_output_tokens
+
+    def gen_descriptions(self, template: str, params: list, **kwargs) -> list:
+        """Generates texts of a prompt template for many rows.
+
+        Uses the engine selected with `set_engine`. Offline engines need
+        no network; the "llm" engine sends the prompts with `gen_texts`
+        and falls back to a filled template per failed row.
+
+        Args:
+            template (str): prompt template name e.g. "case_description".
+            params (list): template parameters (dict) per row
+                e.g. [{"reason": "..."}, ...]. Ignored by the "markov" engine.
+            **kwargs: further arguments of `agen_texts`.
+
+        Returns:
+            list: generated text per row.
+        """
+        engine = self.engines.get(template, "llm")
+        if engine == "markov":
+            return self.markovs[template].gen_texts(len(params))
+        fallbacks = [self.__fill_template(template, p) for p in params]
+        if engine == "template":
+            return fallbacks
+
+        prompts = [self.__get_prompt(template, p) for p in params]
+        max_output_tokens = prompts[0][1] if prompts else 100
+        return self.gen_texts(
+            [p[0] for p in prompts],
+            max_output_tokens,
+            fallbacks=fallbacks,
+            template=template,
+            params=params,
+            **kwargs
+        )
 
     def gen_account_description(self, name, industry) -> str:
         """Generate a random account description."""
@@ -185,7 +650,9 @@ class Text:
 
         try:
             prompt = self.__get_account_description_prompt(name, industry)
-            return self.gen_text(prompt, 100)
+            return self.__gen_template_text(
+                "account_description", {"name": name, "industry": industry}, prompt, 100
+            )
         except Exception:
             return f"{name} is a company in {industry} sector."
 
@@ -194,7 +661,9 @@ class Text:
 
         try:
             prompt = self.__get_contact_description_prompt(name)
-            return self.gen_text(prompt, 100)
+            return self.__gen_template_text(
+                "contact_description", {"name": name}, prompt, 100
+            )
         except Exception:
             return f"{name} is a senior decision maker."
 
@@ -203,7 +672,9 @@ class Text:
 
         try:
             prompt = self.__get_lead_description_prompt(product)
-            return self.gen_text(prompt, 300)
+            return self.__gen_template_text(
+                "lead_description", {"product": product}, prompt, 300
+            )
         except Exception:
             return product
 
@@ -212,7 +683,9 @@ class Text:
 
         try:
             prompt = self.__get_opportunity_description_prompt(product, company)
-            return self.gen_text(prompt, 100)
+            return self.__gen_template_text(
+                "opportunity_description", {"product": product, "company": company}, prompt, 100
+            )
         except Exception:
             return f"Regarding requirement for {product} at {company}."
 
@@ -221,7 +694,9 @@ class Text:
 
         try:
             prompt = self.__get_task_description_prompt(subject, name)
-            return self.gen_text(prompt, 100)
+            return self.__gen_template_text(
+                "task_description", {"subject": subject, "name": name}, prompt, 100
+            )
         except Exception:
             return subject
 
@@ -230,7 +705,9 @@ class Text:
 
         try:
             prompt = self.__get_event_description_prompt(subject, name)
-            return self.gen_text(prompt, 100)
+            return self.__gen_template_text(
+                "event_description", {"subject": subject, "name": name}, prompt, 100
+            )
         except Exception:
             return subject
 
@@ -239,7 +716,9 @@ class Text:
 
         try:
             prompt = self.__get_case_subject_prompt(reason)
-            return self.gen_text(prompt, 100)
+            return self.__gen_template_text(
+                "case_subject", {"reason": reason}, prompt, 100
+            )
         except Exception:
             return reason
 
@@ -248,7 +727,9 @@ class Text:
 
         try:
             prompt = self.__get_case_description_prompt(reason)
-            return self.gen_text(prompt, 300)
+            return self.__gen_template_text(
+                "case_description", {"reason": reason}, prompt, 300
+            )
         except Exception:
             return reason
 
@@ -260,7 +741,12 @@ class Text:
                 segment_type,
                 ad_name
             )
-            return self.gen_text(prompt, 300)
+            return self.__gen_template_text(
+                "youtube_segment",
+                {"segment_type": segment_type, "ad_name": ad_name},
+                prompt,
+                300
+            )
         except Exception:
             return segment_type + ad_name + "segment"
 
@@ -0,0 +1,218 @@
+# MIT License
+
+# Copyright (c) 2025 rameshsuraparaju
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Provides class for checkpointing generation runs.
+
+Progress of a run is persisted per table and per chunk (batch) in a
+local SQLite file: the rows loaded, and the generator state after the
+chunk (RNG state, ID allocator position).  Chunks may be loaded out of
+order, but a rerun only resumes after the watermark, the last chunk of
+the contiguous sequence of loaded chunks starting at chunk 0; loaded
+chunks beyond the watermark are regenerated (with the same state) but
+not loaded again.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+
+from os.path import expanduser, join
+from pathlib import Path
+
+
+class Checkpoint:
+    """Persists the progress of a generation run per table and chunk."""
+
+    DEFAULT_PATH = join(expanduser("~"), ".datagen", "checkpoint.sqlite")
+
+    def __init__(self, run_id: str, path: str = DEFAULT_PATH, timeout: float = 60.0):
+        """Initialize self.
+
+        Args:
+            run_id (str): ID of the run, e.g. the scenario name. The
+                checkpoint of a run is removed when the run completes
+                (see `executor.Executor.run`).
+            path (str, optional): SQLite file holding the checkpoints.
+                Defaults to ~/.datagen/checkpoint.sqlite.
+            timeout (float, optional): seconds to wait for a lock held by
+                another process. Defaults to 60.0.
+        """
+        self.run_id = run_id
+        self.lock = threading.Lock()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode, every statement is its own transaction.
+        self.db = sqlite3.connect(
+            path, timeout=timeout, isolation_level=None, check_same_thread=False
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS chunk ("
+            " run TEXT NOT NULL,"
+            " tabname TEXT NOT NULL,"
+            " chunk INTEGER NOT NULL,"
+            " rows INTEGER NOT NULL,"
+            " rng_state TEXT,"
+            " allocator INTEGER,"
+            " updated REAL NOT NULL,"
+            " PRIMARY KEY (run, tabname, chunk))"
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS tabstate ("
+            " run TEXT NOT NULL,"
+            " tabname TEXT NOT NULL,"
+            " rows INTEGER NOT NULL,"
+            " updated REAL NOT NULL,"
+            " PRIMARY KEY (run, tabname))"
+        )
+
+    def save_chunk(
+        self,
+        table: str,
+        chunk: int,
+        rows: int,
+        rng_state: dict = None,
+        allocator: int = None,
+    ):
+        """Records a loaded chunk.
+
+        Args:
+            table (str): Table (e.g. "<dataset>.<table>").
+            chunk (int): Chunk number, starting at 0.
+            rows (int): rows loaded.
+            rng_state (dict, optional): state of the generator's
+                `np.random.Generator.bit_generator` after the chunk.
+            allocator (int, optional): ID allocator position after the chunk.
+        """
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO chunk VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self.run_id, table, chunk, rows,
+                    None if rng_state is None else json.dumps(rng_state),
+                    allocator, time.time(),
+                ),
+            )
+
+    def get_loaded_chunks(self, table: str) -> set:
+        """Returns the numbers of the loaded chunks of a table.
+
+        Args:
+            table (str): Table.
+
+        Returns:
+            set: chunk numbers.
+        """
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT chunk FROM chunk WHERE run = ? AND tabname = ?",
+                (self.run_id, table),
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def get_watermark(self, table: str) -> int:
+        """Returns the last chunk of the contiguous loaded chunks from chunk 0.
+
+        Args:
+            table (str): Table.
+
+        Returns:
+            int: chunk number, -1 if chunk 0 is not loaded.
+        """
+        loaded = self.get_loaded_chunks(table)
+        watermark = -1
+        while watermark + 1 in loaded:
+            watermark += 1
+        return watermark
+
+    def get_resume_state(self, table: str) -> dict:
+        """Returns where a rerun of a table continues.
+
+        Returns:
+            dict: chunk (first chunk to generate), rows (rows loaded up to
+                the watermark), rng_state and allocator (state after the
+                watermark, None when starting at chunk 0).
+        """
+        watermark = self.get_watermark(table)
+        state = {"chunk": watermark + 1, "rows": 0, "rng_state": None, "allocator": None}
+        if watermark < 0:
+            return state
+
+        with self.lock:
+            rows, rng_state, allocator = self.db.execute(
+                "SELECT (SELECT SUM(rows) FROM chunk"
+                "        WHERE run = ? AND tabname = ? AND chunk <= ?),"
+                " rng_state, allocator FROM chunk"
+                " WHERE run = ? AND tabname = ? AND chunk = ?",
+                (self.run_id, table, watermark, self.run_id, table, watermark),
+            ).fetchone()
+        state.update(
+            rows=rows,
+            rng_state=None if rng_state is None else json.loads(rng_state),
+            allocator=allocator,
+        )
+        return state
+
+    def set_table_done(self, table: str, rows: int):
+        """Records a completely loaded table.
+
+        Args:
+            table (str): Table.
+            rows (int): rows loaded.
+        """
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO tabstate VALUES (?, ?, ?, ?)",
+                (self.run_id, table, rows, time.time()),
+            )
+
+    def get_table_done(self, table: str) -> int:
+        """Returns the rows of a completely loaded table.
+
+        Args:
+            table (str): Table.
+
+        Returns:
+            int: rows loaded or None if the table is not complete.
+        """
+        with self.lock:
+            row = self.db.execute(
+                "SELECT rows FROM tabstate WHERE run = ? AND tabname = ?",
+                (self.run_id, table),
+            ).fetchone()
+        return None if row is None else row[0]
+
+    def reset(self, table: str = None):
+        """Removes the checkpoints of the run (or of one table).
+
+        Args:
+            table (str, optional): Table. Defaults to all tables.
+        """
+        condition, params = "run = ?", (self.run_id,)
+        if table is not None:
+            condition, params = "run = ? AND tabname = ?", (self.run_id, table)
+        with self.lock:
+            self.db.execute(f"DELETE FROM chunk WHERE {condition}", params)
+            self.db.execute(f"DELETE FROM tabstate WHERE {condition}", params)
+
+    def close(self):
+        """Closes the SQLite file."""
+        self.db.close()
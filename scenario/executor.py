@@ -0,0 +1,454 @@
+# MIT License
+
+# Copyright (c) 2025 rameshsuraparaju
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Provides class for running the tables of a scenario as a dependency DAG.
+
+A table depends on
+    - the check tables of its fields (dd03l checktable, SAP only),
+    - its header tables: tables whose key fields are a proper subset of
+      its own key fields (e.g. VBAP on VBAK),
+    - the tables listed in its optional `dependsOn` attribute,
+as far as these tables are part of the same run.  Tables whose
+dependencies are loaded are generated concurrently in a process pool
+(CPU bound) and uploaded in a thread pool (BigQuery I/O).  Chunks are
+passed from the generating process to the uploading thread through a
+bounded queue, so generation and upload of a table overlap and only a
+few chunks per table are held in memory.
+
+The data of a table is generated by its strategy: the class
+`strategy.class` in the module `<strategy package>.<strategy.module>`.
+It is instantiated with the project ID, the solution and the table
+configuration, and its method `generate()` returns a DataFrame, an Arrow
+table or an iterable of them (batches).  Strategies which can resume
+implement `generate_chunks(chunk, rng_state, allocator)` instead: it
+starts at the given chunk number with the given generator state (None
+when starting at chunk 0) and yields tuples (batch, rng_state,
+allocator) with the state after each batch (see `checkpoint.Checkpoint`).
+"""
+
+import importlib
+import logging
+import multiprocessing
+import os
+
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from graphlib import TopologicalSorter
+
+import pandas as pd
+import pyarrow as pa
+
+from bq.read import Reader
+from bq.upload import Upload
+from scenario.checkpoint import Checkpoint
+
+# Queue items marking the end of the chunks of a table.
+_END = "end"
+_FAILED = "failed"
+
+
+def _generate(
+    strategy_package: str,
+    project_id: str,
+    solution: dict,
+    table: dict,
+    chunks,
+    cancel,
+    resume: dict = None,
+) -> int:
+    """Generates the data of a table with its strategy (in a worker process).
+
+    The chunks are put into a bounded queue, consumed by the upload.
+
+    Args:
+        strategy_package (str): package of the strategy modules.
+        project_id (str): Google Cloud project ID.
+        solution (dict): solution configuration.
+        table (dict): table configuration.
+        chunks (multiprocessing.Queue): queue receiving tuples (chunk
+            number, batch, rng_state, allocator), then `_END` (or
+            `_FAILED` if generation fails).
+        cancel (multiprocessing.Event): set when the upload failed.
+        resume (dict, optional): chunk, rng_state and allocator to resume
+            from (see `Checkpoint.get_resume_state`). Defaults to chunk 0.
+
+    Returns:
+        int: number of chunks generated.
+    """
+    count = 0
+    end = _FAILED
+    try:
+        strategy = table.get("strategy") or {}
+        if not strategy.get("module") or not strategy.get("class"):
+            raise ValueError(f"Table {table['name']} has no strategy.")
+
+        module = importlib.import_module(f"{strategy_package}.{strategy['module']}")
+        generator = getattr(module, strategy["class"])(project_id, solution, table)
+
+        if hasattr(generator, "generate_chunks"):
+            resume = resume or {"chunk": 0, "rng_state": None, "allocator": None}
+            data = (
+                (resume["chunk"] + i, batch, rng_state, allocator)
+                for i, (batch, rng_state, allocator) in enumerate(
+                    generator.generate_chunks(
+                        resume["chunk"], resume["rng_state"], resume["allocator"]
+                    )
+                )
+            )
+        else:
+            # Not resumable: all chunks are generated again, loaded ones are skipped.
+            batches = generator.generate()
+            if isinstance(batches, (pd.DataFrame, pa.Table, pa.RecordBatch)):
+                batches = [batches]
+            data = ((i, batch, None, None) for i, batch in enumerate(batches))
+
+        for chunk in data:
+            if cancel.is_set():
+                break
+            chunks.put(chunk)
+            count += 1
+        end = _END
+    finally:
+        # Always end the queue, the upload waits for it.
+        chunks.put(end)
+    return count
+
+
+class Executor:
+    """Generates and loads the tables of scenarios in dependency order."""
+
+    DEFAULT_STRATEGY_PACKAGE = "strategies"
+
+    def __init__(
+        self,
+        config: dict,
+        generate_workers: int = None,
+        upload_workers: int = 4,
+        strategy_package: str = DEFAULT_STRATEGY_PACKAGE,
+        max_pending_chunks: int = 4,
+    ):
+        """Initialize self.
+
+        Args:
+            config (dict): configuration (project, scenarios).
+            generate_workers (int, optional): parallel generating processes.
+                Defaults to the number of CPUs.
+            upload_workers (int, optional): parallel uploads. Defaults to 4.
+            strategy_package (str, optional): package of the strategy modules.
+                Defaults to "strategies".
+            max_pending_chunks (int, optional): max. chunks per table
+                generated but not yet uploaded. Defaults to 4.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.config = config
+        self.project_id = config["project"]
+        self.generate_workers = generate_workers or os.cpu_count()
+        self.upload_workers = upload_workers
+        self.strategy_package = strategy_package
+        self.max_pending_chunks = max_pending_chunks
+        self.reader = Reader(self.project_id)
+
+    def get_tasks(self, scenario: str = None) -> dict:
+        """Returns the tables of the run.
+
+        Args:
+            scenario (str, optional): scenario name. Defaults to all scenarios.
+
+        Raises:
+            ValueError: Unknown scenario.
+
+        Returns:
+            dict: "<dataset>.<table>" -> (solution, table configuration).
+        """
+        scenarios = [
+            s for s in self.config["scenarios"]
+            if scenario is None or s["name"] == scenario
+        ]
+        if not scenarios:
+            raise ValueError(f"Scenario {scenario} does not exist.")
+
+        tasks = {}
+        for s in scenarios:
+            for solution in s["solutions"]:
+                for table in solution["tables"]:
+                    node = f"{solution['dataset']}.{table['name'].upper()}"
+                    tasks[node] = (solution, table)
+        return tasks
+
+    def __get_keys(self, dataset: str, table: str) -> frozenset:
+
+        return frozenset(
+            field["name"].upper()
+            for field in self.reader.read_bq_schema(dataset, table)
+            if field.get("mode") == "REQUIRED"
+        )
+
+    def __get_checktables(self, solution: dict, table: str) -> set:
+
+        if solution.get("type") != "sap" or not solution.get("metaDataset"):
+            return set()
+        fields = self.reader.read_sap_schema(solution["metaDataset"], table)
+        return {
+            field["checktable"].upper()
+            for field in fields
+            if field.get("checktable") and field["checktable"] != "*"
+        }
+
+    def __reaches(self, graph: dict, node: str, target: str) -> bool:
+        """Checks if target is a (transitive) dependency of node."""
+        stack, seen = [node], set()
+        while stack:
+            current = stack.pop()
+            if current == target:
+                return True
+            if current not in seen:
+                seen.add(current)
+                stack.extend(graph.get(current, ()))
+        return False
+
+    def get_dependencies(self, tasks: dict) -> dict:
+        """Derives the dependency DAG of the tables of a run.
+
+        Edges that would close a cycle (e.g. mutual check tables) are dropped.
+
+        Args:
+            tasks (dict): tables of the run (see `get_tasks`).
+
+        Returns:
+            dict: "<dataset>.<table>" -> set of tables it depends on.
+        """
+        graph = {node: set() for node in tasks}
+        keys = {
+            node: self.__get_keys(solution["dataset"], table["name"])
+            for node, (solution, table) in tasks.items()
+        }
+
+        def add_edge(node, dependency):
+            if dependency != node and not self.__reaches(graph, dependency, node):
+                graph[node].add(dependency)
+
+        for node, (solution, table) in tasks.items():
+            dataset = solution["dataset"]
+
+            # header tables first: they can not close a cycle.
+            for other in tasks:
+                if other != node and keys[other] and keys[other] < keys[node]:
+                    add_edge(node, other)
+
+            for name in table.get("dependsOn", []):
+                other = f"{dataset}.{name.upper()}"
+                if other in tasks:
+                    add_edge(node, other)
+
+            for checktable in self.__get_checktables(solution, table["name"]):
+                other = f"{dataset}.{checktable}"
+                if other in tasks:
+                    add_edge(node, other)
+
+        return graph
+
+    def __iter_chunks(self, chunks, loaded: set, uploaded: list, state: dict):
+        """Yields the batches from the queue of a generating process.
+
+        Args:
+            chunks (multiprocessing.Queue): queue of a generating process.
+            loaded (set): numbers of chunks loaded by an earlier run (skipped).
+            uploaded (list): receives (chunk number, rng_state, allocator)
+                of each yielded batch, by batch index.
+            state (dict): "ended" is set when the end of the queue is read.
+
+        Raises:
+            Exception: Generation failed.
+
+        Yields:
+            batch (DataFrame or Arrow table).
+        """
+        while True:
+            chunk = chunks.get()
+            if chunk in (_END, _FAILED):
+                state["ended"] = True
+                if chunk == _FAILED:
+                    raise Exception("Generation failed.")
+                return
+            number, batch, rng_state, allocator = chunk
+            if number in loaded:
+                continue
+            uploaded.append((number, rng_state, allocator))
+            yield batch
+
+    def __drain(self, chunks):
+        """Discards the remaining chunks of a queue, until its end."""
+        while chunks.get() not in (_END, _FAILED):
+            pass
+
+    def __upload(
+        self,
+        node: str,
+        solution: dict,
+        table: dict,
+        chunks,
+        cancel,
+        checkpoint: Checkpoint,
+    ) -> int:
+        """Uploads the chunks of a table while they are generated (in a worker thread).
+
+        With a checkpoint, chunks loaded by an earlier run are skipped, and
+        each chunk is recorded as soon as it is loaded.
+
+        Returns:
+            int: number of rows of the table loaded by this and earlier runs.
+        """
+        dataset = solution["dataset"]
+        write = table.get("write", "APPEND")
+        loaded = set()
+        uploaded = []
+        state = {"ended": False}
+        on_loaded = None
+
+        if checkpoint is not None and write not in ["REPLACE", "MERGE"]:
+            loaded = checkpoint.get_loaded_chunks(node)
+            if loaded and write == "TRUNCATE":
+                # Keep the rows of the chunks loaded by the earlier run.
+                write = "APPEND"
+
+            def on_loaded(index, rows):
+                number, rng_state, allocator = uploaded[index]
+                checkpoint.save_chunk(node, number, rows, rng_state, allocator)
+
+        try:
+            schema = self.reader.read_bq_schema(dataset, table["name"])
+            rows = Upload(self.project_id).upload_stream(
+                self.__iter_chunks(chunks, loaded, uploaded, state),
+                schema, dataset, table["name"], write, on_loaded=on_loaded,
+            )
+        except BaseException:
+            # Stop the generating process, it must not block on a full queue.
+            cancel.set()
+            if not state["ended"]:
+                self.__drain(chunks)
+            raise
+
+        if checkpoint is not None:
+            if on_loaded is not None:
+                # The staging table of a failed REPLACE / MERGE is gone, these
+                # tables are only checkpointed when complete.
+                rows = checkpoint.get_resume_state(node)["rows"]
+            checkpoint.set_table_done(node, rows)
+        return rows
+
+    def run(self, scenario: str = None, checkpoint: Checkpoint = None) -> dict:
+        """Generates and loads the tables of a run in dependency order.
+
+        A table which fails is reported; the tables depending on it are
+        skipped.  With a checkpoint, tables completed by an earlier
+        (failed) run are skipped, and the others resume after their last
+        contiguously loaded chunk.  When all tables are loaded, the
+        checkpoint of the run is removed, so the next run starts over.
+
+        Args:
+            scenario (str, optional): scenario name. Defaults to all scenarios.
+            checkpoint (Checkpoint, optional): checkpoint of the run.
+                Defaults to None (no resume).
+
+        Returns:
+            dict: "<dataset>.<table>" -> {"status": "loaded", "failed" or
+                "skipped", "rows": int, "error": str}.
+        """
+        tasks = self.get_tasks(scenario)
+        sorter = TopologicalSorter(self.get_dependencies(tasks))
+        sorter.prepare()
+
+        results = {node: {"status": "skipped", "rows": 0, "error": ""} for node in tasks}
+        pending = {}
+        stages = {}
+
+        # Forking while upload threads and gRPC clients run can deadlock.
+        context = multiprocessing.get_context("spawn")
+        with multiprocessing.Manager() as manager, \
+                ProcessPoolExecutor(
+                    max_workers=self.generate_workers, mp_context=context
+                ) as generators, \
+                ThreadPoolExecutor(max_workers=self.upload_workers) as uploaders:
+            while sorter.is_active():
+                completed = False
+                for node in sorter.get_ready():
+                    solution, table = tasks[node]
+                    resume = None
+                    if checkpoint is not None:
+                        rows = checkpoint.get_table_done(node)
+                        if rows is not None:
+                            self.logger.info("%s was loaded before, %s rows", node, rows)
+                            results[node].update(rows=rows)
+                            sorter.done(node)
+                            completed = True
+                            continue
+                        if table.get("write", "APPEND") in ["REPLACE", "MERGE"]:
+                            checkpoint.reset(node)
+                        resume = checkpoint.get_resume_state(node)
+
+                    self.logger.info("Generating and uploading %s", node)
+                    chunks = manager.Queue(maxsize=self.max_pending_chunks)
+                    cancel = manager.Event()
+                    generate = generators.submit(
+                        _generate, self.strategy_package, self.project_id,
+                        solution, table, chunks, cancel, resume,
+                    )
+                    upload = uploaders.submit(
+                        self.__upload, node, solution, table, chunks, cancel, checkpoint
+                    )
+                    pending[generate] = (node, "generate")
+                    pending[upload] = (node, "upload")
+                    stages[node] = 2
+
+                if not pending:
+                    if completed:
+                        continue
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node, stage = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as err:
+                        # The generation error is more telling than the upload's.
+                        if results[node]["status"] != "failed" or stage == "generate":
+                            self.logger.error("%s failed: %s", node, err)
+                            results[node].update(status="failed", error=str(err))
+                        stages[node] -= 1
+                        continue
+
+                    if stage == "upload":
+                        results[node]["rows"] = result
+                    stages[node] -= 1
+                    if stages[node] == 0 and results[node]["status"] != "failed":
+                        self.logger.info("Loaded %s rows into %s", results[node]["rows"], node)
+                        results[node]["status"] = "loaded"
+                        sorter.done(node)
+
+        if checkpoint is not None and not sorter.is_active():
+            checkpoint.reset()
+        return results
@@ -0,0 +1,61 @@
+# MIT License
+
+# Copyright (c) 2025 rameshsuraparaju
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Tests for reading the pgeocode postal codes of rand.address."""
+
+import logging
+
+import pandas as pd
+import pgeocode
+import pytest
+
+from rand import address
+
+
+@pytest.fixture
+def postal_cache(tmp_path, monkeypatch):
+    """pgeocode cache holding a German postal code file with two places."""
+    monkeypatch.setattr(pgeocode, "STORAGE_DIR", str(tmp_path))
+    pd.DataFrame({
+        "country_code": ["DE", "DE"],
+        "postal_code": ["01067", "01069"],
+        "place_name": ["Dresden", "Dresden"],
+        "state_name": ["Sachsen", "Sachsen"],
+        "state_code": ["SN", "SN"],
+        "latitude": [51.05, 51.04],
+        "longitude": [13.74, 13.75],
+    }).to_csv(tmp_path / "DE.txt", index=None)
+
+
+def test_country_index_reads_all_places(postal_cache):
+    index = address._CountryIndex("de", [{"name": "Dresden"}, {"name": "Leipzig"}])
+
+    assert index.postal_count.tolist() == [2, 0]
+    assert sorted(index.postal_codes.tolist()) == ["01067", "01069"]
+
+
+def test_country_index_unsupported_country_logs_warning(caplog):
+    with caplog.at_level(logging.WARNING, logger="rand.address"):
+        index = address._CountryIndex("ZZ", [{"name": "Nowhere"}])
+
+    assert index.postal_count.tolist() == [0]
+    assert "No postal codes for country ZZ" in caplog.text
@@ -0,0 +1,45 @@
+# MIT License
+
+# Copyright (c) 2025 rameshsuraparaju
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Tests for dump.Dump writing validated JSON files."""
+
+import json
+
+import pytest
+
+from dump import dump
+
+
+def test_dump_validates_with_the_error_message(tmp_path):
+    schema = tmp_path / "config.schema.json"
+    schema.write_text(json.dumps({"type": "object", "required": ["project"]}),
+                      encoding="utf-8")
+    # Files are only written if they exist
+    file = tmp_path / "config.json"
+    file.write_text("{}", encoding="utf-8")
+
+    with pytest.raises(Exception, match="'project' is a required property"):
+        dump.Dump().dump(str(file), {"name": "s"}, str(schema))
+    assert file.read_text(encoding="utf-8") == "{}"
+
+    assert dump.Dump().dump(str(file), {"project": "p"}, str(schema))
+    assert json.loads(file.read_text(encoding="utf-8")) == {"project": "p"}
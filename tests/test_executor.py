@@ -0,0 +1,173 @@
+# MIT License
+
+# Copyright (c) 2025 rameshsuraparaju
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Tests for checkpointing and resuming runs of scenario.executor.Executor.
+
+The strategy module is written to a temporary package, the generating
+processes (spawned) find it through sys.path.  Uploads and schema reads
+are faked in the test process.
+"""
+
+import textwrap
+
+import pytest
+
+from scenario import checkpoint as cp
+from scenario import executor
+
+_STRATEGY = '''
+import pandas as pd
+
+
+class Chunked:
+    """Yields table["chunks"] one row chunks, the row holding the chunk number."""
+
+    def __init__(self, project_id, solution, table):
+        self.table = table
+
+    def generate_chunks(self, chunk, rng_state, allocator):
+        if chunk > 0:
+            # Resumed with the state after the previous chunk
+            assert rng_state == {"after": chunk - 1} and allocator == chunk - 1
+        for number in range(chunk, self.table["chunks"]):
+            yield pd.DataFrame({"chunk": [number]}), {"after": number}, number
+'''
+
+
+class _FakeReader:
+
+    def __init__(self, project_id):
+        pass
+
+    def read_bq_schema(self, dataset, table):
+        return []
+
+
+class _FakeUpload:
+    """Records the uploaded chunks; fails before the chunk in `fail`."""
+
+    calls = []
+    fail = {}
+
+    def __init__(self, project_id):
+        pass
+
+    def upload_stream(self, batches, schema, dataset, table, write, on_loaded=None):
+        chunks = []
+        __class__.calls.append((table, write, chunks))
+        for index, batch in enumerate(batches):
+            number = int(batch["chunk"].iloc[0])
+            if __class__.fail.get(table) == number:
+                raise RuntimeError(f"load of chunk {number} failed")
+            chunks.append(number)
+            if on_loaded is not None:
+                on_loaded(index, len(batch))
+        return len(chunks)
+
+
+@pytest.fixture
+def run(tmp_path, monkeypatch):
+    """Runs tables a (3 chunks) and b (4 chunks, depends on a) of a scenario."""
+    package = tmp_path / "teststrategies"
+    package.mkdir()
+    (package / "chunked.py").write_text(textwrap.dedent(_STRATEGY), encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(executor, "Reader", _FakeReader)
+    monkeypatch.setattr(executor, "Upload", _FakeUpload)
+    _FakeUpload.calls, _FakeUpload.fail = [], {}
+
+    strategy = {"module": "chunked", "class": "Chunked"}
+    config = {"project": "p", "scenarios": [{"name": "s", "solutions": [{
+        "type": "other", "dataset": "d", "tables": [
+            {"name": "a", "write": "TRUNCATE", "strategy": strategy, "chunks": 3},
+            {"name": "b", "write": "TRUNCATE", "strategy": strategy, "chunks": 4,
+             "dependsOn": ["a"]},
+        ]}]}]}
+    checkpoint = cp.Checkpoint("s", str(tmp_path / "checkpoint.sqlite"))
+
+    def run_once():
+        _FakeUpload.calls.clear()
+        return executor.Executor(
+            config, generate_workers=2, upload_workers=2,
+            strategy_package="teststrategies",
+        ).run("s", checkpoint)
+
+    yield run_once, checkpoint
+    checkpoint.close()
+
+
+def test_watermark_with_gaps(tmp_path):
+    checkpoint = cp.Checkpoint("r", str(tmp_path / "checkpoint.sqlite"))
+    assert checkpoint.get_resume_state("d.A") == {
+        "chunk": 0, "rows": 0, "rng_state": None, "allocator": None
+    }
+    for chunk in (0, 1, 3):
+        checkpoint.save_chunk("d.A", chunk, 10 + chunk, {"after": chunk}, chunk)
+
+    assert checkpoint.get_loaded_chunks("d.A") == {0, 1, 3}
+    assert checkpoint.get_watermark("d.A") == 1
+    assert checkpoint.get_resume_state("d.A") == {
+        "chunk": 2, "rows": 21, "rng_state": {"after": 1}, "allocator": 1
+    }
+    # Other runs do not see the chunks
+    assert cp.Checkpoint("other", str(tmp_path / "checkpoint.sqlite")).get_watermark("d.A") == -1
+    checkpoint.close()
+
+
+def test_resume_after_gap_appends_missing_chunks(run):
+    run_once, checkpoint = run
+    checkpoint.save_chunk("d.A", 0, 1, {"after": 0}, 0)
+    checkpoint.save_chunk("d.A", 2, 1, {"after": 2}, 2)
+
+    results = run_once()
+
+    assert results["d.A"] == {"status": "loaded", "rows": 3, "error": ""}
+    # Chunk 2 was loaded before: regenerated from chunk 1, but not loaded
+    assert ("a", "APPEND", [1]) in _FakeUpload.calls
+    assert ("b", "TRUNCATE", [0, 1, 2, 3]) in _FakeUpload.calls
+
+
+def test_failed_run_resumes_and_skips_completed_tables(run):
+    run_once, checkpoint = run
+    _FakeUpload.fail = {"b": 2}
+
+    results = run_once()
+    assert results["d.A"]["status"] == "loaded"
+    assert results["d.B"]["status"] == "failed"
+    assert "chunk 2" in results["d.B"]["error"]
+    assert checkpoint.get_table_done("d.A") == 3
+    assert checkpoint.get_loaded_chunks("d.B") == {0, 1}
+
+    _FakeUpload.fail = {}
+    results = run_once()
+    assert results["d.A"] == {"status": "skipped", "rows": 3, "error": ""}
+    assert results["d.B"] == {"status": "loaded", "rows": 4, "error": ""}
+    # Table a is not loaded again, b continues with APPEND (not TRUNCATE)
+    assert _FakeUpload.calls == [("b", "APPEND", [2, 3])]
+
+    # All tables loaded: the checkpoint is reset and the next run starts over
+    assert checkpoint.get_table_done("d.A") is None
+    assert checkpoint.get_loaded_chunks("d.B") == set()
+    run_once()
+    assert sorted(_FakeUpload.calls) == [
+        ("a", "TRUNCATE", [0, 1, 2]), ("b", "TRUNCATE", [0, 1, 2, 3])
+    ]
@@ -0,0 +1,49 @@
+# MIT License
+
+# Copyright (c) 2025 rameshsuraparaju
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Tests for unique identifier generation of rand.identifier."""
+
+import tracemalloc
+
+import pytest
+
+from rand import identifier
+
+
+def test_unique_ids_sparse_without_rank_array():
+    tracemalloc.start()
+    ids = identifier.ID(seed=7).gen_numeric_ids(10000, 8, unique=True)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert len(set(ids.tolist())) == 10000
+    assert all(len(i) == 8 and i.isdigit() for i in ids)
+    # All 10**8 ranks as int64 would take 800 MB
+    assert peak < 16 * 1024 * 1024
+
+
+def test_unique_ids_dense_uses_all_identifiers():
+    ids = identifier.ID(seed=7).gen_numeric_ids(100, 2, unique=True)
+
+    assert sorted(ids.tolist()) == [f"{i:02d}" for i in range(100)]
+    with pytest.raises(ValueError):
+        identifier.ID(seed=7).gen_numeric_ids(101, 2, unique=True)
@@ -0,0 +1,155 @@
+# MIT License
+
+# Copyright (c) 2025 rameshsuraparaju
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Tests for load.Load seed file streaming and caching."""
+
+import json
+import os
+
+import pyarrow as pa
+import pytest
+
+from load import load
+
+
+@pytest.fixture
+def tiny_reads(monkeypatch):
+    """Reads seed files in 16 character chunks, so values span reads."""
+    monkeypatch.setattr(load.Load, "_READ_SIZE", 16)
+
+
+def test_iter_records_json_array_numbers_across_reads(tmp_path, tiny_reads):
+    numbers = [1000001, 1000002, 1000003, 1000004, 2.5, -7, 123456789012]
+    file = tmp_path / "numbers.json"
+    file.write_text(json.dumps(numbers), encoding="utf-8")
+
+    assert list(load.Load().iter_records(str(file))) == numbers
+
+
+def test_iter_records_json_array_objects_across_reads(tmp_path, tiny_reads):
+    records = [{"matnr": f"M{i:05d}", "price": i * 1.5, "tags": ["a"] * (i % 3)}
+               for i in range(50)]
+    file = tmp_path / "seed.json"
+    file.write_text(json.dumps(records, indent=2), encoding="utf-8")
+
+    assert list(load.Load().iter_records(str(file))) == records
+
+
+def test_iter_records_truncated_array(tmp_path, tiny_reads):
+    file = tmp_path / "bad.json"
+    file.write_text('[{"a": 1}, {"a": ', encoding="utf-8")
+
+    with pytest.raises(Exception, match="malformed"):
+        list(load.Load().iter_records(str(file)))
+
+
+def test_iter_records_ndjson_with_schema(tmp_path):
+    file = tmp_path / "seed.ndjson"
+    file.write_text('{"a": 1}\n\n{"a": 2}\n{"b": 3}\n', encoding="utf-8")
+    schema_file = tmp_path / "seed.schema.json"
+    schema_file.write_text(json.dumps({"type": "object", "required": ["a"]}))
+
+    records = load.Load().iter_records(str(file), str(schema_file))
+    assert next(records) == {"a": 1}
+    assert next(records) == {"a": 2}
+    with pytest.raises(Exception, match="Record 2"):
+        next(records)
+
+
+def test_load_table_promotes_types_and_reuses_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(load.Load, "_BATCH_SIZE", 2)
+    # The first batch infers price as int64, the second as double.
+    records = [{"price": 1}, {"price": 2}, {"price": 2.5}, {"price": None}]
+    file = tmp_path / "seed.json"
+    file.write_text(json.dumps(records), encoding="utf-8")
+    cache_path = str(tmp_path / "cache")
+
+    table = load.Load().load_table(str(file), cache_path=cache_path)
+    assert table.schema.field("price").type == pa.float64()
+    assert table.column("price").to_pylist() == [1.0, 2.0, 2.5, None]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("seed file parsed again")
+
+    monkeypatch.setattr(load.Load, "iter_records", fail)
+    assert load.Load().load_table(str(file), cache_path=cache_path).equals(table)
+
+
+def test_load_table_keeps_fields_of_sparse_records(tmp_path, monkeypatch):
+    monkeypatch.setattr(load.Load, "_BATCH_SIZE", 3)
+    # Optional fields first appear after the first record of a batch,
+    # and in a later batch only.
+    records = [
+        {"matnr": "M1"},
+        {"matnr": "M2", "plant": "1000"},
+        {"matnr": "M3", "price": 1},
+        {"matnr": "M4"},
+        {"price": 2.5, "tags": ["a"]},
+    ]
+    file = tmp_path / "seed.ndjson"
+    file.write_text("\n".join(json.dumps(r) for r in records), encoding="utf-8")
+    cache_path = str(tmp_path / "cache")
+
+    table = load.Load().load_table(str(file), cache_path=cache_path)
+    assert sorted(table.column_names) == ["matnr", "plant", "price", "tags"]
+    assert table.schema.field("price").type == pa.float64()
+
+    cached = list(load.Load().iter_cached_records(str(file), cache_path=cache_path))
+    assert [{k: v for k, v in r.items() if v is not None} for r in cached] == records
+
+
+def _write_schema(file, schema, mtime_ns):
+    file.write_text(json.dumps(schema), encoding="utf-8")
+    os.utime(file, ns=(mtime_ns, mtime_ns))
+
+
+def test_get_validator_is_cached_by_path_and_mtime(tmp_path):
+    file = tmp_path / "record.schema.json"
+    _write_schema(file, {"type": "object", "required": ["a"]}, 1_000_000_000_000_000_000)
+
+    validator = load.Load().get_validator(str(file))
+    # Reused by other instances and for other spellings of the path
+    assert load.Load().get_validator(str(tmp_path / "." / file.name)) is validator
+    assert not validator.is_valid({})
+
+    _write_schema(file, {"type": "object"}, 1_000_000_001_000_000_000)
+    rebuilt = load.Load().get_validator(str(file))
+    assert rebuilt is not validator
+    assert rebuilt.is_valid({})
+
+
+def test_validate_many_reports_index_and_path(tmp_path):
+    file = tmp_path / "record.schema.json"
+    _write_schema(file, {
+        "type": "object",
+        "properties": {"werks": {"type": "string"},
+                       "items": {"type": "array", "items": {"type": "integer"}}},
+    }, 1_000_000_000_000_000_000)
+    records = [{"werks": "1000"}, {"werks": 1000}, {"items": [1, "x", 3]}, {"werks": 2}]
+
+    errors = load.Load().validate_many(records, str(file))
+    assert [(e["index"], e["path"]) for e in errors] == [(1, "werks"), (2, "items/1"), (3, "werks")]
+    assert "is not of type 'string'" in errors[0]["message"]
+    assert load.Load().validate_many(records, str(file), max_errors=2) == errors[:2]
+    assert [e.message for e in load.Load().iter_errors(records[2], str(file))] == [
+        "'x' is not of type 'integer'"
+    ]
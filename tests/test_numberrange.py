@@ -0,0 +1,110 @@
+# MIT License
+
+# Copyright (c) 2025 rameshsuraparaju
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Tests for rand.numberrange.NumberRange block allocation."""
+
+import threading
+
+import pytest
+
+from rand import numberrange
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "nriv.sqlite")
+
+
+def test_concurrent_blocks_are_disjoint(path):
+    # Two instances on one file stand in for two processes.
+    ranges = [numberrange.NumberRange(path), numberrange.NumberRange(path)]
+    ranges[0].define("100", "RV_BELEG", "01", 1000, 999999)
+    blocks = []
+    lock = threading.Lock()
+
+    def work(worker):
+        nr = ranges[worker % 2]
+        for i in range(50):
+            block = nr.allocate("100", "RV_BELEG", "01", 1 + (worker + i) % 7)
+            with lock:
+                blocks.append(block)
+
+    threads = [threading.Thread(target=work, args=(w,)) for w in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    blocks.sort()
+    assert blocks[0][0] == 1000
+    # Consecutive blocks, without gaps or overlaps
+    assert all(b[0] == a[1] + 1 for a, b in zip(blocks, blocks[1:]))
+    assert ranges[1].get_level("100", "RV_BELEG", "01") == blocks[-1][1]
+    for nr in ranges:
+        nr.close()
+
+
+def test_gen_numbers_too_long_does_not_consume_numbers(path):
+    nr = numberrange.NumberRange(path)
+    nr.define("100", "RV_BELEG", "01", 99999991, 999999999)
+
+    with pytest.raises(ValueError, match="exceeds"):
+        nr.gen_numbers("100", "RV_BELEG", "01", 20, length=8)
+    assert nr.get_level("100", "RV_BELEG", "01") == 99999990
+    assert nr.gen_numbers("100", "RV_BELEG", "01", 2, length=8).tolist() == [
+        "99999991", "99999992"
+    ]
+    with pytest.raises(ValueError, match="exhausted"):
+        nr.allocate("100", "RV_BELEG", "01", 10 ** 9)
+    nr.close()
+
+
+class _FakeReader:
+
+    def __init__(self, max_key):
+        self.max_key = max_key
+        self.calls = []
+
+    def read_max_field(self, *args):
+        self.calls.append(args)
+        return self.max_key
+
+
+def test_seed_from_table_resumes_after_loaded_keys(path):
+    nr = numberrange.NumberRange(path)
+    nr.define("100", "RV_BELEG", "01", 1000, 1999)
+    reader = _FakeReader(1500)
+
+    level = nr.seed_from_table(
+        reader, "sap", "vbak", "vbeln", "100", "RV_BELEG", "01", "mandt"
+    )
+    assert level == 1500
+    assert reader.calls == [("sap", "vbak", "vbeln", "mandt", "100", 1000, 1999)]
+    assert nr.gen_numbers("100", "RV_BELEG", "01", 1).tolist() == ["0000001501"]
+
+    # A lower max. key (e.g. the table was truncated) does not lower the level
+    reader.max_key = 1200
+    assert nr.seed_from_table(reader, "sap", "vbak", "vbeln", "100", "RV_BELEG", "01") == 1501
+
+    with pytest.raises(ValueError, match="not defined"):
+        nr.seed_from_table(reader, "sap", "vbak", "vbeln", "100", "RV_BELEG", "02")
+    nr.close()
@@ -0,0 +1,136 @@
+# MIT License
+
+# Copyright (c) 2025 rameshsuraparaju
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Tests for the parameterized SELECT builder bq.query.Select."""
+
+import pandas as pd
+import pytest
+
+from google.cloud import bigquery
+
+from bq import query
+from bq import read
+from bq.client import ClientFactory
+
+_SCHEMA = [
+    {"name": "MANDT", "type": "STRING", "mode": "NULLABLE"},
+    {"name": "VBELN", "type": "STRING", "mode": "REQUIRED"},
+    {"name": "POSNR", "type": "INTEGER", "mode": "NULLABLE"},
+    {"name": "ITEMS", "type": "RECORD", "mode": "REPEATED", "fields": []},
+]
+
+
+def _parameters(select):
+    return [p.to_api_repr() for p in select.build()[1]]
+
+
+def test_select_types_parameters_by_schema():
+    select = query.Query("p").select("d", "vbap", ["vbeln"], schema=_SCHEMA)
+    select.where("mandt", 100).where("posnr", "10").where_in("vbeln", [4711, "4712"])
+
+    sql, _ = select.build()
+    assert sql == ("SELECT vbeln FROM `p.d.vbap` WHERE mandt = @p0 AND posnr = @p1"
+                   " AND vbeln IN UNNEST(@p2);")
+    mandt, posnr, vbeln = _parameters(select)
+    assert mandt["parameterType"]["type"] == "STRING"
+    assert mandt["parameterValue"]["value"] == "100"
+    assert posnr["parameterType"]["type"] == "INT64"
+    assert vbeln["parameterType"]["arrayType"]["type"] == "STRING"
+    assert [v["value"] for v in vbeln["parameterValue"]["arrayValues"]] == ["4711", "4712"]
+
+
+def test_select_without_schema_types_parameters_by_value():
+    select = query.Query("p").select("d", "vbap").where("posnr", 10)
+
+    assert _parameters(select)[0]["parameterType"]["type"] == "INT64"
+    with pytest.raises(ValueError):
+        query.Query("p").select("d", "vbap").where_in("vbeln", [])
+
+
+class _Table:
+
+    def __init__(self, schema):
+        self.schema = schema
+
+
+class _Result:
+
+    def to_dataframe(self):
+        return pd.DataFrame({"vbeln": ["4711"], "posnr": [10]})
+
+
+class _Job:
+
+    errors = None
+
+    def result(self):
+        return _Result()
+
+
+class _FakeClient:
+    """Serves the table schema and records the queries."""
+
+    def __init__(self):
+        self.tables = 0
+        self.queries = []
+
+    def get_table(self, table_id):
+        self.tables += 1
+        return _Table([bigquery.SchemaField.from_api_repr(f) for f in _SCHEMA])
+
+    def query(self, sql, job_config=None):
+        self.queries.append((sql, job_config.query_parameters))
+        return _Job()
+
+
+def test_reader_header_fields_casts_keys_of_string_fields():
+    client = _FakeClient()
+    ClientFactory.set_client(client)
+    try:
+        reader = read.Reader("p", use_ddic_snapshot=False)
+        for link_value in (4711, 4712):
+            records = reader.read_header_fields(
+                "d", "vbap", ["vbeln", "posnr"], "mandt", "100", "vbeln", link_value
+            )
+    finally:
+        ClientFactory.reset()
+
+    assert records == [{"vbeln": "4711", "posnr": 10}]
+    assert client.tables == 1
+    parameters = [p.to_api_repr() for p in client.queries[-1][1]]
+    assert parameters[1]["parameterType"]["type"] == "STRING"
+    assert parameters[1]["parameterValue"]["value"] == "4712"
+
+
+def test_read_max_field_passes_client_and_interval_as_parameters():
+    select = query.Query("p").read_max_field(
+        "d", "vbak", "vbeln", "mandt", "100", 1000, 1999, schema=_SCHEMA
+    )
+
+    sql, _ = select.build()
+    assert sql == (
+        "SELECT MAX(SAFE_CAST(vbeln AS INT64)) AS value FROM `p.d.vbak`"
+        " WHERE mandt = @p0"
+        " AND (SAFE_CAST(vbeln AS INT64) BETWEEN @min_value AND @max_value);"
+    )
+    values = [p["parameterValue"]["value"] for p in _parameters(select)]
+    assert values == ["100", "1000", "1999"]
@@ -0,0 +1,105 @@
+# MIT License
+
+# Copyright (c) 2025 rameshsuraparaju
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Tests for rand.reference.ReferenceSampler with a fake reader."""
+
+import numpy as np
+import pytest
+
+from rand import reference
+
+
+class _FakeReader:
+    """Serves key columns in the case of the table schema, counting reads."""
+
+    def __init__(self, columns: dict):
+        self.columns = columns
+        self.reads = []
+
+    def read_table_columns(self, dataset, table, fields, client_field="none",
+                           client_value="000"):
+        self.reads.append((dataset, table, list(fields), client_value))
+        wanted = {f.lower() for f in fields}
+        return {name: np.array(values) for name, values in self.columns.items()
+                if name.lower() in wanted}
+
+
+def test_load_maps_columns_case_insensitively_once():
+    reader = _FakeReader({"Id": ["001A", "001B"], "AccountId": ["X", "Y"]})
+    sampler = reference.ReferenceSampler(reader, seed=1)
+
+    columns = sampler.load("sf", "Contact", ["Id", "AccountId"])
+    assert list(columns) == ["Id", "AccountId"]
+    assert columns["Id"].tolist() == ["001A", "001B"]
+    assert list(sampler.load("sf", "contact", ["id", "accountid"])) == ["id", "accountid"]
+    assert len(reader.reads) == 1
+
+    with pytest.raises(ValueError, match="no fields"):
+        sampler.load("sf", "Contact", ["Name"])
+
+
+def test_load_empty_table():
+    sampler = reference.ReferenceSampler(_FakeReader({"VBELN": []}))
+
+    with pytest.raises(ValueError, match="no rows"):
+        sampler.load("sap", "VBAK", ["vbeln"], "mandt", "100")
+
+
+def test_sample_rows_weights():
+    keys = [f"{i:010d}" for i in range(100)]
+    sampler = reference.ReferenceSampler(_FakeReader({"KUNNR": keys}), seed=7)
+    n = 20000
+
+    uniform = sampler.sample_rows("sap", "kna1", ["kunnr"], n)
+    zipf = sampler.sample_rows("sap", "kna1", ["kunnr"], n, "zipf", 1.5)
+    pareto = sampler.sample_rows("sap", "kna1", ["kunnr"], n, "pareto", 1.0)
+    for rows in (uniform, zipf, pareto):
+        assert rows.min() >= 0 and rows.max() < len(keys)
+
+    # Top key share: 1 % uniform, about 40 % for Zipf with a = 1.5
+    assert np.bincount(uniform).max() / n < 0.03
+    assert np.bincount(zipf).max() / n > 0.3
+    # The popularity is fixed per index, not drawn again for every call
+    again = sampler.sample_rows("sap", "kna1", ["kunnr"], n, "zipf", 1.5)
+    assert np.bincount(again).argmax() == np.bincount(zipf).argmax()
+
+    sample = sampler.sample("sap", "kna1", ["kunnr"], 5)
+    assert set(sample["kunnr"].tolist()) <= set(keys)
+    with pytest.raises(ValueError):
+        sampler.sample_rows("sap", "kna1", ["kunnr"], n, "normal")
+
+
+def test_fan_out_numbers_items_per_header():
+    reader = _FakeReader({"MANDT": ["100"] * 3, "VBELN": ["A", "B", "C"]})
+    sampler = reference.ReferenceSampler(reader, seed=3)
+
+    items = sampler.fan_out("sap", "vbak", ["mandt", "vbeln"], 1, 4)
+    assert list(items) == ["mandt", "vbeln", "posnr"]
+    headers = items["vbeln"].tolist()
+    assert headers == sorted(headers)
+    for vbeln in ("A", "B", "C"):
+        posnr = items["posnr"][items["vbeln"] == vbeln].tolist()
+        assert 1 <= len(posnr) <= 4
+        assert posnr == [f"{10 * (i + 1):06d}" for i in range(len(posnr))]
+
+    with pytest.raises(ValueError):
+        sampler.fan_out("sap", "vbak", ["vbeln"], 3, 2)
@@ -0,0 +1,168 @@
+# MIT License
+
+# Copyright (c) 2025 rameshsuraparaju
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Tests for rand.text.Text concurrent generation against a local stub server."""
+
+import asyncio
+import json
+import threading
+import time
+import urllib.request
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from rand import text
+
+
+class _StubServer(ThreadingHTTPServer):
+    """Answers prompts like a model endpoint, recording every request.
+
+    Prompts containing "flaky" fail with 503 on their first two attempts,
+    prompts containing "broken" always fail.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, delay: float):
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/generate"
+
+    def attempts(self, prompt: str) -> list:
+        return [t for p, t in self.requests if p == prompt]
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        server = self.server
+        prompt = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["prompt"]
+        with server.lock:
+            server.requests.append((prompt, time.monotonic()))
+            attempt = len(server.attempts(prompt))
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        time.sleep(server.delay)
+        with server.lock:
+            server.in_flight -= 1
+
+        if "broken" in prompt or ("flaky" in prompt and attempt <= 2):
+            self.send_response(503)
+            self.end_headers()
+            return
+        body = json.dumps({"text": f"answer to {prompt}"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _Response:
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _StubModel:
+    """Model with the interface of genai.GenerativeModel, backed by the stub server."""
+
+    model_name = "models/stub"
+
+    def __init__(self, url: str):
+        self.url = url
+
+    def __post(self, prompt: str) -> str:
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps({"prompt": prompt}).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return json.loads(response.read())["text"]
+
+    async def generate_content_async(self, prompt, generation_config=None):
+        return _Response(await asyncio.to_thread(self.__post, prompt))
+
+
+@pytest.fixture
+def server():
+    stub = _StubServer(delay=0.05)
+    thread = threading.Thread(target=stub.serve_forever, daemon=True)
+    thread.start()
+    yield stub
+    stub.shutdown()
+    stub.server_close()
+
+
+@pytest.fixture
+def generator(server):
+    return text.Text(model=_StubModel(server.url))
+
+
+def test_gen_texts_token_bucket_rate(server, generator):
+    prompts = [f"prompt {i}" for i in range(12)]
+
+    texts = generator.gen_texts(prompts, 50, concurrency=2, requests_per_minute=600)
+
+    assert texts == [f"answer to {p}" for p in prompts]
+    # A burst of 2 (the bucket capacity), then 10 requests per second.
+    times = sorted(t for _, t in server.requests)
+    assert times[-1] - times[0] >= (len(prompts) - 2) / 10 * 0.9
+
+
+def test_gen_texts_concurrency_cap(server, generator):
+    server.delay = 0.1
+    prompts = [f"prompt {i}" for i in range(12)]
+
+    generator.gen_texts(prompts, 50, concurrency=3, requests_per_minute=60000)
+
+    assert server.max_in_flight == 3
+
+
+def test_gen_texts_retry_with_backoff(server, generator, monkeypatch):
+    # No jitter: the delays are exactly 0.5 * 2 ** attempt seconds.
+    monkeypatch.setattr(text.random, "random", lambda: 0.0)
+
+    texts = generator.gen_texts(
+        ["flaky prompt", "broken prompt"], 50,
+        requests_per_minute=60000, max_retries=2, fallbacks=["fallback 1", "fallback 2"],
+    )
+
+    assert texts == ["answer to flaky prompt", "fallback 2"]
+    attempts = server.attempts("flaky prompt")
+    assert len(attempts) == 3
+    assert attempts[1] - attempts[0] >= 0.5
+    assert attempts[2] - attempts[1] >= 1.0
+    assert len(server.attempts("broken prompt")) == 3
@@ -0,0 +1,143 @@
+# MIT License
+
+# Copyright (c) 2025 rameshsuraparaju
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Tests for bq.upload.Upload.upload_stream with a fake BigQuery client."""
+
+import threading
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from bq.client import ClientFactory
+from bq.upload import Upload
+
+
+class _Job:
+    """Load or query job, finishing after a delay."""
+
+    def __init__(self, client, rows: int, load: bool = True):
+        self.client = client
+        self.output_rows = rows
+        self.load = load
+
+    def result(self):
+        with self.client.lock:
+            self.client.running += 1
+            self.client.peak = max(self.client.peak, self.client.running)
+        time.sleep(self.client.delay)
+        with self.client.lock:
+            self.client.running -= 1
+            self.client.loaded += self.load
+        return self
+
+
+class _FakeClient:
+    """Records queries and load jobs instead of calling BigQuery."""
+
+    def __init__(self, delay: float = 0.02):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.calls = []
+        self.running = self.peak = self.loaded = 0
+
+    def query(self, sql):
+        self.calls.append(("query", sql))
+        return _Job(self, 0, load=False)
+
+    def load_table_from_dataframe(self, dataframe, table_id, job_config):
+        with self.lock:
+            self.calls.append(("load", table_id, job_config.write_disposition, len(dataframe)))
+        return _Job(self, len(dataframe))
+
+    def load_table_from_file(self, file, table_id, job_config):
+        rows = pq.read_table(file).num_rows
+        with self.lock:
+            self.calls.append(("load", table_id, job_config.write_disposition, rows))
+        return _Job(self, rows)
+
+
+@pytest.fixture
+def client():
+    client = _FakeClient()
+    ClientFactory.set_client(client)
+    yield client
+    ClientFactory.reset()
+
+
+def test_upload_stream_truncate_loads_bounded_chunks(client):
+    max_pending = 3
+    produced = []
+
+    def chunks():
+        for i in range(12):
+            # Batches held in memory: the new one and those not loaded yet
+            produced.append(len(produced) + 1 - client.loaded)
+            yield pd.DataFrame({"n": range(i * 10, i * 10 + 10)})
+
+    loaded = []
+    rows = Upload("p").upload_stream(
+        chunks(), [], "d", "t", "TRUNCATE", max_workers=2, max_pending=max_pending,
+        on_loaded=lambda index, n: loaded.append((index, n)),
+    )
+
+    assert rows == 120
+    assert client.calls[0][0] == "query"
+    assert client.calls[0][1].startswith("TRUNCATE TABLE `p.d.t`")
+    loads = client.calls[1:]
+    assert len(loads) == 12
+    # The table is truncated once, every chunk (first and later) is appended
+    assert {call[2] for call in loads} == {"WRITE_APPEND"}
+    assert all(call[1] == "p.d.t" and call[3] == 10 for call in loads)
+    assert client.peak <= 2
+    assert max(produced) <= max_pending
+    assert sorted(loaded) == [(i, 10) for i in range(12)]
+
+
+def test_upload_stream_append_arrow_batches(client):
+    batches = [
+        pa.table({"n": [1, 2]}),
+        pa.record_batch([pa.array([3])], names=["n"]),
+    ]
+
+    assert Upload("p").upload_stream(batches, [], "d", "t", "APPEND") == 3
+    assert [call[0] for call in client.calls] == ["load", "load"]
+    assert {call[2] for call in client.calls} == {"WRITE_APPEND"}
+
+
+def test_upload_stream_failed_load_stops_iterator(client):
+    def fail(*args, **kwargs):
+        raise RuntimeError("load failed")
+
+    client.load_table_from_dataframe = fail
+    produced = []
+
+    def chunks():
+        for i in range(100):
+            produced.append(i)
+            yield pd.DataFrame({"n": [i]})
+
+    with pytest.raises(RuntimeError, match="load failed"):
+        Upload("p").upload_stream(chunks(), [], "d", "t", "APPEND", max_workers=2)
+    assert len(produced) < 100